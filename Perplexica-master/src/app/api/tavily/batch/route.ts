@@ -0,0 +1,85 @@
+/**
+ * Batch variant of the Tavily-compatible endpoint
+ *
+ * Accepts every parameter of POST /api/tavily plus `queries: string[]`
+ * (instead of `query`) and runs all queries in one request, sharing the
+ * same parameters. Responses are returned in query order; a failing query
+ * yields an entry with `error` instead of failing the whole batch.
+ */
+
+import { POST as searchOne } from '../route';
+
+const MAX_BATCH_SIZE = parseInt(process.env.TAVILY_MAX_BATCH_SIZE || '20');
+
+export const POST = async (req: Request) => {
+  const startTime = Date.now();
+
+  try {
+    const body = await req.json();
+    const { queries, query: _ignored, ...params } = body;
+
+    if (!Array.isArray(queries) || queries.length === 0) {
+      return Response.json(
+        {
+          error: 'Missing required parameter: queries',
+          message: 'The queries parameter must be a non-empty array of strings',
+        },
+        { status: 400 },
+      );
+    }
+
+    if (queries.length > MAX_BATCH_SIZE) {
+      return Response.json(
+        {
+          error: 'Batch too large',
+          message: `At most ${MAX_BATCH_SIZE} queries are allowed per batch`,
+        },
+        { status: 413 },
+      );
+    }
+
+    console.log(`[Tavily API] Batch of ${queries.length} queries`);
+
+    const responses = await Promise.all(
+      queries.map(async (query: string) => {
+        const res = await searchOne(
+          new Request(req.url, {
+            method: 'POST',
+            body: JSON.stringify({ ...params, query }),
+            headers: { 'Content-Type': 'application/json' },
+          }),
+        );
+        const data = await res.json();
+
+        if (!res.ok) {
+          return {
+            query,
+            results: [],
+            error: data.message || data.error,
+            status_code: res.status,
+          };
+        }
+        return data;
+      }),
+    );
+
+    return Response.json(
+      {
+        responses,
+        response_time: (Date.now() - startTime) / 1000,
+      },
+      { status: 200 },
+    );
+  } catch (err: any) {
+    console.error(`[Tavily API Batch] Error: ${err.message}`);
+
+    return Response.json(
+      {
+        error: 'Internal server error',
+        message: err.message,
+        response_time: (Date.now() - startTime) / 1000,
+      },
+      { status: 500 },
+    );
+  }
+};
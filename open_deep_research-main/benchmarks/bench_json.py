@@ -0,0 +1,109 @@
+"""Micro-benchmark of JSON CPU cost on the search tool path.
+
+One ``tavily_search`` call decodes a backend response per query, encodes all of
+them into the ``SEARCH_LOG_JSON`` block (indented) and the researcher decodes
+that block again. This replays those three steps on synthetic responses of
+realistic size (raw_content on) for every available JSON backend, and reports
+the CPU time per tool call and how much each backend saves over the stdlib.
+
+Usage:
+    python benchmarks/bench_json.py --sizes-mb 1,2,5 --queries 3 --repeat 20
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+_WORDS = (
+    "research model search result latency benchmark crawler content market analysis "
+    "données résultat 搜索 结果 分析 市场 性能 — “quoted” text\n"
+).split(" ")
+
+
+def make_response(query: str, target_bytes: int, rng: random.Random) -> Dict[str, Any]:
+    """Build a Tavily-format response whose JSON encoding is about ``target_bytes``."""
+    results = []
+    per_result = max(1000, target_bytes // 5)
+    for i in range(5):
+        raw_content = " ".join(rng.choice(_WORDS) for _ in range(per_result // 7))
+        results.append({
+            "title": f"{query} result {i}",
+            "url": f"https://example.com/{i}/{rng.getrandbits(32):x}",
+            "content": raw_content[:500],
+            "raw_content": raw_content,
+            "score": round(rng.random(), 4),
+            "published_date": "2025-01-01",
+        })
+    return {"query": query, "results": results, "answer": None, "images": [],
+            "follow_up_questions": None, "response_time": 1.23}
+
+
+def json_backends() -> Dict[str, Tuple[Callable[[bytes], Any], Callable[[Any], bytes]]]:
+    """Return (loads, indented dumps) per installed backend."""
+    backends = {
+        "json": (
+            json.loads,
+            lambda obj: json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"),
+        ),
+    }
+    try:
+        import orjson
+
+        backends["orjson"] = (orjson.loads, lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        decoder, encoder = msgspec.json.Decoder(), msgspec.json.Encoder()
+        backends["msgspec"] = (
+            decoder.decode,
+            lambda obj: msgspec.json.format(encoder.encode(obj), indent=2),
+        )
+    except ImportError:
+        pass
+    return backends
+
+
+def tool_call(bodies: List[bytes], loads: Callable, dumps_indented: Callable) -> None:
+    """Replay the JSON work of one tool call: decode responses, encode + re-parse the log."""
+    responses = [loads(body) for body in bodies]
+    log = dumps_indented({"queries": [r["query"] for r in responses], "raw_results": responses})
+    loads(log)
+
+
+def main() -> None:
+    """Run the benchmark and print CPU ms per tool call per backend and size."""
+    parser = argparse.ArgumentParser(description="JSON CPU cost per search tool call")
+    parser.add_argument("--sizes-mb", default="1,2,5", help="Total response bytes per tool call (MB)")
+    parser.add_argument("--queries", type=int, default=3, help="Responses per tool call")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    backends = json_backends()
+    print(f"{'size':>6}  {'backend':>8}  {'cpu_ms/call':>11}  {'saved_ms':>9}  {'speedup':>7}")  # noqa: T201
+    for size_mb in (float(size) for size in args.sizes_mb.split(",")):
+        per_query = int(size_mb * 1024 * 1024 / args.queries)
+        bodies = [
+            json.dumps(make_response(f"query {i}", per_query, rng), ensure_ascii=False).encode("utf-8")
+            for i in range(args.queries)
+        ]
+        actual_mb = sum(len(body) for body in bodies) / 1024 / 1024
+        baseline = None
+        for name, (loads, dumps_indented) in backends.items():
+            tool_call(bodies, loads, dumps_indented)  # warm up
+            start = time.process_time()
+            for _ in range(args.repeat):
+                tool_call(bodies, loads, dumps_indented)
+            cpu_ms = (time.process_time() - start) / args.repeat * 1000
+            baseline = cpu_ms if baseline is None else baseline
+            print(  # noqa: T201
+                f"{actual_mb:5.1f}M  {name:>8}  {cpu_ms:11.1f}  {baseline - cpu_ms:9.1f}  {baseline / cpu_ms:6.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+r"""Load benchmark for the search tool path against the local stand-in server.
+
+Starts ``stub_search_server.py`` (unless ``--server-url`` points at one that is
+already running), points the search clients at it through the usual
+environment variables and drives ``tavily_search_async`` and/or the
+``tavily_search`` tool at one or more concurrency levels, reporting p50/p95/p99
+latency and throughput per level.
+
+For the ``tool`` target, summarization goes to the stand-in's OpenAI-compatible
+endpoint, so no model API key is needed and LLM latency is part of the profile.
+
+Usage:
+    python benchmarks/bench_search.py --backend perplexica --target both \
+        --concurrency 1,8,32 --calls 200 --latency-ms 800 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import Any, Dict, List
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stub_search_server import add_profile_arguments, profile_from_args, profile_to_argv  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_server(args: argparse.Namespace) -> subprocess.Popen:
+    """Start the stand-in server in a subprocess and wait until it answers."""
+    port = _free_port()
+    server_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stub_search_server.py")
+    process = subprocess.Popen(
+        [sys.executable, server_path, "--port", str(port), *profile_to_argv(profile_from_args(args))]
+    )
+    args.server_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{args.server_url}/stats", timeout=1.0).raise_for_status()
+            return process
+        except httpx.HTTPError:
+            if process.poll() is not None:
+                raise RuntimeError("Stand-in server exited during startup")
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Stand-in server did not start within 30s")
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Point the search clients (and summarization model) at the stand-in server."""
+    os.environ["PERPLEXICA_API_URL"] = f"{args.server_url}/api/tavily"
+    os.environ["SEARCRAWL_API_URL"] = args.server_url
+    os.environ["USE_SEARCRAWL"] = "true" if args.backend == "searcrawl" else "false"
+    os.environ["USE_PERPLEXICA"] = "true"
+    os.environ["SEARCH_RATE_LIMIT_RPS"] = str(args.rate_limit_rps)
+    os.environ["SEARCH_CACHE_ENABLED"] = "true" if args.cache else "false"
+    os.environ["SEARCRAWL_STREAMING"] = "true" if args.streaming else "false"
+    os.environ["GET_API_KEYS_FROM_CONFIG"] = "false"
+    if not args.real_llm:
+        os.environ["OPENAI_API_KEY"] = "stub"
+        os.environ["OPENAI_API_BASE"] = f"{args.server_url}/v1"
+        os.environ["OPENAI_BASE_URL"] = f"{args.server_url}/v1"
+
+
+def summarize_latencies(latencies: List[float], errors: int, elapsed: float, queries_per_call: int) -> Dict[str, Any]:
+    """Return count, error, percentile and throughput figures for one run."""
+    if len(latencies) >= 2:
+        percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0] if latencies else 0.0
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "p50_ms": round(p50 * 1000, 1),
+        "p95_ms": round(p95 * 1000, 1),
+        "p99_ms": round(p99 * 1000, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+        "calls_per_s": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "queries_per_s": round(len(latencies) * queries_per_call / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+async def run_level(args: argparse.Namespace, target: str, concurrency: int) -> Dict[str, Any]:
+    """Issue ``args.calls`` calls of ``target`` with ``concurrency`` in flight."""
+    from open_deep_research.utils import tavily_search, tavily_search_async
+
+    config = {"configurable": {
+        "summarization_model": args.summarization_model,
+        "max_structured_output_retries": 1,
+    }}
+    remaining = args.calls
+    latencies: List[float] = []
+    errors = 0
+
+    def make_queries() -> List[str]:
+        # Unique queries unless --cache is set, so caching/coalescing don't hide backend latency
+        suffix = "" if args.cache else f" {uuid.uuid4().hex[:8]}"
+        return [f"benchmark query {i}{suffix}" for i in range(args.queries_per_call)]
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            queries = make_queries()
+            start = time.perf_counter()
+            try:
+                if target == "search_async":
+                    responses = await tavily_search_async(
+                        queries,
+                        max_results=args.max_results,
+                        include_raw_content=args.include_raw_content,
+                        config=config,
+                    )
+                    errors += sum(1 for response in responses if response.get("error"))
+                else:
+                    await tavily_search.ainvoke(
+                        {"queries": queries, "max_results": args.max_results}, config
+                    )
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "target": target,
+        "concurrency": concurrency,
+        **summarize_latencies(latencies, errors, elapsed, args.queries_per_call),
+    }
+
+
+def print_table(rows: List[Dict[str, Any]]) -> None:
+    """Print benchmark rows as an aligned table."""
+    columns = ["target", "concurrency", "calls", "errors", "p50_ms", "p95_ms", "p99_ms", "mean_ms", "calls_per_s", "queries_per_s"]
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print("  ".join(column.rjust(widths[column]) for column in columns))  # noqa: T201
+    for row in rows:
+        print("  ".join(str(row[column]).rjust(widths[column]) for column in columns))  # noqa: T201
+
+
+async def run_benchmark(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """Run every (target, concurrency) combination and return the result rows."""
+    targets = ["search_async", "tool"] if args.target == "both" else [args.target]
+    rows = []
+    for target in targets:
+        if args.warmup:
+            await run_level(argparse.Namespace(**{**vars(args), "calls": args.warmup}), target, 1)
+        for concurrency in args.concurrency:
+            rows.append(await run_level(args, target, concurrency))
+    return rows
+
+
+def main() -> None:
+    """Parse options, start the stand-in server and run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the search tool path against the stand-in server")
+    parser.add_argument("--backend", choices=["perplexica", "searcrawl"], default="perplexica")
+    parser.add_argument("--target", choices=["search_async", "tool", "both"], default="search_async")
+    parser.add_argument("--concurrency", type=lambda value: [int(v) for v in value.split(",")], default=[1, 8, 32])
+    parser.add_argument("--calls", type=int, default=100, help="Calls per concurrency level")
+    parser.add_argument("--warmup", type=int, default=3, help="Unmeasured calls before each target")
+    parser.add_argument("--queries-per-call", type=int, default=3)
+    parser.add_argument("--max-results", type=int, default=5)
+    parser.add_argument("--include-raw-content", action="store_true")
+    parser.add_argument("--rate-limit-rps", type=float, default=0.0, help="0 disables client rate limiting")
+    parser.add_argument("--cache", action="store_true", help="Enable the search cache and repeat queries")
+    parser.add_argument("--streaming", action="store_true", help="Use SearCrawl streaming in the tool")
+    parser.add_argument("--summarization-model", default="openai:gpt-4.1-mini")
+    parser.add_argument("--real-llm", action="store_true", help="Summarize with the real model instead of the stand-in")
+    parser.add_argument("--server-url", help="Use an already running stand-in server")
+    parser.add_argument("--json-out", help="Also write the result rows to this file")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    process = None if args.server_url else start_stub_server(args)
+    try:
+        configure_environment(args)
+        rows = asyncio.run(run_benchmark(args))
+        server_stats = httpx.get(f"{args.server_url}/stats", timeout=5.0).json()
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print_table(rows)
+    print(f"\nserver: {json.dumps({k: server_stats[k] for k in ('requests', 'errors', 'bytes_sent')})}")  # noqa: T201
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump({"rows": rows, "server": server_stats, "args": vars(args)}, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
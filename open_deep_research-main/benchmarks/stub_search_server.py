@@ -0,0 +1,372 @@
+"""Local stand-in for the Perplexica and SearCrawl search services.
+
+Speaks the same HTTP contracts the search clients use, with synthetic results
+whose latency, failure rate and payload sizes are configurable, so the search
+tool path can be benchmarked without a live AKS deployment:
+
+- ``POST /api/tavily`` and ``POST /api/tavily/batch`` (Perplexica)
+- ``POST /search`` (incl. ``"stream": true`` NDJSON) and ``POST /search/batch`` (SearCrawl)
+- ``GET /page/{page_id}`` HTML pages behind every result URL, for crawl benchmarks
+- ``POST /v1/chat/completions`` OpenAI-compatible stand-in for the summarization model
+- ``GET /stats`` request and byte counters
+
+Usage:
+    python benchmarks/stub_search_server.py --port 8765 --latency-ms 800 --error-rate 0.02
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+
+@dataclass
+class StubProfile:
+    """Latency, failure and payload settings of the stand-in server."""
+
+    # Search latency: lognormal around the median (sigma 0 = fixed latency)
+    latency_ms: float = 800.0
+    latency_sigma: float = 0.5
+    # Extra per-page latency when SearCrawl is asked for raw content
+    crawl_latency_ms: float = 1500.0
+    # Fraction of requests answered with an error status / never answered
+    error_rate: float = 0.0
+    error_statuses: str = "500,502,503,429"
+    timeout_rate: float = 0.0
+    hang_seconds: float = 600.0
+    # Payload shape
+    results_per_query: int = 5
+    content_chars: int = 500
+    raw_content_chars: int = 20000
+    raw_content_sigma: float = 0.6
+    image_rate: float = 0.3
+    # Summarization model stand-in
+    llm_latency_ms: float = 1500.0
+    llm_latency_sigma: float = 0.3
+    seed: int = 0
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add one ``--option`` per StubProfile field to ``parser``."""
+    for field in fields(StubProfile):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=field.type if field.type in (int, float) else str,
+            default=field.default,
+        )
+
+
+def profile_from_args(args: argparse.Namespace) -> StubProfile:
+    """Build a StubProfile from parsed ``add_profile_arguments`` options."""
+    return StubProfile(**{field.name: getattr(args, field.name) for field in fields(StubProfile)})
+
+
+def profile_to_argv(profile: StubProfile) -> List[str]:
+    """Render a StubProfile back into command line options."""
+    argv = []
+    for name, value in asdict(profile).items():
+        argv += [f"--{name.replace('_', '-')}", str(value)]
+    return argv
+
+
+_WORDS = (
+    "research model search result latency benchmark crawler content market analysis "
+    "system data network browser summary evidence source report signal query index "
+    "performance throughput pipeline cache request response engine document page"
+).split()
+
+
+class StubSearchServer:
+    """Synthetic search backend state: profile, text corpus and counters."""
+
+    def __init__(self, profile: StubProfile):
+        """Initialize the server.
+
+        Args:
+            profile: Latency, failure and payload settings
+        """
+        self.profile = profile
+        self.random = random.Random(profile.seed)
+        self.error_statuses = [int(code) for code in profile.error_statuses.split(",") if code.strip()]
+        # One pre-generated corpus sliced per page keeps text generation cheap
+        corpus_rng = random.Random(profile.seed)
+        paragraphs = []
+        for i in range(400):
+            words = " ".join(corpus_rng.choice(_WORDS) for _ in range(corpus_rng.randint(40, 120)))
+            heading = f"\n## Section {i}\n\n" if i % 5 == 0 else "\n\n"
+            paragraphs.append(heading + words.capitalize() + ".")
+        self.corpus = "".join(paragraphs)
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.bytes_sent = 0
+        self.started_at = time.time()
+
+    def sample_latency(self, median_ms: float, sigma: float) -> float:
+        """Return a latency in seconds drawn from a lognormal around ``median_ms``."""
+        if median_ms <= 0:
+            return 0.0
+        return median_ms / 1000 * math.exp(sigma * self.random.gauss(0, 1))
+
+    def text(self, seed: str, chars: int) -> str:
+        """Return ``chars`` characters of deterministic markdown-like text for ``seed``."""
+        if chars <= 0:
+            return ""
+        offset = int(hashlib.md5(seed.encode()).hexdigest()[:8], 16) % len(self.corpus)
+        if offset + chars <= len(self.corpus):
+            return self.corpus[offset:offset + chars]
+        repeats = chars // len(self.corpus) + 2
+        return (self.corpus * repeats)[offset:offset + chars]
+
+    def raw_content_size(self) -> int:
+        """Sample a raw_content length around the configured median."""
+        median = self.profile.raw_content_chars
+        return int(median * math.exp(self.profile.raw_content_sigma * self.random.gauss(0, 1)))
+
+    def make_results(
+        self, base_url: str, query: str, max_results: int, include_raw_content: bool
+    ) -> List[Dict[str, Any]]:
+        """Build synthetic Tavily-format results for ``query``."""
+        results = []
+        for i in range(min(max_results, self.profile.results_per_query)):
+            page_id = f"{hashlib.md5(query.encode()).hexdigest()[:12]}-{i}"
+            result = {
+                "title": f"{query[:60]} - result {i + 1}",
+                "url": f"{base_url}/page/{page_id}",
+                "content": self.text(page_id + "c", self.profile.content_chars),
+                "score": round(1.0 - i * 0.1, 2),
+                "published_date": "2025-01-01",
+            }
+            if include_raw_content:
+                result["raw_content"] = self.text(page_id, self.raw_content_size())
+            if self.random.random() < self.profile.image_rate:
+                result["img_src"] = f"{base_url}/page/{page_id}/image.png"
+            results.append(result)
+        return results
+
+    async def maybe_fail(self, route: str) -> Optional[Response]:
+        """Simulate a hung or failed request according to the profile."""
+        roll = self.random.random()
+        if roll < self.profile.timeout_rate:
+            self.errors[f"{route}:timeout"] += 1
+            await asyncio.sleep(self.profile.hang_seconds)
+        elif roll < self.profile.timeout_rate + self.profile.error_rate and self.error_statuses:
+            status = self.random.choice(self.error_statuses)
+            self.errors[f"{route}:{status}"] += 1
+            headers = {"Retry-After": "1"} if status in (429, 503) else None
+            return JSONResponse({"error": f"Simulated error {status}"}, status_code=status, headers=headers)
+        return None
+
+    def json(self, body: Any, status_code: int = 200) -> Response:
+        """Encode ``body`` as JSON and count the bytes sent."""
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.bytes_sent += len(data)
+        return Response(data, status_code=status_code, media_type="application/json")
+
+    async def search_one(
+        self, base_url: str, query: str, payload: Dict[str, Any], crawl: bool
+    ) -> Dict[str, Any]:
+        """Answer a single query after the simulated search (and crawl) latency."""
+        start = time.monotonic()
+        max_results = int(payload.get("max_results") or payload.get("limit") or 5)
+        include_raw_content = bool(payload.get("include_raw_content"))
+        delay = self.sample_latency(self.profile.latency_ms, self.profile.latency_sigma)
+        if crawl and include_raw_content:
+            delay += self.sample_latency(self.profile.crawl_latency_ms, self.profile.latency_sigma)
+        await asyncio.sleep(delay)
+        return {
+            "query": query,
+            "results": self.make_results(base_url, query, max_results, include_raw_content),
+            "answer": None,
+            "images": [],
+            "follow_up_questions": None,
+            "response_time": round(time.monotonic() - start, 3),
+        }
+
+    async def search_batch(
+        self, base_url: str, payload: Dict[str, Any], crawl: bool, route: str
+    ) -> Response:
+        """Answer a ``{"queries": [...]}`` batch with per-query errors."""
+        queries = payload.get("queries") or []
+        if not queries:
+            return self.json({"error": "Missing required parameter: queries"}, status_code=400)
+        self.requests[route] += 1
+
+        async def answer(query: str) -> Dict[str, Any]:
+            failure = await self.maybe_fail(route)
+            if failure is not None:
+                return {"query": query, "results": [], "error": "Simulated error",
+                        "status_code": failure.status_code}
+            return await self.search_one(base_url, query, payload, crawl)
+
+        start = time.monotonic()
+        responses = await asyncio.gather(*(answer(query) for query in queries))
+        return self.json({"responses": responses, "response_time": round(time.monotonic() - start, 3)})
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, error and byte counters."""
+        return {
+            "uptime": round(time.time() - self.started_at, 1),
+            "requests": dict(self.requests),
+            "errors": dict(self.errors),
+            "bytes_sent": self.bytes_sent,
+            "profile": asdict(self.profile),
+        }
+
+
+def create_app(profile: StubProfile) -> Starlette:
+    """Create the stand-in server app for ``profile``."""
+    server = StubSearchServer(profile)
+
+    def base_url(request: Request) -> str:
+        return f"{request.url.scheme}://{request.url.netloc}"
+
+    async def perplexica_search(request: Request) -> Response:
+        payload = await request.json()
+        server.requests["perplexica"] += 1
+        failure = await server.maybe_fail("perplexica")
+        if failure is not None:
+            return failure
+        return server.json(await server.search_one(base_url(request), payload.get("query", ""), payload, crawl=False))
+
+    async def perplexica_batch(request: Request) -> Response:
+        return await server.search_batch(base_url(request), await request.json(), crawl=False, route="perplexica_batch")
+
+    async def searcrawl_search(request: Request) -> Response:
+        payload = await request.json()
+        query = payload.get("query", "")
+        if not payload.get("stream"):
+            server.requests["searcrawl"] += 1
+            failure = await server.maybe_fail("searcrawl")
+            if failure is not None:
+                return failure
+            return server.json(await server.search_one(base_url(request), query, payload, crawl=True))
+
+        server.requests["searcrawl_stream"] += 1
+        failure = await server.maybe_fail("searcrawl_stream")
+        if failure is not None:
+            return failure
+        limit = int(payload.get("limit") or 5)
+        results = server.make_results(base_url(request), query, limit, include_raw_content=True)
+
+        async def stream():
+            await asyncio.sleep(server.sample_latency(profile.latency_ms, profile.latency_sigma))
+            # Pages are crawled in parallel and emitted in completion order
+            delays = sorted(
+                (server.sample_latency(profile.crawl_latency_ms, profile.latency_sigma), i)
+                for i in range(len(results))
+            )
+            elapsed = 0.0
+            for delay, i in delays:
+                await asyncio.sleep(delay - elapsed)
+                elapsed = delay
+                line = json.dumps(results[i], ensure_ascii=False).encode("utf-8") + b"\n"
+                server.bytes_sent += len(line)
+                yield line
+            yield json.dumps({"event": "done", "count": len(results)}).encode("utf-8") + b"\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    async def searcrawl_batch(request: Request) -> Response:
+        return await server.search_batch(base_url(request), await request.json(), crawl=True, route="searcrawl_batch")
+
+    async def page(request: Request) -> Response:
+        page_id = request.path_params["page_id"]
+        server.requests["page"] += 1
+        failure = await server.maybe_fail("page")
+        if failure is not None:
+            return failure
+        await asyncio.sleep(server.sample_latency(profile.crawl_latency_ms, profile.latency_sigma))
+        body = server.text(page_id, server.raw_content_size())
+        paragraphs = "".join(f"<p>{block}</p>" for block in body.split("\n\n") if block)
+        html = (
+            f"<html><head><title>{page_id}</title></head><body>"
+            f"<nav>Home | About</nav><article><h1>{page_id}</h1>{paragraphs}"
+            f'<img src="/page/{page_id}/image.png" alt="figure"></article>'
+            "<footer>stub</footer></body></html>"
+        )
+        server.bytes_sent += len(html)
+        return HTMLResponse(html)
+
+    async def chat_completions(request: Request) -> Response:
+        payload = await request.json()
+        server.requests["llm"] += 1
+        failure = await server.maybe_fail("llm")
+        if failure is not None:
+            return failure
+        await asyncio.sleep(server.sample_latency(profile.llm_latency_ms, profile.llm_latency_sigma))
+        prompt_chars = sum(len(str(message.get("content", ""))) for message in payload.get("messages", []))
+        summary = {
+            "summary": server.text(f"summary-{prompt_chars}", 800),
+            "key_excerpts": server.text(f"excerpts-{prompt_chars}", 400),
+        }
+        arguments = json.dumps(summary)
+        message: Dict[str, Any] = {"role": "assistant", "content": arguments}
+        tools = payload.get("tools") or []
+        if tools:
+            # Structured output via function calling
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_{server.requests['llm']}",
+                    "type": "function",
+                    "function": {"name": tools[0]["function"]["name"], "arguments": arguments},
+                }],
+            }
+        completion_tokens = len(arguments) // 4
+        return server.json({
+            "id": f"chatcmpl-stub-{server.requests['llm']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if tools else "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_chars // 4 + completion_tokens,
+            },
+        })
+
+    async def stats(request: Request) -> Response:
+        return JSONResponse(server.stats())
+
+    return Starlette(routes=[
+        Route("/api/tavily", perplexica_search, methods=["POST"]),
+        Route("/api/tavily/batch", perplexica_batch, methods=["POST"]),
+        Route("/search", searcrawl_search, methods=["POST"]),
+        Route("/search/batch", searcrawl_batch, methods=["POST"]),
+        Route("/page/{page_id}", page, methods=["GET"]),
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/stats", stats, methods=["GET"]),
+    ])
+
+
+def main() -> None:
+    """Run the stand-in server."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local stand-in Perplexica/SearCrawl server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(profile_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Custom HTTP app mounted by the LangGraph server for process-wide resources.
+
+The lifespan hook owns the long-lived search clients, crawler browsers and
+crawl worker processes shared by every research run in this process, and
+``/search/stats`` exposes their runtime counters. The stats route is not
+authenticated, so it is only mounted when SEARCH_STATS_ENABLED=true.
+"""
+
+import os
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from open_deep_research.backend_health import backend_health_stats
+from open_deep_research.crawl_cache import get_crawl_cache
+from open_deep_research.crawl_scheduler import crawl_scheduler_stats
+from open_deep_research.crawl_workers import (
+    crawl_worker_stats,
+    get_crawl_worker_pool,
+    is_crawl_worker_mode,
+    shutdown_crawl_workers,
+)
+from open_deep_research.crawler_pool import (
+    aclose_crawler_pools,
+    crawl_batch_stats,
+    crawler_pool_stats,
+    warm_crawler_pool,
+)
+from open_deep_research.document_extractor import (
+    get_document_extractor,
+    shutdown_document_extractor,
+)
+from open_deep_research.domain_stats import get_domain_stats
+from open_deep_research.embedding_rerank import embedding_rerank_stats
+from open_deep_research.http_pool import aclose_shared_http_clients, http_pool_stats
+from open_deep_research.micro_batcher import micro_batcher_stats
+from open_deep_research.page_fetcher import get_page_fetcher
+from open_deep_research.rate_limit import rate_limiter_stats
+from open_deep_research.search_cache import get_search_cache
+from open_deep_research.singleflight import single_flight_stats
+from open_deep_research.summary_cache import get_summary_cache
+from open_deep_research.summary_packing import summary_packing_stats
+from open_deep_research.summary_tiers import get_summary_tier_stats
+from open_deep_research.url_registry import url_registry_stats
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    """Warm the crawler pool (or start crawl workers) on startup; close them on shutdown."""
+    if is_crawl_worker_mode():
+        get_crawl_worker_pool()
+    else:
+        await warm_crawler_pool()
+    try:
+        yield
+    finally:
+        await aclose_shared_http_clients()
+        await aclose_crawler_pools()
+        shutdown_crawl_workers()
+        shutdown_document_extractor()
+
+
+async def search_stats(request: Request) -> JSONResponse:
+    """Report pool, rate limiter, cache, coalescing, batching and backend latency counters."""
+    search_cache = get_search_cache()
+    crawl_cache = get_crawl_cache()
+    domain_stats = get_domain_stats()
+    summary_cache = get_summary_cache()
+    return JSONResponse({
+        "http_pools": http_pool_stats(),
+        "rate_limiters": rate_limiter_stats(),
+        "search_cache": search_cache.stats() if search_cache else None,
+        "single_flight": single_flight_stats(),
+        "micro_batches": micro_batcher_stats(),
+        "backends": backend_health_stats(),
+        "crawler_pools": crawler_pool_stats(),
+        "crawl_batches": crawl_batch_stats(),
+        "crawl_schedulers": crawl_scheduler_stats(),
+        "crawl_cache": crawl_cache.stats() if crawl_cache else None,
+        "fetch_tiers": get_page_fetcher().stats(),
+        "documents": get_document_extractor().stats(),
+        "domains": domain_stats.stats() if domain_stats else None,
+        "crawl_workers": crawl_worker_stats(),
+        "url_registries": url_registry_stats(),
+        "summary_cache": summary_cache.stats() if summary_cache else None,
+        "summary_tiers": get_summary_tier_stats().stats(),
+        "summary_packing": summary_packing_stats(),
+        "embedding_rerank": embedding_rerank_stats(),
+    })
+
+
+# 统计接口会暴露后端名称、延迟和缓存信息，默认不挂载
+routes = []
+if os.getenv("SEARCH_STATS_ENABLED", "false").lower() == "true":
+    routes.append(Route("/search/stats", search_stats, methods=["GET"]))
+
+app = Starlette(routes=routes, lifespan=lifespan)
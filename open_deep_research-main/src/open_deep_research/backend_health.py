@@ -0,0 +1,387 @@
+"""Latency tracking, request hedging and circuit breaking for the search backends."""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies for one backend.
+
+    Calls cancelled before they finished (e.g. the loser of a hedge race) are
+    recorded as censored samples at their elapsed time, a lower bound on their
+    real latency. Dropping them would leave only the fast calls in the window
+    and pull the hedge delay down, making hedging feed on itself.
+    """
+
+    def __init__(self, window: int = 200):
+        """Initialize the tracker.
+
+        Args:
+            window: Number of most recent samples kept for percentile estimates
+        """
+        self._samples = deque(maxlen=window)
+        self._censored = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, censored: bool = False) -> None:
+        """Record the latency of one call.
+
+        Args:
+            seconds: Call latency, or time elapsed until it was cancelled
+            censored: Whether the call was cancelled before it finished
+        """
+        with self._lock:
+            self._samples.append(seconds)
+            self._censored.append(censored)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the ``q`` quantile (0-1) of recorded latencies, or None if empty."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))
+        return samples[index]
+
+    def count(self) -> int:
+        """Return the number of samples in the window."""
+        with self._lock:
+            return len(self._samples)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return p50/p95/p99 latency over the current window."""
+        with self._lock:
+            censored = sum(self._censored)
+        return {
+            "samples": self.count(),
+            "censored": censored,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+_latency_trackers: Dict[str, LatencyTracker] = {}
+_latency_trackers_lock = threading.Lock()
+
+
+def get_latency_tracker(backend: str) -> LatencyTracker:
+    """Return the process-wide latency tracker for a search backend."""
+    with _latency_trackers_lock:
+        tracker = _latency_trackers.get(backend)
+        if tracker is None:
+            tracker = _latency_trackers[backend] = LatencyTracker()
+        return tracker
+
+
+def get_hedge_delay(backend: str) -> float:
+    """Return how long to wait on ``backend`` before firing a hedged request.
+
+    Uses the observed SEARCH_HEDGE_PERCENTILE (default p95) latency once at
+    least SEARCH_HEDGE_MIN_SAMPLES calls were recorded, and
+    SEARCH_HEDGE_DEFAULT_DELAY seconds before that.
+    """
+    tracker = get_latency_tracker(backend)
+    min_samples = int(os.getenv("SEARCH_HEDGE_MIN_SAMPLES", "20"))
+    if tracker.count() >= min_samples:
+        observed = tracker.percentile(float(os.getenv("SEARCH_HEDGE_PERCENTILE", "0.95")))
+        if observed is not None:
+            return observed
+    return float(os.getenv("SEARCH_HEDGE_DEFAULT_DELAY", "30"))
+
+
+class HedgeStats:
+    """Counters describing how often hedging fired and which side won."""
+
+    def __init__(self):
+        """Initialize all counters to zero."""
+        self.requests = 0
+        self.hedged = 0
+        self.primary_wins = 0
+        self.hedge_wins = 0
+        self._lock = threading.Lock()
+
+    def add(self, hedged: bool = False, winner: Optional[str] = None) -> None:
+        """Record one request, whether it was hedged and which side won it."""
+        with self._lock:
+            self.requests += 1
+            self.hedged += int(hedged)
+            if winner == "primary":
+                self.primary_wins += 1
+            elif winner == "hedge":
+                self.hedge_wins += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hedge rate and win counts."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_rate": round(self.hedged / self.requests, 3) if self.requests else 0.0,
+                "primary_wins": self.primary_wins,
+                "hedge_wins": self.hedge_wins,
+            }
+
+
+hedge_stats = HedgeStats()
+
+
+async def hedged_call(
+    primary: Callable[[], Awaitable[Any]],
+    hedge: Callable[[], Awaitable[Any]],
+    delay: float,
+    is_usable: Callable[[Any], bool],
+    label: str = "",
+) -> Any:
+    """Run ``primary`` and, if it is slow, race it against ``hedge``.
+
+    The hedge is only started when the primary hasn't produced a usable result
+    within ``delay`` seconds (or failed earlier). The first usable result wins
+    and the other call is cancelled. When neither side is usable, the primary's
+    outcome is returned (or raised).
+
+    Args:
+        primary: Coroutine factory for the primary backend call
+        hedge: Coroutine factory for the secondary backend call
+        delay: Seconds to wait on the primary before hedging
+        is_usable: Predicate deciding whether a result is good enough to win
+        label: Short description used in log messages
+
+    Returns:
+        The winning result
+    """
+    primary_task = asyncio.ensure_future(primary())
+    hedge_task = None
+    winner_task = None
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        if done and _task_usable(primary_task, is_usable):
+            hedge_stats.add(hedged=False, winner="primary")
+            return primary_task.result()
+
+        logger.info(f"🪁 Hedging {label} after {delay:.1f}s")
+        hedge_task = asyncio.ensure_future(hedge())
+        pending = {hedge_task} if primary_task.done() else {primary_task, hedge_task}
+        while pending and winner_task is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if _task_usable(task, is_usable):
+                    winner_task = task
+                    break
+    finally:
+        # Also runs when the caller is cancelled, so no call is left orphaned
+        for task in (primary_task, hedge_task):
+            if task is not None and not task.done():
+                task.cancel()
+
+    if winner_task is None:
+        hedge_stats.add(hedged=True)
+        return primary_task.result()
+
+    winner = "primary" if winner_task is primary_task else "hedge"
+    hedge_stats.add(hedged=True, winner=winner)
+    logger.info(f"🪁 Hedge race for {label} won by {winner} ({hedge_stats.stats()})")
+    return winner_task.result()
+
+
+def _task_usable(task: asyncio.Future, is_usable: Callable[[Any], bool]) -> bool:
+    return not task.cancelled() and task.exception() is None and is_usable(task.result())
+
+
+def parse_retry_after(value: Union[str, int, float, None]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds from now."""
+    if value in (None, ""):
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_backend_failure(result: Dict[str, Any]) -> bool:
+    """Return True if a backend response signals the backend itself is unhealthy.
+
+    Timeouts, connection errors, 429 and 5xx responses count as failures.
+    Other 4xx responses are request problems and an empty result list is a
+    legitimate answer, so neither trips the breaker.
+    """
+    if not result or not result.get("error"):
+        return False
+    status_code = result.get("status_code")
+    if status_code is None:
+        return True
+    return status_code in (408, 429) or status_code >= 500
+
+
+class CircuitBreaker:
+    """Per-backend circuit breaker with half-open probing and exponential backoff.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects requests for a cooldown that doubles on every consecutive trip (up
+    to ``max_cooldown``) and never ends before a server-provided Retry-After.
+    Once the cooldown has elapsed a single probe request is let through
+    (half-open); its outcome closes the breaker or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        base_cooldown: float = 10.0,
+        max_cooldown: float = 300.0,
+    ):
+        """Initialize a closed breaker.
+
+        Args:
+            name: Backend name used in logs
+            failure_threshold: Consecutive failures that open the breaker
+            base_cooldown: Cooldown in seconds after the first trip
+            max_cooldown: Upper bound on the exponential cooldown
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.state = self.CLOSED
+        self._consecutive_failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.total_trips = 0
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent to the backend right now."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() >= self._open_until:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.info(f"🔌 Circuit breaker '{self.name}' half-open: sending probe request")
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Return seconds until the breaker will let a probe through (0 if closed)."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return 0.0
+            return max(0.0, self._open_until - time.monotonic())
+
+    def record_success(self) -> None:
+        """Record a healthy response and close the breaker."""
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"✅ Circuit breaker '{self.name}' closed after successful probe")
+            self.state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trips = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """Record a failed call, opening the breaker when the threshold is reached.
+
+        Args:
+            retry_after: Seconds the server asked us to wait (Retry-After), if any
+        """
+        with self._lock:
+            self._consecutive_failures += 1
+            should_open = (
+                self.state == self.HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+                or retry_after is not None
+            )
+            if not should_open:
+                return
+            self._trips += 1
+            self.total_trips += 1
+            cooldown = min(self.max_cooldown, self.base_cooldown * 2 ** (self._trips - 1))
+            cooldown *= random.uniform(0.8, 1.2)  # de-synchronize probes across pods
+            cooldown = max(cooldown, retry_after or 0.0)
+            self.state = self.OPEN
+            self._open_until = time.monotonic() + cooldown
+            self._probe_in_flight = False
+            logger.warning(f"🚫 Circuit breaker '{self.name}' open for {cooldown:.0f}s (trip #{self._trips})")
+
+    def record_cancelled(self) -> None:
+        """Release the half-open probe slot when a probe was cancelled before finishing."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_result(self, result: Dict[str, Any]) -> None:
+        """Record a backend response, classifying it with ``is_backend_failure``."""
+        if is_backend_failure(result):
+            self.record_failure(parse_retry_after(result.get("retry_after")))
+        else:
+            self.record_success()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._consecutive_failures,
+            "trips": self.total_trips,
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in(), 1),
+        }
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(backend: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a search backend.
+
+    Tuned with SEARCH_BREAKER_FAILURES, SEARCH_BREAKER_BASE_COOLDOWN and
+    SEARCH_BREAKER_MAX_COOLDOWN (seconds).
+    """
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(backend)
+        if breaker is None:
+            breaker = _circuit_breakers[backend] = CircuitBreaker(
+                backend,
+                failure_threshold=int(os.getenv("SEARCH_BREAKER_FAILURES", "5")),
+                base_cooldown=float(os.getenv("SEARCH_BREAKER_BASE_COOLDOWN", "10")),
+                max_cooldown=float(os.getenv("SEARCH_BREAKER_MAX_COOLDOWN", "300")),
+            )
+        return breaker
+
+
+def backend_health_stats() -> Dict[str, Any]:
+    """Return latency percentiles, breaker states and hedging counters per backend."""
+    with _latency_trackers_lock:
+        trackers = dict(_latency_trackers)
+    with _circuit_breakers_lock:
+        breakers = dict(_circuit_breakers)
+    return {
+        "latency": {backend: tracker.stats() for backend, tracker in trackers.items()},
+        "circuit_breakers": {backend: breaker.stats() for backend, breaker in breakers.items()},
+        "hedging": hedge_stats.stats(),
+    }
@@ -0,0 +1,158 @@
+"""SQLite-backed key/value store with TTLs and LRU bounds used by the caches."""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from open_deep_research import fast_json
+
+
+def get_cache_path(filename: str) -> str:
+    """Return the on-disk path for a cache database.
+
+    The directory comes from ``OPEN_DEEP_RESEARCH_CACHE_DIR`` (defaults to
+    ``~/.cache/open_deep_research``). Point it at a per-pod local disk
+    (e.g. an ``emptyDir`` or node-local volume) to keep caches across
+    restarts. Do not share it between pods over a network filesystem such as
+    Azure Files/SMB or NFS: the stores use SQLite WAL mode, which relies on
+    shared memory and locking those filesystems don't provide.
+    """
+    cache_dir = os.getenv(
+        "OPEN_DEEP_RESEARCH_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "open_deep_research"),
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, filename)
+
+
+class SQLiteCacheStore:
+    """Persistent JSON value store with per-entry TTL and LRU eviction.
+
+    All SQLite work runs under one lock on a single connection; the async
+    methods push it to a worker thread so the event loop is never blocked on
+    disk I/O.
+    """
+
+    def __init__(self, path: str, table: str = "cache", max_entries: int = 10000):
+        """Open (or create) the store.
+
+        Args:
+            path: SQLite database file path (":memory:" for a process-local store)
+            table: Table name, so several caches can share one database file
+            max_entries: Upper bound on stored entries; least recently used
+                entries are evicted beyond it
+        """
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL, "
+            "expires_at REAL, last_access REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_lru ON {table} (last_access)")
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        return fast_json.dumps_bytes(value)
+
+    @staticmethod
+    def _loads(data: bytes) -> Any:
+        return fast_json.loads(data)
+
+    def get(self, key: str, include_stale: bool = False) -> Optional[Any]:
+        """Return the cached value for ``key`` or None on a miss.
+
+        Args:
+            key: Cache key
+            include_stale: Return expired entries too (counted as hits), for
+                callers that revalidate stale entries themselves
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at < now and not include_stale:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+        return self._loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key``, expiring after ``ttl`` seconds (None = never)."""
+        data = self._dumps(value)
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, created_at, expires_at, last_access, size) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, data, now, expires_at, now, len(data)),
+            )
+            self._evict_locked()
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from the store if present."""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def _evict_locked(self) -> None:
+        (count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+        # Evict a little more than needed so we don't run this on every insert
+        to_evict = overflow + max(1, self.max_entries // 20)
+        cursor = self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN "
+            f"(SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+            (to_evict,),
+        )
+        self.evictions += cursor.rowcount
+
+    async def aget(self, key: str, include_stale: bool = False) -> Optional[Any]:
+        """Async version of ``get`` that runs in a worker thread."""
+        return await asyncio.to_thread(self.get, key, include_stale)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Async version of ``set`` that runs in a worker thread."""
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size of the store."""
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
@@ -2,7 +2,7 @@
 
 import os
 from enum import Enum
-from typing import Any, List, Optional
+from typing import Any, List, Literal, Optional
 
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
@@ -138,6 +138,40 @@ class Configuration(BaseModel):
             }
         }
     )
+    summarization_bypass_tokens: int = Field(
+        default=500,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 500,
+                "min": 0,
+                "max": 5000,
+                "description": "Webpages up to this many tokens are passed through verbatim instead of being summarized. 0 summarizes every page"
+            }
+        }
+    )
+    fast_summarization_model: str = Field(
+        default="",
+        metadata={
+            "x_oap_ui_config": {
+                "type": "text",
+                "default": "",
+                "description": "Cheaper, faster model for summarizing mid-size webpages (e.g. openai:gpt-4.1-nano). Empty sends every page to the summarization model"
+            }
+        }
+    )
+    fast_summarization_max_tokens: int = Field(
+        default=4000,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 4000,
+                "min": 0,
+                "max": 50000,
+                "description": "Webpages up to this many tokens go to the fast summarization model; longer ones go to the summarization model"
+            }
+        }
+    )
     max_content_length: int = Field(
         default=50000,
         metadata={
@@ -150,6 +184,66 @@ class Configuration(BaseModel):
             }
         }
     )
+    process_search_results: Literal["summarize", "split_and_rerank"] = Field(
+        default="summarize",
+        metadata={
+            "x_oap_ui_config": {
+                "type": "select",
+                "default": "summarize",
+                "description": "How search results are condensed: summarize each page with the summarization model, or keep the page chunks most similar to the query using a local embedding model (no LLM calls)",
+                "options": [
+                    {"label": "Summarize", "value": "summarize"},
+                    {"label": "Split and Rerank", "value": "split_and_rerank"}
+                ]
+            }
+        }
+    )
+    rerank_embedding_model: str = Field(
+        default="sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+        metadata={
+            "x_oap_ui_config": {
+                "type": "text",
+                "default": "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2",
+                "description": "Local sentence-transformers model used when process_search_results is split_and_rerank"
+            }
+        }
+    )
+    rerank_max_chunks: int = Field(
+        default=5,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 5,
+                "min": 1,
+                "max": 50,
+                "description": "Page chunks kept per search query when process_search_results is split_and_rerank"
+            }
+        }
+    )
+    summary_pack_token_budget: int = Field(
+        default=0,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 0,
+                "min": 0,
+                "max": 100000,
+                "description": "Token budget of one packed summarization call; webpages up to half this size are summarized several at a time in a single call. 0 summarizes each page in its own call"
+            }
+        }
+    )
+    passage_token_budget: int = Field(
+        default=6000,
+        metadata={
+            "x_oap_ui_config": {
+                "type": "number",
+                "default": 6000,
+                "min": 0,
+                "max": 50000,
+                "description": "Token budget of webpage content sent to the summarizer; longer pages are reduced to the passages most relevant to the search query (BM25). 0 disables passage selection"
+            }
+        }
+    )
     research_model: str = Field(
         default="openai:gpt-4.1",
         metadata={
@@ -0,0 +1,224 @@
+"""Persistent cache of crawled page content with conditional-GET revalidation."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from open_deep_research.cache_store import SQLiteCacheStore, get_cache_path
+from open_deep_research.document_extractor import UnsupportedContentError
+from open_deep_research.http_pool import get_shared_http_client
+from open_deep_research.page_fetcher import (
+    FETCH_HEADERS,
+    FETCH_LIMITS,
+    Download,
+    FetchedPage,
+    get_page_fetcher,
+)
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that only track the visitor and never change the page.
+# Generic names such as ``ref`` are left alone: they often select content (git refs, doc versions).
+_TRACKING_PARAMS = {"gclid", "dclid", "fbclid", "msclkid", "yclid", "mc_cid", "mc_eid", "ref_src", "spm", "_hsenc", "_hsmi"}
+
+REVALIDATION_TIMEOUT = httpx.Timeout(connect=5.0, read=10.0, write=5.0, pool=5.0)
+
+
+def canonicalize_url(url: str) -> str:
+    """Return a canonical form of ``url`` so equivalent links share a cache entry.
+
+    Lowercases scheme and host, drops default ports, in-page fragments and
+    known tracking parameters (``utm_*``, ``gclid``, ...) and sorts the
+    remaining query parameters by name, keeping the order of repeated names
+    (``?a=2&a=1`` differs from ``?a=1&a=2``). The path (including a trailing
+    slash), ``www.`` and hash-routing fragments (``#!`` / ``#/``) are kept,
+    since servers and single-page apps can serve different content for them.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    query = sorted(
+        (
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith("utm_") and key.lower() not in _TRACKING_PARAMS
+        ),
+        key=lambda item: item[0],
+    )
+    fragment = parts.fragment if parts.fragment.startswith(("!", "/")) else ""
+    return urlunsplit((scheme, host, path, urlencode(query), fragment))
+
+
+class CrawlCache:
+    """Crawled markdown/images per canonical URL, revalidated after a TTL.
+
+    Entries younger than ``ttl`` are served as-is. Older entries are
+    revalidated with a conditional GET (``If-None-Match`` / ``If-Modified-Since``)
+    when the page sent validators; a 304 refreshes the entry without
+    re-rendering the page in a browser. Entries are kept in the store for
+    ``max_age`` seconds so they stay available for revalidation.
+    """
+
+    def __init__(self, store: SQLiteCacheStore, ttl: float = 24 * 3600, max_age: float = 7 * 24 * 3600):
+        """Initialize the cache.
+
+        Args:
+            store: Backing key/value store
+            ttl: Seconds an entry is served without revalidation
+            max_age: Seconds an entry is kept at all
+        """
+        self.store = store
+        self.ttl = ttl
+        self.max_age = max(max_age, ttl)
+        self.hits = 0
+        self.revalidated = 0
+        self.stale = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+
+    async def get(self, url: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Look up ``url``.
+
+        Returns:
+            Tuple of (entry or None, whether the entry is fresh). A stale entry
+            should be passed to ``revalidate`` before it is used.
+        """
+        entry = await self.store.aget(canonicalize_url(url))
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None, False
+        fresh = time.time() - entry.get("fetched_at", 0) < self.ttl
+        if fresh:
+            with self._lock:
+                self.hits += 1
+                self.bytes_saved += len(entry.get("markdown", "").encode("utf-8"))
+        return entry, fresh
+
+    async def revalidate(self, url: str, entry: Dict[str, Any]) -> Tuple[bool, Optional[FetchedPage]]:
+        """Check a stale entry with a conditional GET.
+
+        Returns:
+            Tuple of (unchanged, page). ``unchanged`` is True if the page is
+            unchanged (304) and the entry was refreshed. Otherwise the page
+            should be crawled again; if the server answered with the new
+            content and it is usable without a browser, ``page`` holds it so
+            it isn't downloaded twice.
+        """
+        headers = dict(FETCH_HEADERS)
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if len(headers) == len(FETCH_HEADERS):
+            with self._lock:
+                self.stale += 1
+            return False, None
+        fetcher = get_page_fetcher()
+
+        async def conditional_get() -> Tuple[int, Optional[Download]]:
+            client = get_shared_http_client("crawl", timeout=REVALIDATION_TIMEOUT, limits=FETCH_LIMITS)
+            async with client.stream(
+                "GET", url, headers=headers, timeout=REVALIDATION_TIMEOUT, follow_redirects=True
+            ) as response:
+                if response.status_code != 200:
+                    return response.status_code, None
+                # The page changed: keep its body for the re-crawl
+                return 200, await fetcher.read_response(url, response)
+
+        try:
+            status_code, download = await asyncio.wait_for(conditional_get(), fetcher.http_total_timeout)
+        except (httpx.HTTPError, asyncio.TimeoutError, UnsupportedContentError) as e:
+            logger.debug(f"Revalidation of {url} failed: {e}")
+            with self._lock:
+                self.stale += 1
+            return False, None
+        if status_code != 304:
+            with self._lock:
+                self.stale += 1
+            page = None
+            if download is not None:
+                try:
+                    page = await fetcher.extract(download)
+                except Exception as e:
+                    logger.debug(f"Extraction of revalidated {url} failed: {e}")
+            return False, page
+        entry = {**entry, "fetched_at": time.time()}
+        await self.store.aset(canonicalize_url(url), entry, self.max_age)
+        with self._lock:
+            self.revalidated += 1
+            self.bytes_saved += len(entry.get("markdown", "").encode("utf-8"))
+        return True, None
+
+    async def put(
+        self,
+        url: str,
+        markdown: str,
+        images: Optional[List[str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Store crawled content for ``url`` with the validators from its response headers."""
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        entry = {
+            "url": url,
+            "markdown": markdown,
+            "images": images or [],
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": time.time(),
+        }
+        await self.store.aset(canonicalize_url(url), entry, self.max_age)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/revalidation counters, bytes saved and store size."""
+        lookups = self.hits + self.revalidated + self.stale + self.misses
+        served = self.hits + self.revalidated
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "stale": self.stale,
+            "misses": self.misses,
+            "hit_rate": round(served / lookups, 3) if lookups else 0.0,
+            "bytes_saved": self.bytes_saved,
+            "store": self.store.stats(),
+        }
+
+
+_crawl_cache: Optional[CrawlCache] = None
+_crawl_cache_lock = threading.Lock()
+
+
+def get_crawl_cache() -> Optional[CrawlCache]:
+    """Return the process-wide crawl cache, or None when disabled.
+
+    Controlled by CRAWL_CACHE_ENABLED (default true), CRAWL_CACHE_PATH,
+    CRAWL_CACHE_TTL (seconds served without revalidation, default 1 day),
+    CRAWL_CACHE_MAX_AGE (seconds kept for revalidation, default 7 days) and
+    CRAWL_CACHE_MAX_ENTRIES.
+    """
+    global _crawl_cache
+    if os.getenv("CRAWL_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    with _crawl_cache_lock:
+        if _crawl_cache is None:
+            store = SQLiteCacheStore(
+                path=os.getenv("CRAWL_CACHE_PATH") or get_cache_path("crawl_cache.sqlite"),
+                table="crawl_pages",
+                max_entries=int(os.getenv("CRAWL_CACHE_MAX_ENTRIES", "20000")),
+            )
+            _crawl_cache = CrawlCache(
+                store,
+                ttl=float(os.getenv("CRAWL_CACHE_TTL", str(24 * 3600))),
+                max_age=float(os.getenv("CRAWL_CACHE_MAX_AGE", str(7 * 24 * 3600))),
+            )
+        return _crawl_cache
@@ -0,0 +1,187 @@
+"""Crawl scheduling: global concurrency cap, per-domain politeness and priorities."""
+
+import asyncio
+import itertools
+import os
+import threading
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+
+def get_domain(url: str) -> str:
+    """Return the host of ``url`` without port and leading ``www.``, lowercased."""
+    host = (urlparse(url).hostname or url).lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class _Waiter:
+    """A crawl waiting for a slot."""
+
+    __slots__ = ("sort_key", "domain", "future", "enqueued_at")
+
+    def __init__(self, sort_key, domain: str, future: asyncio.Future, enqueued_at: float):
+        self.sort_key = sort_key
+        self.domain = domain
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class CrawlScheduler:
+    """Grant crawl slots under a global cap and per-domain politeness rules.
+
+    Waiting crawls are served highest priority first (e.g. search score), but a
+    crawl is skipped over while its domain already has ``per_domain`` pages in
+    flight or was last hit less than ``domain_interval`` seconds ago, so one
+    slow or popular domain never blocks crawls of other domains.
+
+    Futures are bound to their event loop, so schedulers are kept per loop
+    (see ``get_crawl_scheduler``).
+    """
+
+    def __init__(self, max_concurrency: int = 8, per_domain: int = 2, domain_interval: float = 1.0):
+        """Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum pages crawled at once
+            per_domain: Maximum pages of one domain crawled at once
+            domain_interval: Minimum seconds between two crawl starts on one domain
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_domain = max(1, per_domain)
+        self.domain_interval = max(0.0, domain_interval)
+        self._waiting: List[_Waiter] = []
+        self._active = 0
+        self._domain_active: Counter = Counter()
+        self._domain_last_start: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._recent_waits: Deque[float] = deque(maxlen=500)
+        self.granted = 0
+        self.peak_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self, url: str, priority: float = 0.0) -> AsyncIterator[float]:
+        """Wait for a crawl slot for ``url`` and hold it for the body of the block.
+
+        Args:
+            url: URL about to be crawled (its domain drives politeness limits)
+            priority: Higher values are served first (e.g. the search score)
+
+        Yields:
+            Seconds spent waiting for the slot
+        """
+        loop = asyncio.get_running_loop()
+        domain = get_domain(url)
+        waiter = _Waiter((-priority, next(self._seq)), domain, loop.create_future(), loop.time())
+        self._waiting.append(waiter)
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self._waiting))
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(domain)
+            elif waiter in self._waiting:
+                self._waiting.remove(waiter)
+            raise
+
+        waited = loop.time() - waiter.enqueued_at
+        self._recent_waits.append(waited)
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        try:
+            yield waited
+        finally:
+            self._release(domain)
+
+    def _release(self, domain: str) -> None:
+        self._active -= 1
+        self._domain_active[domain] -= 1
+        if self._domain_active[domain] <= 0:
+            del self._domain_active[domain]
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Grant slots to every eligible waiter, in priority order."""
+        loop = asyncio.get_running_loop()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = loop.time()
+        next_ready: Optional[float] = None
+        self._waiting.sort(key=lambda w: w.sort_key)
+        remaining = []
+        for waiter in self._waiting:
+            if waiter.future.done():
+                continue
+            if self._active >= self.max_concurrency or self._domain_active[waiter.domain] >= self.per_domain:
+                remaining.append(waiter)
+                continue
+            ready_at = self._domain_last_start.get(waiter.domain, float("-inf")) + self.domain_interval
+            if ready_at > now:
+                next_ready = ready_at if next_ready is None else min(next_ready, ready_at)
+                remaining.append(waiter)
+                continue
+            self._active += 1
+            self._domain_active[waiter.domain] += 1
+            self._domain_last_start[waiter.domain] = now
+            self.granted += 1
+            waiter.future.set_result(None)
+        self._waiting = remaining
+        if next_ready is not None and self._active < self.max_concurrency:
+            # Wake up when the earliest spaced-out domain becomes eligible again
+            self._timer = loop.call_later(next_ready - now, self._dispatch)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, concurrency and wait time figures."""
+        waits = sorted(self._recent_waits)
+        p95 = waits[int(0.95 * (len(waits) - 1))] if waits else 0.0
+        return {
+            "max_concurrency": self.max_concurrency,
+            "per_domain": self.per_domain,
+            "domain_interval": self.domain_interval,
+            "active": self._active,
+            "queue_depth": len(self._waiting),
+            "peak_queue_depth": self.peak_queue_depth,
+            "granted": self.granted,
+            "avg_wait": round(self.total_wait / self.granted, 3) if self.granted else 0.0,
+            "p95_wait": round(p95, 3),
+            "max_wait": round(self.max_wait, 3),
+            "active_domains": dict(self._domain_active),
+        }
+
+
+_schedulers: Dict[asyncio.AbstractEventLoop, CrawlScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_crawl_scheduler() -> CrawlScheduler:
+    """Return the crawl scheduler for the running event loop.
+
+    Configured by CRAWL_MAX_CONCURRENCY (default 8), CRAWL_PER_DOMAIN_CONCURRENCY
+    (default 2) and CRAWL_DOMAIN_MIN_INTERVAL (seconds between crawl starts on
+    one domain, default 1.0).
+    """
+    loop = asyncio.get_running_loop()
+    with _schedulers_lock:
+        for closed in [key for key in _schedulers if key.is_closed()]:
+            _schedulers.pop(closed, None)
+        scheduler = _schedulers.get(loop)
+        if scheduler is None:
+            scheduler = _schedulers[loop] = CrawlScheduler(
+                max_concurrency=int(os.getenv("CRAWL_MAX_CONCURRENCY", "8")),
+                per_domain=int(os.getenv("CRAWL_PER_DOMAIN_CONCURRENCY", "2")),
+                domain_interval=float(os.getenv("CRAWL_DOMAIN_MIN_INTERVAL", "1.0")),
+            )
+        return scheduler
+
+
+def crawl_scheduler_stats() -> List[Dict[str, Any]]:
+    """Return stats for every crawl scheduler in this process (one per event loop)."""
+    with _schedulers_lock:
+        schedulers = [s for loop, s in _schedulers.items() if not loop.is_closed()]
+    return [scheduler.stats() for scheduler in schedulers]
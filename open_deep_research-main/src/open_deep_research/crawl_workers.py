@@ -0,0 +1,348 @@
+"""Optional out-of-process crawl workers, isolating browsers from the agent event loop."""
+
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from open_deep_research.document_extractor import (
+    UnsupportedContentError,
+    get_document_extractor,
+)
+from open_deep_research.page_fetcher import FetchedPage, get_page_fetcher
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlWorkerError(RuntimeError):
+    """The crawl worker died while running a job, or the pool is closed.
+
+    Says nothing about the page itself; failures of the page are raised as
+    ``RuntimeError`` like in-process fetches.
+    """
+
+
+def _worker_main(jobs: "multiprocessing.Queue", results: "multiprocessing.Queue", concurrency: int) -> None:
+    """Entry point of a worker process: fetch pages for jobs until told to stop."""
+    asyncio.run(_worker_loop(jobs, results, concurrency))
+
+
+async def _worker_loop(jobs: "multiprocessing.Queue", results: "multiprocessing.Queue", concurrency: int) -> None:
+    from open_deep_research.crawler_pool import aclose_crawler_pools, warm_crawler_pool
+
+    await warm_crawler_pool()
+    fetcher = get_page_fetcher()
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def run(job_id: int, url: str, timeout: float) -> None:
+        try:
+            page = await fetcher.fetch(url, browser_timeout=timeout)
+            results.put((job_id, "ok", asdict(page)))
+        except asyncio.TimeoutError:
+            results.put((job_id, "timeout", f"timed out after {timeout:.0f}s"))
+        except UnsupportedContentError as e:
+            results.put((job_id, "unsupported", str(e)))
+        except Exception as e:
+            results.put((job_id, "error", f"{type(e).__name__}: {e}"))
+        finally:
+            slots.release()
+
+    while True:
+        job = await loop.run_in_executor(None, jobs.get)
+        if job is None:
+            break
+        await slots.acquire()
+        task = asyncio.create_task(run(*job))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    for task in list(tasks):
+        task.cancel()
+    await aclose_crawler_pools()
+
+
+class _Worker:
+    """Parent-side handle of one worker process and its pending jobs."""
+
+    def __init__(self, index: int, context, concurrency: int):
+        self.index = index
+        self.jobs = context.Queue()
+        self.results = context.Queue()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(self.jobs, self.results, concurrency),
+            name=f"crawl-worker-{index}",
+            daemon=True,
+        )
+        self.pending: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self.timeouts_in_row = 0
+        self.process.start()
+
+
+class CrawlWorkerPool:
+    """Pool of crawl worker processes that fetch pages with their own browsers.
+
+    Each worker runs a TieredFetcher (and its browser pool) on its own event
+    loop and serves up to ``worker_concurrency`` pages at once. Submitting
+    blocks once ``max_pending`` jobs are in flight (backpressure). Jobs time out
+    on the caller side, and a worker that dies (e.g. a browser crash taking the
+    process down) or times out ``max_timeouts_in_row`` jobs without answering
+    any only fails its own jobs and is replaced.
+    """
+
+    max_timeouts_in_row = 3
+
+    def __init__(self, workers: int = 2, worker_concurrency: int = 4, max_pending: int = 64):
+        """Start the worker processes.
+
+        Args:
+            workers: Number of worker processes
+            worker_concurrency: Pages each worker fetches at once
+            max_pending: Jobs in flight across the pool before submitters wait
+        """
+        self.worker_concurrency = max(1, worker_concurrency)
+        self.max_pending = max(1, max_pending)
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._job_ids = itertools.count()
+        self._closed = False
+        self._slots: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self._workers: List[_Worker] = [self._spawn(i) for i in range(max(1, workers))]
+
+    def _spawn(self, index: int) -> _Worker:
+        worker = _Worker(index, self._context, self.worker_concurrency)
+        threading.Thread(
+            target=self._read_results, args=(worker,), name=f"crawl-worker-{index}-reader", daemon=True
+        ).start()
+        logger.info(f"🧵 Crawl worker {index} started (pid {worker.process.pid})")
+        return worker
+
+    def _read_results(self, worker: _Worker) -> None:
+        """Resolve the futures of ``worker``'s jobs as results arrive; detect crashes."""
+        while True:
+            try:
+                job_id, status, payload = worker.results.get(timeout=1.0)
+            except queue.Empty:
+                if self._closed:
+                    return
+                if not worker.process.is_alive():
+                    self._handle_crash(worker, f"exit code {worker.process.exitcode}")
+                    return
+                continue
+            except (EOFError, OSError):
+                return
+            with self._lock:
+                worker.timeouts_in_row = 0
+                entry = worker.pending.pop(job_id, None)
+            if entry is None:
+                continue  # the caller timed out or was cancelled
+            loop, future = entry
+            if status == "ok":
+                loop.call_soon_threadsafe(_resolve, future, FetchedPage(**payload), None)
+            elif status == "timeout":
+                loop.call_soon_threadsafe(_resolve, future, None, asyncio.TimeoutError(payload))
+            elif status == "unsupported":
+                loop.call_soon_threadsafe(_resolve, future, None, UnsupportedContentError(payload))
+            else:
+                loop.call_soon_threadsafe(_resolve, future, None, RuntimeError(payload))
+
+    def _handle_crash(self, worker: _Worker, reason: str) -> None:
+        with self._lock:
+            pending = list(worker.pending.values())
+            worker.pending.clear()
+            self.crashes += 1
+        logger.warning(f"💥 Crawl worker {worker.index} died ({reason}); failing {len(pending)} job(s) and restarting")
+        for loop, future in pending:
+            loop.call_soon_threadsafe(
+                _resolve, future, None, CrawlWorkerError(f"crawl worker {worker.index} died ({reason})")
+            )
+        if not self._closed:
+            replacement = self._spawn(worker.index)
+            with self._lock:
+                self._workers[worker.index] = replacement
+
+    def _record_timeout(self, worker: _Worker) -> None:
+        """Terminate a worker that keeps timing out; the reader thread then replaces it."""
+        with self._lock:
+            self.timeouts += 1
+            worker.timeouts_in_row += 1
+            stuck = worker.timeouts_in_row >= self.max_timeouts_in_row
+        if stuck and worker.process.is_alive():
+            logger.warning(f"⚠️  Crawl worker {worker.index} unresponsive, terminating")
+            worker.process.terminate()
+
+    @staticmethod
+    def job_timeout(timeout: float) -> float:
+        """Return how long the caller waits for a job with browser timeout ``timeout``.
+
+        The worker bounds every tier itself; this covers its worst case, the
+        HTTP tier followed by the browser, or a document download followed by
+        its extraction (CRAWL_HTTP_TIMEOUT, DOCUMENT_DOWNLOAD_TIMEOUT and
+        DOCUMENT_EXTRACT_TIMEOUT), plus a few seconds for IPC.
+        """
+        fetcher = get_page_fetcher()
+        page = fetcher.http_total_timeout + timeout
+        document = fetcher.document_timeout + get_document_extractor().timeout
+        return max(page, document) + 5.0
+
+    async def fetch(self, url: str, timeout: float) -> FetchedPage:
+        """Fetch ``url`` in a worker process.
+
+        Args:
+            url: Page URL
+            timeout: Browser page timeout; the job is abandoned after
+                ``job_timeout(timeout)``
+
+        Returns:
+            The extracted page
+
+        Raises:
+            asyncio.TimeoutError: If the job did not finish in time
+            UnsupportedContentError: If the URL is a file that can't be extracted
+            RuntimeError: If the page failed
+            CrawlWorkerError: If the worker crashed or the pool is closed
+        """
+        if self._closed:
+            raise CrawlWorkerError("crawl worker pool is closed")
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+
+        async with slots:
+            future = loop.create_future()
+            job_id = next(self._job_ids)
+            with self._lock:
+                worker = min(self._workers, key=lambda w: len(w.pending))
+                worker.pending[job_id] = (loop, future)
+                self.submitted += 1
+            worker.jobs.put((job_id, url, timeout))
+            try:
+                # The worker enforces every tier's timeout itself; this only catches a hung worker
+                page = await asyncio.wait_for(future, self.job_timeout(timeout))
+            except asyncio.TimeoutError:
+                self._record_timeout(worker)
+                raise
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                with self._lock:
+                    worker.pending.pop(job_id, None)
+            self.completed += 1
+            return page
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Stop every worker, terminating those that don't exit within ``timeout``."""
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            try:
+                worker.jobs.put(None)
+            except (OSError, ValueError):
+                pass
+        deadline = time.monotonic() + timeout
+        for worker in workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            if worker.process.is_alive():
+                worker.process.terminate()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return job counters and per-worker load."""
+        with self._lock:
+            workers = [
+                {"pid": w.process.pid, "alive": w.process.is_alive(), "pending": len(w.pending)}
+                for w in self._workers
+            ]
+        return {
+            "workers": workers,
+            "worker_concurrency": self.worker_concurrency,
+            "max_pending": self.max_pending,
+            "in_flight": sum(w["pending"] for w in workers),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+        }
+
+
+def _resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def is_crawl_worker_mode() -> bool:
+    """Return True when pages should be fetched in worker processes (CRAWL_WORKER_MODE=process)."""
+    return os.getenv("CRAWL_WORKER_MODE", "inline").lower() == "process"
+
+
+_worker_pool: Optional[CrawlWorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_crawl_worker_pool() -> CrawlWorkerPool:
+    """Return the process-wide crawl worker pool, starting it on first use.
+
+    Configured by CRAWL_WORKERS (processes, default 2),
+    CRAWL_WORKER_CONCURRENCY (pages per worker, default 4) and
+    CRAWL_WORKER_MAX_PENDING (jobs in flight before submitters wait, default 64).
+    """
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = CrawlWorkerPool(
+                workers=int(os.getenv("CRAWL_WORKERS", "2")),
+                worker_concurrency=int(os.getenv("CRAWL_WORKER_CONCURRENCY", "4")),
+                max_pending=int(os.getenv("CRAWL_WORKER_MAX_PENDING", "64")),
+            )
+        return _worker_pool
+
+
+async def fetch_page(url: str, browser_timeout: float) -> FetchedPage:
+    """Fetch a page in-process or in a crawl worker, depending on CRAWL_WORKER_MODE.
+
+    Args:
+        url: Page URL
+        browser_timeout: Page timeout of the browser tier in seconds
+
+    Returns:
+        The extracted page
+    """
+    if is_crawl_worker_mode():
+        return await get_crawl_worker_pool().fetch(url, browser_timeout)
+    return await get_page_fetcher().fetch(url, browser_timeout=browser_timeout)
+
+
+def shutdown_crawl_workers() -> None:
+    """Stop the crawl worker pool if it was started."""
+    global _worker_pool
+    with _worker_pool_lock:
+        pool, _worker_pool = _worker_pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def crawl_worker_stats() -> Optional[Dict[str, Any]]:
+    """Return crawl worker pool stats, or None when the pool isn't running."""
+    with _worker_pool_lock:
+        pool = _worker_pool
+    return pool.stats() if pool is not None else None
@@ -0,0 +1,481 @@
+"""Process-wide pool of long-lived Crawl4AI crawlers (headless Chromium browsers)."""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Deque, Dict, FrozenSet, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Ad, analytics and tracking hosts whose requests never carry page content
+AD_TRACKER_HOSTS = frozenset({
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "googletagmanager.com",
+    "googletagservices.com", "google-analytics.com", "adservice.google.com", "amazon-adsystem.com",
+    "facebook.net", "scorecardresearch.com", "quantserve.com", "chartbeat.com", "hotjar.com",
+    "segment.com", "segment.io", "mixpanel.com", "clarity.ms", "optimizely.com", "nr-data.net",
+    "taboola.com", "outbrain.com", "criteo.com", "criteo.net", "adnxs.com", "pubmatic.com",
+    "rubiconproject.com", "moatads.com", "hm.baidu.com", "cnzz.com", "mc.yandex.ru",
+})
+
+# Resolves once the main content's text length has stopped changing for a
+# moment (or after 4 s at most), so extraction doesn't wait for the full load
+CONTENT_STABLE_JS = """js:() => {
+    const root = document.querySelector('article, main, [role="main"]') || document.body;
+    if (!root) return false;
+    const now = Date.now();
+    const state = window.__contentStable || (window.__contentStable = {length: -1, since: now, start: now});
+    const length = root.innerText.length;
+    if (length !== state.length) {
+        state.length = length;
+        state.since = now;
+    }
+    const quiet = now - state.since;
+    return (length > 500 && quiet >= 400) || quiet >= 1200 || now - state.start >= 4000;
+}"""
+
+
+def is_lean_mode() -> bool:
+    """Return True unless the lean browser profile is disabled (CRAWL4AI_LEAN_MODE=false)."""
+    return os.getenv("CRAWL4AI_LEAN_MODE", "true").lower() == "true"
+
+
+def build_browser_config():
+    """Return the Crawl4AI BrowserConfig used by every pooled crawler."""
+    from crawl4ai import BrowserConfig
+
+    if not is_lean_mode():
+        return BrowserConfig(
+            headless=True,
+            verbose=False,
+            browser_type="chromium",
+        )
+    # 精简模式：不加载图片/远程字体，关闭后台功能（保留 JavaScript，浏览器层就是为 JS 页面准备的）
+    return BrowserConfig(
+        headless=True,
+        verbose=False,
+        browser_type="chromium",
+        light_mode=True,
+        extra_args=[
+            "--blink-settings=imagesEnabled=false",
+            "--disable-remote-fonts",
+            "--autoplay-policy=user-gesture-required",
+        ],
+    )
+
+
+def _is_blocked_host(url: str, blocked_hosts: FrozenSet[str]) -> bool:
+    host = (urlparse(url).hostname or "").lower()
+    parts = host.split(".")
+    return any(".".join(parts[i:]) in blocked_hosts for i in range(len(parts) - 1))
+
+
+def make_lean_page_hook(blocked_types: FrozenSet[str], blocked_hosts: FrozenSet[str], max_page_bytes: int):
+    """Return an ``on_page_context_created`` hook that trims what a page downloads.
+
+    Requests of ``blocked_types`` (Playwright resource types such as image,
+    media, font) and to ``blocked_hosts`` (and their subdomains) are aborted.
+    Once responses of a page add up to ``max_page_bytes`` (by Content-Length),
+    every further subresource request is aborted as well.
+    """
+    async def hook(page, context=None, **kwargs):
+        downloaded = [0]
+
+        async def route_request(route):
+            request = route.request
+            over_budget = max_page_bytes and downloaded[0] > max_page_bytes and request.resource_type != "document"
+            if (
+                request.resource_type in blocked_types
+                or over_budget
+                or _is_blocked_host(request.url, blocked_hosts)
+            ):
+                await route.abort()
+            else:
+                await route.continue_()
+
+        def count_response(response):
+            try:
+                downloaded[0] += int(response.headers.get("content-length") or 0)
+            except (TypeError, ValueError):
+                pass
+
+        await page.route("**/*", route_request)
+        page.on("response", count_response)
+        return page
+
+    return hook
+
+
+@lru_cache(maxsize=1)
+def _lean_page_hook():
+    blocked_types = os.getenv("CRAWL4AI_BLOCK_RESOURCES", "image,media,font")
+    extra_hosts = os.getenv("CRAWL4AI_BLOCK_HOSTS", "")
+    return make_lean_page_hook(
+        frozenset(t.strip() for t in blocked_types.split(",") if t.strip()),
+        AD_TRACKER_HOSTS | frozenset(h.strip().lower() for h in extra_hosts.split(",") if h.strip()),
+        int(os.getenv("CRAWL4AI_MAX_PAGE_BYTES", str(5 * 1024 * 1024))),
+    )
+
+
+def build_run_config(timeout_seconds: float):
+    """Return the Crawl4AI CrawlerRunConfig used for search result pages.
+
+    The timeout is rounded up to whole seconds, so the remaining-budget
+    timeouts of the tiered fetcher share a handful of cached configs.
+
+    Args:
+        timeout_seconds: Page load timeout
+    """
+    return _build_run_config(max(1, math.ceil(timeout_seconds)))
+
+
+@lru_cache(maxsize=16)
+def _build_run_config(timeout_seconds: int):
+    from crawl4ai import CacheMode, CrawlerRunConfig
+    from crawl4ai.content_filter_strategy import PruningContentFilter
+    from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+    # 精简模式：正文稳定后立即提取，不等页面完全加载
+    wait_stable = is_lean_mode() and os.getenv("CRAWL4AI_WAIT_STABLE", "true").lower() == "true"
+
+    # 配置 Markdown 生成器（保留图片）
+    md_generator = DefaultMarkdownGenerator(
+        content_filter=PruningContentFilter(
+            threshold=float(os.getenv("CRAWL4AI_CONTENT_THRESHOLD", "0.3")),
+            threshold_type="fixed"
+        ),
+        options={
+            "ignore_links": True,
+            "ignore_images": False,  # 保留图片！
+            "escape_html": False,
+        },
+    )
+    return CrawlerRunConfig(
+        word_count_threshold=10,
+        exclude_external_links=True,
+        remove_overlay_elements=True,
+        excluded_tags=["header", "footer", "iframe", "nav"],
+        process_iframes=False,  # 禁用 iframe 处理以提高速度
+        markdown_generator=md_generator,
+        cache_mode=CacheMode.BYPASS,
+        page_timeout=int(timeout_seconds * 1000),  # 转换为毫秒
+        wait_until="domcontentloaded",  # 不等待所有资源，加快速度
+        wait_for=CONTENT_STABLE_JS if wait_stable else None,
+    )
+
+
+def _process_tree_rss_mb() -> Optional[float]:
+    """Return the RSS of this process and its children (browsers) in MB, if measurable."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        process = psutil.Process()
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return rss / (1024 * 1024)
+    except psutil.Error:
+        return None
+
+
+_recent_batches: Deque[Dict[str, Any]] = deque(maxlen=50)
+
+
+@asynccontextmanager
+async def measure_crawl_batch(pages: int, sample_interval: float = 0.5) -> AsyncIterator[Dict[str, Any]]:
+    """Measure throughput and peak process tree RSS of one crawl batch.
+
+    Args:
+        pages: Number of pages in the batch
+        sample_interval: Seconds between RSS samples (requires psutil)
+
+    Yields:
+        Dict filled in on exit with ``seconds``, ``pages_per_sec`` and
+        ``peak_rss_mb`` (None without psutil)
+    """
+    batch: Dict[str, Any] = {"pages": pages, "seconds": 0.0, "pages_per_sec": 0.0, "peak_rss_mb": None}
+
+    async def sample_rss():
+        while True:
+            rss = await asyncio.to_thread(_process_tree_rss_mb)
+            if rss is None:
+                return
+            batch["peak_rss_mb"] = round(max(batch["peak_rss_mb"] or 0.0, rss), 1)
+            await asyncio.sleep(sample_interval)
+
+    sampler = asyncio.create_task(sample_rss())
+    start = time.monotonic()
+    try:
+        yield batch
+    finally:
+        sampler.cancel()
+        batch["seconds"] = round(time.monotonic() - start, 2)
+        if batch["seconds"] > 0:
+            batch["pages_per_sec"] = round(pages / batch["seconds"], 2)
+        _recent_batches.append(dict(batch))
+
+
+def crawl_batch_stats() -> Dict[str, Any]:
+    """Return throughput and peak RSS over the recent crawl batches."""
+    batches = list(_recent_batches)
+    peaks = [b["peak_rss_mb"] for b in batches if b["peak_rss_mb"] is not None]
+    return {
+        "batches": len(batches),
+        "avg_pages_per_sec": round(sum(b["pages_per_sec"] for b in batches) / len(batches), 2) if batches else 0.0,
+        "max_peak_rss_mb": max(peaks) if peaks else None,
+        "last": batches[-1] if batches else None,
+        "lean_mode": is_lean_mode(),
+    }
+
+
+class _PooledCrawler:
+    """One browser in the pool plus its usage counters."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.crawler: Any = None
+        self.in_flight = 0
+        self.pages = 0
+        self.generation = 0
+        self.retiring = False
+        self.starting: Optional[asyncio.Task] = None
+        self.closing: Optional[asyncio.Task] = None
+
+
+class CrawlerPool:
+    """Fixed-size pool of started AsyncWebCrawler instances shared by all researchers.
+
+    Each slot holds one headless browser that serves many pages concurrently.
+    Leases go to the least busy live slot. A slot that has served
+    ``max_pages`` pages, or every slot while the process tree RSS is above
+    ``max_rss_mb``, is retired: it takes no new leases and its browser is
+    closed and relaunched once its in-flight pages finish, so long-running pods
+    don't accumulate leaked browser memory.
+
+    Browsers are bound to the event loop that launched them, so pools are kept
+    per loop (see ``get_crawler_pool``).
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 200, max_rss_mb: float = 0.0):
+        """Initialize the pool (browsers are launched lazily or by ``start``).
+
+        Args:
+            size: Number of browsers kept alive
+            max_pages: Pages a browser may serve before it is recycled (0 = never)
+            max_rss_mb: Process tree RSS (MB) above which browsers are recycled
+                (0 = disabled; requires psutil)
+        """
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._slots = [_PooledCrawler(i) for i in range(self.size)]
+        self._closed = False
+        self.launches = 0
+        self.recycles = 0
+        self.leases = 0
+        self.lease_wait = 0.0
+
+    async def start(self) -> None:
+        """Launch every browser up front (warm-up)."""
+        await asyncio.gather(*(self._ensure_started(slot) for slot in self._slots))
+
+    async def _ensure_started(self, slot: _PooledCrawler) -> Any:
+        if slot.closing is not None:
+            # Don't relaunch a browser while the old one is still shutting down
+            await asyncio.shield(slot.closing)
+        if slot.crawler is not None:
+            return slot.crawler
+        if slot.starting is None:
+            slot.starting = asyncio.ensure_future(self._launch(slot))
+        try:
+            await asyncio.shield(slot.starting)
+        finally:
+            if slot.starting is not None and slot.starting.done():
+                slot.starting = None
+        return slot.crawler
+
+    async def _launch(self, slot: _PooledCrawler) -> None:
+        from crawl4ai import AsyncWebCrawler
+
+        crawler = AsyncWebCrawler(config=build_browser_config())
+        if is_lean_mode():
+            crawler.crawler_strategy.set_hook("on_page_context_created", _lean_page_hook())
+        await crawler.__aenter__()
+        slot.crawler = crawler
+        slot.pages = 0
+        slot.generation += 1
+        slot.retiring = False
+        self.launches += 1
+        logger.info(f"🧭 Crawler pool: browser {slot.index} launched (generation {slot.generation})")
+
+    async def _close_slot(self, slot: _PooledCrawler) -> None:
+        crawler, slot.crawler = slot.crawler, None
+        if crawler is None:
+            return
+        try:
+            await crawler.__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"⚠️  Crawler pool: closing browser {slot.index} failed: {e}")
+
+    def _pick_slot(self) -> _PooledCrawler:
+        live = [slot for slot in self._slots if not slot.retiring]
+        if not live:
+            # Everything is retiring: keep serving from the least busy browser,
+            # preferring ones that aren't already being closed
+            live = self._slots
+        return min(live, key=lambda slot: (slot.closing is not None, slot.in_flight, slot.crawler is None))
+
+    def _check_recycle(self, slot: _PooledCrawler) -> None:
+        if self.max_pages and slot.pages >= self.max_pages:
+            slot.retiring = True
+        if self.max_rss_mb and self.leases % 10 == 0:
+            # Walking the process tree isn't free, so sample every 10th page
+            rss = _process_tree_rss_mb()
+            if rss is not None and rss > self.max_rss_mb:
+                # Recycle the browser that has served the most pages first
+                busiest = max(self._slots, key=lambda s: s.pages)
+                busiest.retiring = True
+
+    async def _retire(self, slot: _PooledCrawler) -> None:
+        try:
+            await self._close_slot(slot)
+        finally:
+            slot.retiring = False
+            slot.closing = None
+
+    async def _recycle_if_idle(self, slot: _PooledCrawler) -> None:
+        if slot.retiring and slot.in_flight == 0 and slot.crawler is not None and slot.closing is None:
+            self.recycles += 1
+            logger.info(f"♻️  Crawler pool: recycling browser {slot.index} after {slot.pages} pages")
+            # Claim the slot before the first await: it stays retiring and
+            # leases wait for the close instead of reusing or relaunching it
+            slot.closing = asyncio.ensure_future(self._retire(slot))
+            await asyncio.shield(slot.closing)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[Any]:
+        """Lease a started AsyncWebCrawler for one page.
+
+        Yields:
+            An AsyncWebCrawler; use its ``arun`` and don't close it
+        """
+        if self._closed:
+            raise RuntimeError("Crawler pool is closed")
+        slot = self._pick_slot()
+        slot.in_flight += 1
+        self.leases += 1
+        try:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            crawler = await self._ensure_started(slot)
+            self.lease_wait += loop.time() - start
+            yield crawler
+        finally:
+            slot.in_flight -= 1
+            slot.pages += 1
+            self._check_recycle(slot)
+            for candidate in self._slots:
+                await self._recycle_if_idle(candidate)
+
+    async def aclose(self) -> None:
+        """Close every browser in the pool."""
+        self._closed = True
+        for slot in self._slots:
+            if slot.closing is not None:
+                await asyncio.shield(slot.closing)
+            if slot.starting is not None:
+                try:
+                    await slot.starting
+                except Exception:
+                    pass
+        await asyncio.gather(*(self._close_slot(slot) for slot in self._slots))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, usage and recycling counters."""
+        rss = _process_tree_rss_mb()
+        return {
+            "size": self.size,
+            "live_browsers": sum(1 for slot in self._slots if slot.crawler is not None),
+            "in_flight": sum(slot.in_flight for slot in self._slots),
+            "leases": self.leases,
+            "avg_lease_wait": round(self.lease_wait / self.leases, 3) if self.leases else 0.0,
+            "launches": self.launches,
+            "recycles": self.recycles,
+            "pages_per_browser": [slot.pages for slot in self._slots],
+            "rss_mb": round(rss, 1) if rss is not None else None,
+        }
+
+
+def _pool_from_env() -> CrawlerPool:
+    return CrawlerPool(
+        size=int(os.getenv("CRAWL4AI_POOL_SIZE", "2")),
+        max_pages=int(os.getenv("CRAWL4AI_POOL_MAX_PAGES", "200")),
+        max_rss_mb=float(os.getenv("CRAWL4AI_POOL_MAX_RSS_MB", "0")),
+    )
+
+
+_pools: Dict[asyncio.AbstractEventLoop, CrawlerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_crawler_pool() -> CrawlerPool:
+    """Return the crawler pool for the running event loop, creating it on first use.
+
+    Configured by CRAWL4AI_POOL_SIZE (browsers, default 2),
+    CRAWL4AI_POOL_MAX_PAGES (pages per browser before recycling, default 200)
+    and CRAWL4AI_POOL_MAX_RSS_MB (process tree RSS that triggers recycling,
+    default 0 = off).
+    """
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        for closed in [key for key in _pools if key.is_closed()]:
+            _pools.pop(closed, None)
+        pool = _pools.get(loop)
+        if pool is None:
+            pool = _pools[loop] = _pool_from_env()
+        return pool
+
+
+async def warm_crawler_pool() -> None:
+    """Launch the browsers of this loop's pool ahead of the first crawl.
+
+    Skipped when SearCrawl does the crawling (USE_SEARCRAWL=true), when
+    CRAWL4AI_POOL_WARM=false, or when Crawl4AI is not installed.
+    """
+    if os.getenv("USE_SEARCRAWL", "false").lower() == "true":
+        return
+    if os.getenv("CRAWL4AI_POOL_WARM", "true").lower() != "true":
+        return
+    try:
+        await get_crawler_pool().start()
+    except ImportError:
+        logger.info("Crawl4AI not installed, crawler pool not warmed")
+    except Exception as e:
+        logger.warning(f"⚠️  Crawler pool warm-up failed: {e}")
+
+
+async def aclose_crawler_pools() -> None:
+    """Close the crawler pool bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.pop(loop, None)
+    if pool is not None:
+        await pool.aclose()
+
+
+def crawler_pool_stats() -> List[Dict[str, Any]]:
+    """Return stats for every crawler pool in this process (one per event loop)."""
+    with _pools_lock:
+        pools = [pool for loop, pool in _pools.items() if not loop.is_closed()]
+    return [pool.stats() for pool in pools]
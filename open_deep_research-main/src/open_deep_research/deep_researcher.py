@@ -16,6 +16,7 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import Command
 
+from open_deep_research import fast_json
 from open_deep_research.configuration import (
     Configuration,
 )
@@ -500,7 +501,7 @@ async def researcher_tools(state: ResearcherState, config: RunnableConfig) -> Co
             match = re.search(r'<!-- SEARCH_LOG_JSON\n(.*?)\n-->', observation, re.DOTALL)
             if match:
                 try:
-                    search_log = json.loads(match.group(1))
+                    search_log = fast_json.loads(match.group(1))
                     # Extract raw_results from search_log
                     raw_results = search_log.get('raw_results', [])
                     if raw_results:
@@ -589,7 +590,7 @@ async def compress_research(state: ResearcherState, config: RunnableConfig):
             # Try to extract all SEARCH_LOG_JSON blocks from raw_notes
             for match in re.finditer(r'<!-- SEARCH_LOG_JSON\n(.*?)\n-->', raw_notes_content, re.DOTALL):
                 try:
-                    search_log = json.loads(match.group(1))
+                    search_log = fast_json.loads(match.group(1))
                     raw_results = search_log.get('raw_results', [])
                     if raw_results:
                         search_results_to_add.extend(raw_results)
@@ -627,7 +628,7 @@ async def compress_research(state: ResearcherState, config: RunnableConfig):
     
     for match in re.finditer(r'<!-- SEARCH_LOG_JSON\n(.*?)\n-->', raw_notes_content, re.DOTALL):
         try:
-            search_log = json.loads(match.group(1))
+            search_log = fast_json.loads(match.group(1))
             raw_results = search_log.get('raw_results', [])
             if raw_results:
                 search_results_to_add.extend(raw_results)
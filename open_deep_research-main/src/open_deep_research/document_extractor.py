@@ -0,0 +1,280 @@
+"""Text extraction for PDF and DOCX search results, run in a process pool."""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+from xml.etree import ElementTree
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_EXTENSIONS = {".pdf": "pdf", ".docx": "docx"}
+DOCUMENT_CONTENT_TYPES = {
+    "application/pdf": "pdf",
+    "application/x-pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+# Chars per page used to turn the page limit into a limit for page-less formats (DOCX)
+_CHARS_PER_PAGE = 3000
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Decompressed size limit of word/document.xml, so a zip bomb can't exhaust memory
+_MAX_DOCX_XML_BYTES = 64 * 1024 * 1024
+
+
+class UnsupportedContentError(Exception):
+    """The URL can't be turned into text and a browser won't help (binary file, 4xx error)."""
+
+
+def detect_document_type(content_type: str, url: str, head: bytes) -> Optional[str]:
+    """Classify a response as "pdf", "docx", "html" or "text" from its first bytes.
+
+    Magic numbers and HTML markers win over the Content-Type header, so PDFs
+    served as ``application/octet-stream`` and HTML served as ``text/plain``
+    are routed correctly.
+
+    Args:
+        content_type: Lowercased Content-Type header (may be empty or wrong)
+        url: Response URL, whose extension is a hint for DOCX
+        head: First bytes of the body
+
+    Returns:
+        The detected type, or None for other (binary) content
+    """
+    mime = content_type.split(";")[0].strip()
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        # DOCX is a zip archive; trust the header or URL to tell it from other zips
+        is_docx = DOCUMENT_CONTENT_TYPES.get(mime) == "docx" or url.split("?")[0].lower().endswith(".docx")
+        return "docx" if is_docx else None
+    sniff = head[:1024].lstrip().lower()
+    if sniff.startswith((b"<!doctype html", b"<html", b"<head", b"<body")) or "html" in mime:
+        return "html"
+    if mime.startswith("text/"):
+        return "text"
+    return None
+
+
+def looks_like_document_url(url: str) -> bool:
+    """Return True if ``url`` ends in a document extension (.pdf, .docx)."""
+    path = url.split("?")[0].split("#")[0].lower()
+    return os.path.splitext(path)[1] in DOCUMENT_EXTENSIONS
+
+
+def extract_pdf(data: bytes, max_pages: int) -> Tuple[str, int]:
+    """Extract the text of up to ``max_pages`` pages of a PDF as markdown.
+
+    Returns:
+        Tuple of (markdown, total page count)
+    """
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf
+
+    with pymupdf.open(stream=data, filetype="pdf") as doc:
+        total_pages = doc.page_count
+        title = (doc.metadata or {}).get("title") or ""
+        parts = [f"# {title.strip()}"] if title.strip() else []
+        for number in range(min(total_pages, max_pages)):
+            text = doc[number].get_text("text").strip()
+            if text:
+                parts.append(f"## Page {number + 1}\n\n{text}")
+    if total_pages > max_pages:
+        parts.append(f"[{total_pages - max_pages} more pages not extracted]")
+    return "\n\n".join(parts), total_pages
+
+
+def extract_docx(data: bytes, max_pages: int) -> Tuple[str, int]:
+    """Extract the paragraphs of a DOCX file as markdown, about ``max_pages`` pages' worth.
+
+    Returns:
+        Tuple of (markdown, number of paragraphs in the document)
+
+    Raises:
+        ValueError: If word/document.xml decompresses to more than 64 MB
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        info = archive.getinfo("word/document.xml")
+        if info.file_size > _MAX_DOCX_XML_BYTES:
+            raise ValueError(f"word/document.xml is {info.file_size} bytes uncompressed")
+        # The declared size can lie: never inflate more than the limit
+        with archive.open(info) as member:
+            xml = member.read(_MAX_DOCX_XML_BYTES + 1)
+        if len(xml) > _MAX_DOCX_XML_BYTES:
+            raise ValueError("word/document.xml exceeds the decompressed size limit")
+        root = ElementTree.fromstring(xml)
+    paragraphs = root.iter(f"{_WORD_NS}p")
+    parts = []
+    size = 0
+    total = 0
+    for paragraph in paragraphs:
+        total += 1
+        text = "".join(node.text or "" for node in paragraph.iter(f"{_WORD_NS}t")).strip()
+        if not text or size >= max_pages * _CHARS_PER_PAGE:
+            continue
+        style = paragraph.find(f"{_WORD_NS}pPr/{_WORD_NS}pStyle")
+        style_name = style.get(f"{_WORD_NS}val", "") if style is not None else ""
+        if style_name.lower().startswith("heading") and style_name[-1:].isdigit():
+            text = "#" * min(int(style_name[-1]), 6) + " " + text
+        elif style_name.lower() == "title":
+            text = "# " + text
+        parts.append(text)
+        size += len(text)
+    return "\n\n".join(parts), total
+
+
+_EXTRACTORS = {"pdf": extract_pdf, "docx": extract_docx}
+
+
+def _extract(kind: str, data: bytes, max_pages: int) -> Tuple[str, int]:
+    return _EXTRACTORS[kind](data, max_pages)
+
+
+class DocumentExtractor:
+    """Run PDF/DOCX text extraction in worker processes, off the event loop.
+
+    Parsing is CPU-bound and (for PDFs) native code, so it runs in a
+    ``ProcessPoolExecutor``; a crashed worker only fails its document and the
+    pool is rebuilt. A document that runs past the timeout gets its worker
+    processes terminated and the pool rebuilt too, so a runaway parse can't
+    keep a CPU busy (other documents in that pool fail with it). Inside
+    daemonic processes (crawl workers), which can't have children, extraction
+    runs in a thread instead, and a timed-out thread is left to finish.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pages: int = 30, timeout: float = 30.0):
+        """Initialize the extractor (worker processes start on first use).
+
+        Args:
+            max_workers: Extraction processes
+            max_pages: Pages extracted per document
+            timeout: Seconds allowed per document
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_pages = max(1, max_pages)
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.extracted: Dict[str, int] = {}
+        self.failures = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if multiprocessing.current_process().daemon:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _reset_executor(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _kill_executor(self, stuck: ProcessPoolExecutor) -> None:
+        # wait_for only abandons the future; the worker keeps parsing until killed
+        processes = list((getattr(stuck, "_processes", None) or {}).values())
+        self._reset_executor(stuck)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    async def extract(self, kind: str, data: bytes) -> Tuple[str, int]:
+        """Extract markdown from a downloaded document.
+
+        Args:
+            kind: "pdf" or "docx"
+            data: Document bytes
+
+        Returns:
+            Tuple of (markdown, page or paragraph count)
+
+        Raises:
+            UnsupportedContentError: If the document can't be parsed in time
+        """
+        start = time.monotonic()
+        executor = self._get_executor()
+        try:
+            if executor is None:
+                call = asyncio.to_thread(_extract, kind, data, self.max_pages)
+            else:
+                call = asyncio.get_running_loop().run_in_executor(
+                    executor, _extract, kind, data, self.max_pages
+                )
+            markdown, count = await asyncio.wait_for(call, self.timeout)
+        except BrokenProcessPool:
+            self.failures += 1
+            logger.warning(f"⚠️  Document extractor process crashed on a {kind}, restarting the pool")
+            self._reset_executor(executor)
+            raise UnsupportedContentError(f"{kind} extractor crashed")
+        except asyncio.TimeoutError:
+            self.failures += 1
+            if executor is not None:
+                logger.warning(f"⚠️  Document extractor stuck on a {kind}, killing and restarting the pool")
+                self._kill_executor(executor)
+            raise UnsupportedContentError(f"{kind} extraction timed out after {self.timeout:.0f}s")
+        except Exception as e:
+            self.failures += 1
+            raise UnsupportedContentError(f"{kind} extraction failed: {e}")
+        self.extracted[kind] = self.extracted.get(kind, 0) + 1
+        self.total_seconds += time.monotonic() - start
+        return markdown, count
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return extraction counts, failures and average extraction time."""
+        done = sum(self.extracted.values())
+        return {
+            "extracted": dict(self.extracted),
+            "failures": self.failures,
+            "avg_seconds": round(self.total_seconds / done, 3) if done else 0.0,
+            "max_pages": self.max_pages,
+        }
+
+
+_extractor: Optional[DocumentExtractor] = None
+_extractor_lock = threading.Lock()
+
+
+def get_document_extractor() -> DocumentExtractor:
+    """Return the process-wide document extractor.
+
+    Configured by DOCUMENT_EXTRACT_WORKERS (processes, default 2),
+    DOCUMENT_MAX_PAGES (pages extracted per document, default 30) and
+    DOCUMENT_EXTRACT_TIMEOUT (seconds per document, default 30).
+    """
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = DocumentExtractor(
+                max_workers=int(os.getenv("DOCUMENT_EXTRACT_WORKERS", "2")),
+                max_pages=int(os.getenv("DOCUMENT_MAX_PAGES", "30")),
+                timeout=float(os.getenv("DOCUMENT_EXTRACT_TIMEOUT", "30")),
+            )
+        return _extractor
+
+
+def shutdown_document_extractor() -> None:
+    """Stop the document extractor's worker processes, if started."""
+    with _extractor_lock:
+        extractor = _extractor
+    if extractor is not None:
+        extractor.shutdown()
@@ -0,0 +1,264 @@
+"""Persisted per-domain crawl statistics driving adaptive timeouts and a learned skip list."""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from open_deep_research.cache_store import SQLiteCacheStore, get_cache_path
+from open_deep_research.crawl_scheduler import get_domain
+
+logger = logging.getLogger(__name__)
+
+# Samples kept per domain
+_OUTCOME_WINDOW = 20
+_LATENCY_WINDOW = 50
+
+
+def _new_record() -> Dict[str, Any]:
+    return {
+        "attempts": 0,
+        "successes": 0,
+        "timeouts": 0,
+        "outcomes": [],  # 1 = success, 0 = failure, most recent last
+        "latencies": [],  # seconds of recent successful browser crawls
+        "avg_chars": 0.0,
+        "consecutive_failures": 0,
+        "skip_until": 0.0,
+        "skips": 0,
+    }
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class DomainStats:
+    """Crawl outcomes per domain, persisted across runs.
+
+    Each domain keeps its recent outcomes, successful crawl latencies and
+    typical content length. They drive:
+
+    - an adaptive browser timeout: ``1.5 × p95`` of successful browser crawl latencies plus
+      a small margin, clamped to ``[min_timeout, max_timeout]``, once the
+      domain has ``min_samples`` successes (``base_timeout`` until then);
+    - a skip list: a domain whose recent success rate is below
+      ``skip_success_rate`` after at least ``min_attempts`` attempts and that
+      failed its last ``skip_after_failures`` crawls is skipped for
+      ``reprobe_interval`` seconds, after which one crawl probes it again.
+      Each failed probe doubles the interval, up to a week.
+
+    Records are cached in memory and written through to the store, so other
+    pods sharing the cache directory learn from each other on restart.
+    """
+
+    def __init__(
+        self,
+        store: SQLiteCacheStore,
+        base_timeout: float = 15.0,
+        min_timeout: float = 5.0,
+        max_timeout: float = 30.0,
+        min_samples: int = 5,
+        min_attempts: int = 5,
+        skip_success_rate: float = 0.2,
+        skip_after_failures: int = 3,
+        reprobe_interval: float = 6 * 3600,
+        max_age: float = 30 * 24 * 3600,
+    ):
+        """Initialize the statistics.
+
+        Args:
+            store: Backing key/value store
+            base_timeout: Timeout for domains without enough history
+            min_timeout: Lower bound of adaptive timeouts
+            max_timeout: Upper bound of adaptive timeouts
+            min_samples: Successful crawls needed before adapting the timeout
+            min_attempts: Attempts needed before a domain can be skipped
+            skip_success_rate: Success rate below which a domain can be skipped
+            skip_after_failures: Consecutive failures needed to skip a domain
+            reprobe_interval: Seconds a domain is skipped before it is retried
+            max_age: Seconds a domain's record is kept without new crawls
+        """
+        self.store = store
+        self.base_timeout = base_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max(max_timeout, min_timeout)
+        self.min_samples = min_samples
+        self.min_attempts = min_attempts
+        self.skip_success_rate = skip_success_rate
+        self.skip_after_failures = skip_after_failures
+        self.reprobe_interval = reprobe_interval
+        self.max_age = max_age
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._probing: set = set()
+        self._lock = threading.Lock()
+        self.skipped = 0
+        self.probes = 0
+        self.inconclusive_probes = 0
+        self.adapted = 0
+
+    async def _load(self, domain: str) -> Dict[str, Any]:
+        record = self._records.get(domain)
+        if record is None:
+            stored = await self.store.aget(domain)
+            # Another caller may have loaded it while we were reading
+            record = self._records.setdefault(domain, {**_new_record(), **(stored or {})})
+        return record
+
+    def timeout_for(self, record: Dict[str, Any]) -> float:
+        """Return the browser timeout for a domain's record."""
+        latencies = record["latencies"]
+        if len(latencies) < self.min_samples:
+            return self.base_timeout
+        timeout = 1.5 * _percentile(latencies, 0.95) + 2.0
+        return round(min(self.max_timeout, max(self.min_timeout, timeout)), 1)
+
+    async def plan(self, url: str) -> Tuple[bool, float]:
+        """Decide how to crawl ``url``.
+
+        Returns:
+            Tuple of (skip, timeout). When ``skip`` is True the caller should
+            use the search snippet instead of crawling.
+        """
+        record = await self._load(get_domain(url))
+        now = time.time()
+        if record["skip_until"] > now:
+            with self._lock:
+                self.skipped += 1
+            return True, 0.0
+        if record["skip_until"]:
+            # Skip period over: let this crawl probe the domain, skip the others meanwhile
+            record["skip_until"] = now + self.reprobe_interval
+            with self._lock:
+                self.probes += 1
+                self._probing.add(get_domain(url))
+        timeout = self.timeout_for(record)
+        if timeout != self.base_timeout:
+            with self._lock:
+                self.adapted += 1
+        return False, timeout
+
+    async def release_probe(self, url: str) -> None:
+        """Note a crawl of ``url`` that ended without saying anything about its domain.
+
+        Used for binary files and crashed crawl workers, which are not
+        recorded. If the crawl was the probe of a skipped domain, the next
+        crawl of the domain probes it again instead of the domain staying
+        skipped for another ``reprobe_interval``.
+        """
+        domain = get_domain(url)
+        with self._lock:
+            if domain not in self._probing:
+                return
+            self._probing.discard(domain)
+            self.inconclusive_probes += 1
+        record = await self._load(domain)
+        record["skip_until"] = min(record["skip_until"], time.time())
+
+    async def record(
+        self,
+        url: str,
+        success: bool,
+        seconds: float,
+        chars: int = 0,
+        timed_out: bool = False,
+        tier: str = "browser",
+    ) -> None:
+        """Record the outcome of one crawl of ``url``.
+
+        Args:
+            url: Crawled URL
+            success: Whether usable content was extracted
+            seconds: Time the crawl took
+            chars: Length of the extracted content
+            timed_out: Whether the crawl failed by timing out
+            tier: Fetch tier that served the page; only browser latencies
+                feed the adaptive (browser) timeout
+        """
+        domain = get_domain(url)
+        with self._lock:
+            self._probing.discard(domain)
+        record = await self._load(domain)
+        record["attempts"] += 1
+        record["outcomes"] = (record["outcomes"] + [1 if success else 0])[-_OUTCOME_WINDOW:]
+        if success:
+            record["successes"] += 1
+            if tier == "browser":
+                record["latencies"] = (record["latencies"] + [round(seconds, 2)])[-_LATENCY_WINDOW:]
+            record["avg_chars"] = round(0.8 * record["avg_chars"] + 0.2 * chars if record["avg_chars"] else chars, 1)
+            record["consecutive_failures"] = 0
+            record["skip_until"] = 0.0
+            record["skips"] = 0
+        else:
+            record["timeouts"] += 1 if timed_out else 0
+            record["consecutive_failures"] += 1
+            if self._hopeless(record):
+                interval = min(self.reprobe_interval * 2 ** record["skips"], 7 * 24 * 3600)
+                record["skip_until"] = time.time() + interval
+                record["skips"] += 1
+                logger.info(f"⏭️  Domain {domain} added to crawl skip list for {interval / 3600:.1f}h")
+        await self.store.aset(domain, record, self.max_age)
+
+    def _hopeless(self, record: Dict[str, Any]) -> bool:
+        outcomes = record["outcomes"]
+        return (
+            len(outcomes) >= self.min_attempts
+            and sum(outcomes) / len(outcomes) < self.skip_success_rate
+            and record["consecutive_failures"] >= self.skip_after_failures
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters, the current skip list and the domains with adapted timeouts."""
+        now = time.time()
+        records = dict(self._records)
+        return {
+            "domains_loaded": len(records),
+            "skipped": self.skipped,
+            "probes": self.probes,
+            "inconclusive_probes": self.inconclusive_probes,
+            "adapted_timeouts": self.adapted,
+            "skip_list": sorted(domain for domain, r in records.items() if r["skip_until"] > now),
+            "timeouts": {
+                domain: self.timeout_for(r)
+                for domain, r in records.items()
+                if len(r["latencies"]) >= self.min_samples
+            },
+            "store": self.store.stats(),
+        }
+
+
+_domain_stats: Optional[DomainStats] = None
+_domain_stats_lock = threading.Lock()
+
+
+def get_domain_stats() -> Optional[DomainStats]:
+    """Return the process-wide domain statistics, or None when disabled.
+
+    Controlled by DOMAIN_STATS_ENABLED (default true), DOMAIN_STATS_PATH,
+    CRAWL4AI_TIMEOUT (timeout for unknown domains), DOMAIN_TIMEOUT_MIN /
+    DOMAIN_TIMEOUT_MAX (bounds of adaptive timeouts, default 5 / 30 s),
+    DOMAIN_SKIP_SUCCESS_RATE (default 0.2), DOMAIN_SKIP_MIN_ATTEMPTS
+    (default 5) and DOMAIN_REPROBE_INTERVAL (seconds, default 6 h).
+    """
+    global _domain_stats
+    if os.getenv("DOMAIN_STATS_ENABLED", "true").lower() != "true":
+        return None
+    with _domain_stats_lock:
+        if _domain_stats is None:
+            store = SQLiteCacheStore(
+                path=os.getenv("DOMAIN_STATS_PATH") or get_cache_path("domain_stats.sqlite"),
+                table="domain_stats",
+                max_entries=50000,
+            )
+            _domain_stats = DomainStats(
+                store,
+                base_timeout=float(os.getenv("CRAWL4AI_TIMEOUT", "15")),
+                min_timeout=float(os.getenv("DOMAIN_TIMEOUT_MIN", "5")),
+                max_timeout=float(os.getenv("DOMAIN_TIMEOUT_MAX", "30")),
+                min_attempts=int(os.getenv("DOMAIN_SKIP_MIN_ATTEMPTS", "5")),
+                skip_success_rate=float(os.getenv("DOMAIN_SKIP_SUCCESS_RATE", "0.2")),
+                reprobe_interval=float(os.getenv("DOMAIN_REPROBE_INTERVAL", str(6 * 3600))),
+            )
+        return _domain_stats
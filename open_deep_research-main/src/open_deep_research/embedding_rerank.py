@@ -0,0 +1,290 @@
+"""LLM-free search result processing: rerank page chunks with a local sentence-transformers model."""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+logger = logging.getLogger(__name__)
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+class ChunkIndex:
+    """Normalized chunk embeddings of one research run in a growing numpy matrix.
+
+    Rows are keyed by (URL, chunk hash), so pages found again later in the run
+    are not added twice. Capacity doubles as the index grows.
+    """
+
+    def __init__(self):
+        """Initialize an empty index (the matrix is allocated on the first add)."""
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._chunks: List[Dict[str, Any]] = []
+        self._keys: set = set()
+        self.last_used = time.monotonic()
+
+    def __len__(self) -> int:
+        """Return the number of indexed chunks."""
+        return self._size
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        """Return True if the (URL, chunk hash) ``key`` is indexed."""
+        return key in self._keys
+
+    def add(self, chunks: List[Dict[str, Any]], vectors: np.ndarray) -> None:
+        """Append chunks (dicts with ``url``, ``key``, ``position``, ``text``) and their vectors."""
+        if not chunks:
+            return
+        if self._matrix is None:
+            self._matrix = np.empty((max(256, len(chunks)), vectors.shape[1]), dtype=np.float32)
+        needed = self._size + len(chunks)
+        if needed > len(self._matrix):
+            grown = np.empty((max(needed, 2 * len(self._matrix)), self._matrix.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        self._matrix[self._size:needed] = vectors
+        self._size = needed
+        self._chunks.extend(chunks)
+        self._keys.update((chunk["url"], chunk["key"]) for chunk in chunks)
+
+    def search(self, query_vector: np.ndarray, urls: set, k: int) -> List[Dict[str, Any]]:
+        """Return the ``k`` chunks of ``urls`` most similar to ``query_vector``."""
+        if not self._size or k <= 0:
+            return []
+        rows = np.fromiter(
+            (i for i, chunk in enumerate(self._chunks) if chunk["url"] in urls), dtype=np.int64
+        )
+        if not len(rows):
+            return []
+        scores = self._matrix[rows] @ query_vector
+        top = np.argpartition(-scores, min(k, len(rows)) - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self._chunks[rows[i]] for i in top]
+
+
+class EmbeddingReranker:
+    """Select the page chunks most relevant to each query, without LLM calls.
+
+    Port of the legacy ``split_and_rerank_search_results`` /
+    ``stitch_documents_by_url`` path. Chunks are embedded with a locally
+    loaded sentence-transformers model, in batches, and cached by content
+    hash across runs. Each research run keeps its own chunk index, which
+    later search calls of the run extend instead of rebuilding.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        device: str = "cpu",
+        batch_size: int = 32,
+        chunk_size: int = 1500,
+        chunk_overlap: int = 200,
+        cache_entries: int = 50000,
+        max_runs: int = 16,
+        idle_ttl: float = 1800.0,
+    ):
+        """Initialize the reranker (the model is loaded on first use).
+
+        Args:
+            model_name: sentence-transformers model name or path
+            device: Torch device the model runs on
+            batch_size: Chunks encoded per forward pass
+            chunk_size: Characters per chunk
+            chunk_overlap: Characters shared by consecutive chunks
+            cache_entries: Chunk embeddings kept in memory
+            max_runs: Research runs whose chunk index is kept
+            idle_ttl: Seconds an unused run index is kept
+        """
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = max(1, batch_size)
+        self.cache_entries = cache_entries
+        self.max_runs = max_runs
+        self.idle_ttl = idle_ttl
+        self._splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._indexes: OrderedDict[str, ChunkIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.encoded = 0
+        self.batches = 0
+        self.encode_seconds = 0.0
+
+    def _get_model(self):
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            start = time.monotonic()
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+            logger.info(f"🧠 Loaded embedding model {self.model_name} in {time.monotonic() - start:.1f}s")
+        return self._model
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Return normalized embeddings of ``texts``, encoding only those not cached."""
+        keys = [_content_hash(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    vectors[key] = self._cache[key]
+            self.cache_hits += len(vectors)
+        missing = list({key: text for key, text in zip(keys, texts) if key not in vectors}.items())
+        if missing:
+            with self._model_lock:
+                model = self._get_model()
+                start = time.monotonic()
+                encoded = model.encode(
+                    [text for _, text in missing],
+                    batch_size=self.batch_size,
+                    normalize_embeddings=True,
+                    convert_to_numpy=True,
+                    show_progress_bar=False,
+                ).astype(np.float32)
+                self.encode_seconds += time.monotonic() - start
+            with self._lock:
+                self.encoded += len(missing)
+                self.batches += -(-len(missing) // self.batch_size)
+                for (key, _), vector in zip(missing, encoded):
+                    vectors[key] = self._cache[key] = vector
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+        return np.stack([vectors[key] for key in keys])
+
+    def _run_index(self, run_key: Optional[str]) -> ChunkIndex:
+        if run_key is None:
+            return ChunkIndex()
+        now = time.monotonic()
+        with self._lock:
+            for key, index in list(self._indexes.items()):
+                if now - index.last_used > self.idle_ttl:
+                    del self._indexes[key]
+            index = self._indexes.get(run_key)
+            if index is None:
+                index = self._indexes[run_key] = ChunkIndex()
+                while len(self._indexes) > self.max_runs:
+                    self._indexes.popitem(last=False)
+            else:
+                self._indexes.move_to_end(run_key)
+            index.last_used = now
+            return index
+
+    def rerank(
+        self,
+        results: Dict[str, Dict[str, Any]],
+        run_key: Optional[str] = None,
+        max_chunks: int = 5,
+    ) -> Dict[str, Dict[str, str]]:
+        """Keep the chunks of each query's results most relevant to that query.
+
+        Args:
+            results: Search results by URL, each with ``title``, ``query``,
+                ``content`` and optionally ``raw_content``
+            run_key: Research run whose chunk index to use and extend
+            max_chunks: Chunks kept per query
+
+        Returns:
+            ``{url: {"title", "content"}}`` for the URLs with retained chunks,
+            in the order of ``results``; each page's chunks are stitched in
+            page order
+        """
+        index = self._run_index(run_key)
+        new_chunks = []
+        for url, result in results.items():
+            text = result.get("raw_content") or result.get("content") or ""
+            for position, chunk in enumerate(self._splitter.split_text(text)):
+                key = _content_hash(chunk)
+                if (url, key) not in index:
+                    new_chunks.append({"url": url, "key": key, "position": position, "text": chunk})
+        # Duplicate chunks within a page are indexed once
+        new_chunks = list({(c["url"], c["key"]): c for c in new_chunks}.values())
+        if new_chunks:
+            vectors = self.embed([chunk["text"] for chunk in new_chunks])
+            with self._lock:
+                # Another call of the same run may have indexed some of them meanwhile
+                fresh = [i for i, c in enumerate(new_chunks) if (c["url"], c["key"]) not in index]
+                index.add([new_chunks[i] for i in fresh], vectors[fresh])
+
+        urls_by_query: Dict[str, set] = {}
+        for url, result in results.items():
+            urls_by_query.setdefault(result.get("query", ""), set()).add(url)
+        query_vectors = self.embed(list(urls_by_query))
+
+        retained: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        with self._lock:
+            for query_vector, urls in zip(query_vectors, urls_by_query.values()):
+                for chunk in index.search(query_vector, urls, max_chunks):
+                    retained.setdefault(chunk["url"], {})[chunk["key"]] = chunk
+
+        return {
+            url: {
+                "title": result["title"],
+                "content": "\n\n".join(
+                    f"...{chunk['text']}..."
+                    for chunk in sorted(retained[url].values(), key=lambda c: c["position"])
+                ),
+            }
+            for url, result in results.items()
+            if url in retained
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return embedding cache and index counters."""
+        with self._lock:
+            indexes = {run_key: len(index) for run_key, index in self._indexes.items()}
+            lookups = self.cache_hits + self.encoded
+            return {
+                "model": self.model_name,
+                "loaded": self._model is not None,
+                "cached_embeddings": len(self._cache),
+                "cache_hit_rate": round(self.cache_hits / lookups, 3) if lookups else 0.0,
+                "encoded": self.encoded,
+                "batches": self.batches,
+                "encode_seconds": round(self.encode_seconds, 1),
+                "run_indexes": indexes,
+            }
+
+
+_rerankers: Dict[str, EmbeddingReranker] = {}
+_rerankers_lock = threading.Lock()
+
+
+def get_embedding_reranker(model_name: str) -> EmbeddingReranker:
+    """Return the process-wide reranker for ``model_name``.
+
+    Configured by EMBEDDING_DEVICE (default cpu), EMBEDDING_BATCH_SIZE
+    (default 32), EMBEDDING_CACHE_MAX_ENTRIES (default 50000),
+    RERANK_INDEX_MAX_RUNS (default 16) and RERANK_INDEX_IDLE_TTL (seconds,
+    default 1800).
+    """
+    with _rerankers_lock:
+        reranker = _rerankers.get(model_name)
+        if reranker is None:
+            reranker = _rerankers[model_name] = EmbeddingReranker(
+                model_name,
+                device=os.getenv("EMBEDDING_DEVICE", "cpu"),
+                batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "32")),
+                cache_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000")),
+                max_runs=int(os.getenv("RERANK_INDEX_MAX_RUNS", "16")),
+                idle_ttl=float(os.getenv("RERANK_INDEX_IDLE_TTL", "1800")),
+            )
+        return reranker
+
+
+def embedding_rerank_stats() -> List[Dict[str, Any]]:
+    """Return stats for every reranker loaded in this process."""
+    with _rerankers_lock:
+        rerankers = list(_rerankers.values())
+    return [reranker.stats() for reranker in rerankers]
@@ -0,0 +1,119 @@
+"""Fast JSON encoding/decoding for large search payloads.
+
+Uses orjson when installed, then msgspec, and falls back to the standard
+library otherwise. All backends produce plain dicts/lists, and decode errors
+are raised as ``json.JSONDecodeError`` regardless of backend, so callers can
+switch from ``json`` without changing their error handling.
+"""
+
+import json
+import os
+from typing import Any, List, Optional, TypedDict, Union
+
+
+class SearchResult(TypedDict, total=False):
+    """One result of a Tavily-compatible search response."""
+
+    title: str
+    url: str
+    content: str
+    raw_content: Optional[str]
+    score: float
+    published_date: Optional[str]
+    img_src: Optional[str]
+
+
+class SearchResponse(TypedDict, total=False):
+    """Tavily-compatible search response returned by the search clients."""
+
+    query: str
+    results: List[SearchResult]
+    answer: Optional[str]
+    images: List[Any]
+    follow_up_questions: Optional[List[str]]
+    response_time: float
+    error: str
+    status_code: int
+    retry_after: Optional[str]
+
+
+def _select_backend() -> str:
+    preferred = os.getenv("FAST_JSON_BACKEND", "").lower()
+    candidates = [preferred] if preferred else ["orjson", "msgspec"]
+    for name in candidates:
+        if name == "json":
+            return "json"
+        try:
+            __import__(name)
+            return name
+        except ImportError:
+            continue
+    return "json"
+
+
+BACKEND = _select_backend()
+
+if BACKEND == "orjson":
+    import orjson
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Decode JSON from bytes or str."""
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+
+    def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+        """Encode ``obj`` as UTF-8 JSON bytes (non-ASCII kept as-is)."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+elif BACKEND == "msgspec":
+    import msgspec
+
+    _decoder = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder()
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Decode JSON from bytes or str."""
+        try:
+            return _decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), "", 0) from e
+
+    def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+        """Encode ``obj`` as UTF-8 JSON bytes (non-ASCII kept as-is)."""
+        data = _encoder.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+else:
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Decode JSON from bytes or str."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+        """Encode ``obj`` as UTF-8 JSON bytes (non-ASCII kept as-is)."""
+        return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Encode ``obj`` as a JSON string (non-ASCII kept as-is)."""
+    return dumps_bytes(obj, indent=indent).decode("utf-8")
+
+
+def decode_search_response(data: Union[bytes, str], query: str) -> SearchResponse:
+    """Decode a search backend response body, filling in the required keys.
+
+    Args:
+        data: Raw response body
+        query: Query the response belongs to (used when the body has none)
+
+    Returns:
+        The decoded response with at least ``query`` and ``results`` set
+    """
+    result = loads(data)
+    if "results" not in result:
+        result["results"] = []
+    if "query" not in result:
+        result["query"] = query
+    return result
@@ -0,0 +1,186 @@
+"""Process-wide pooled HTTP clients for the search backends."""
+
+import asyncio
+import importlib.util
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Compression codecs httpx can decode, in order of preference. gzip/deflate are
+# always available; br and zstd need the optional `brotli` / `zstandard` packages.
+_OPTIONAL_ENCODINGS = (("zstd", "zstandard"), ("br", "brotli"))
+
+
+def _accept_encoding() -> str:
+    encodings = [
+        encoding for encoding, module in _OPTIONAL_ENCODINGS
+        if importlib.util.find_spec(module) is not None
+    ]
+    return ", ".join(encodings + ["gzip", "deflate"])
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class _CountingStream(httpx.AsyncByteStream):
+    """Response stream wrapper that releases an in-flight slot when closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class _InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """HTTP transport that tracks in-flight requests for saturation stats."""
+
+    def __init__(self, max_connections: int, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+
+    def _acquire(self) -> None:
+        self.in_flight += 1
+        self.total_requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _release_once(self):
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.in_flight -= 1
+
+        return release
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._acquire()
+        release = self._release_once()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _CountingStream(response.stream, release)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        pool = getattr(self, "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for conn in connections if getattr(conn, "is_idle", lambda: False)())
+        http2 = sum(
+            1 for conn in connections
+            if "HTTP/2" in repr(conn)
+        )
+        return {
+            "max_connections": self.max_connections,
+            "open_connections": len(connections),
+            "idle_connections": idle,
+            "http2_connections": http2,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "total_requests": self.total_requests,
+            "saturation": round(self.in_flight / self.max_connections, 3) if self.max_connections else 0.0,
+        }
+
+
+# (event loop, backend) -> (client, transport). httpx clients are bound to the
+# loop they first did I/O on, so every loop gets its own pool.
+_shared_clients: Dict[Tuple[asyncio.AbstractEventLoop, str], Tuple[httpx.AsyncClient, _InstrumentedTransport]] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _prune_closed_loops() -> None:
+    for key in [key for key in _shared_clients if key[0].is_closed()]:
+        _shared_clients.pop(key, None)
+
+
+def get_shared_http_client(
+    backend: str,
+    timeout: httpx.Timeout,
+    limits: Optional[httpx.Limits] = None,
+) -> httpx.AsyncClient:
+    """Return the long-lived HTTP client for ``backend`` on the running event loop.
+
+    The client is created on first use with HTTP/2 enabled when the `h2`
+    package is installed and an Accept-Encoding header that advertises every
+    compression codec httpx can decode here.
+
+    Args:
+        backend: Backend name used as the pool key (e.g. "perplexica")
+        timeout: Timeout configuration used when the client is created
+        limits: Connection pool limits used when the client is created
+
+    Returns:
+        Shared httpx.AsyncClient; callers must not close it
+    """
+    loop = asyncio.get_running_loop()
+    limits = limits or httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    with _shared_clients_lock:
+        _prune_closed_loops()
+        entry = _shared_clients.get((loop, backend))
+        if entry is None or entry[0].is_closed:
+            http2 = _http2_available()
+            transport = _InstrumentedTransport(
+                max_connections=limits.max_connections or 0,
+                http2=http2,
+                limits=limits,
+            )
+            client = httpx.AsyncClient(
+                transport=transport,
+                timeout=timeout,
+                headers={"Accept-Encoding": _accept_encoding()},
+            )
+            entry = (client, transport)
+            _shared_clients[(loop, backend)] = entry
+            logger.info(f"🔌 Created pooled HTTP client for {backend} (http2={http2}, max_connections={limits.max_connections})")
+        return entry[0]
+
+
+async def aclose_shared_http_clients() -> None:
+    """Close every pooled client bound to the running event loop.
+
+    Intended to be called from the application lifespan hook on shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    with _shared_clients_lock:
+        keys = [key for key in _shared_clients if key[0] is loop]
+        entries = [_shared_clients.pop(key) for key in keys]
+    for client, _ in entries:
+        await client.aclose()
+
+
+def http_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Return connection pool saturation stats per backend for this process."""
+    stats: Dict[str, Dict[str, Any]] = {}
+    with _shared_clients_lock:
+        _prune_closed_loops()
+        for (_, backend), (_, transport) in _shared_clients.items():
+            backend_stats = transport.stats()
+            if backend in stats:
+                # Several event loops: aggregate counters across their pools
+                for key, value in backend_stats.items():
+                    if key != "saturation":
+                        stats[backend][key] += value
+                stats[backend]["saturation"] = max(stats[backend]["saturation"], backend_stats["saturation"])
+            else:
+                stats[backend] = backend_stats
+    return stats
@@ -0,0 +1,154 @@
+"""Cross-researcher micro-batching of search queries into batch requests."""
+
+import asyncio
+import json
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+SubmitBatch = Callable[..., Awaitable[List[Dict[str, Any]]]]
+
+
+class _PendingBatch:
+    """Queries collected for one parameter set while the window is open."""
+
+    def __init__(self, submit_batch: SubmitBatch, params: Dict[str, Any]):
+        self.submit_batch = submit_batch
+        self.params = params
+        self.items: List[Tuple[str, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class MicroBatcher:
+    """Collect queries submitted within a short window and send them as one batch.
+
+    Queries are grouped by their search parameters, since a batch request
+    shares one parameter set. A group is flushed when the window elapses or
+    when it reaches ``max_batch`` queries, whichever comes first. Every caller
+    gets back its own response; a caller being cancelled does not affect the
+    others in the batch.
+    """
+
+    def __init__(self, name: str, window: float, max_batch: int = 10):
+        """Initialize the batcher.
+
+        Args:
+            name: Batcher name used in stats (usually the backend name)
+            window: Seconds to wait for more queries after the first one of a batch
+            max_batch: Flush immediately once a batch holds this many queries
+        """
+        self.name = name
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        # Futures and timers are bound to their event loop, so batches are per loop
+        self._pending: Dict[Tuple[asyncio.AbstractEventLoop, str], _PendingBatch] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.queries = 0
+        self.largest_batch = 0
+
+    async def submit(
+        self, query: str, params: Dict[str, Any], submit_batch: SubmitBatch
+    ) -> Dict[str, Any]:
+        """Queue ``query`` for the next batch and wait for its response.
+
+        Args:
+            query: Search query
+            params: Search parameters; only queries with equal params are batched together
+            submit_batch: ``search_batch``-style coroutine function called as
+                ``submit_batch(queries, **params)`` when the batch is flushed
+
+        Returns:
+            The response for ``query``
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, json.dumps(params, sort_keys=True, default=str))
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch(submit_batch, params)
+            batch.timer = loop.call_later(self.window, self._flush, key)
+        future = loop.create_future()
+        batch.items.append((query, future))
+        if len(batch.items) >= self.max_batch:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Tuple[asyncio.AbstractEventLoop, str]) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        self.batches += 1
+        self.queries += len(batch.items)
+        self.largest_batch = max(self.largest_batch, len(batch.items))
+        task = key[0].create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    async def _run(batch: _PendingBatch) -> None:
+        queries = [query for query, _ in batch.items]
+        try:
+            responses = await batch.submit_batch(queries, **batch.params)
+        except BaseException as e:
+            for _, future in batch.items:
+                if not future.done():
+                    future.set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+        for (query, future), response in zip(batch.items, responses):
+            if not future.done():
+                future.set_result(response)
+        for _, future in batch.items[len(responses):]:
+            if not future.done():
+                future.set_exception(RuntimeError("Batch returned fewer responses than queries"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return batch counters."""
+        return {
+            "window_ms": round(self.window * 1000, 1),
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "queries": self.queries,
+            "avg_batch_size": round(self.queries / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "pending": sum(len(batch.items) for batch in list(self._pending.values())),
+        }
+
+
+_batchers: Dict[str, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_micro_batcher(backend: str) -> Optional[MicroBatcher]:
+    """Return the process-wide micro-batcher for ``backend``, or None when disabled.
+
+    Controlled by SEARCH_MICRO_BATCH_WINDOW_MS (0 disables batching) and
+    SEARCH_MICRO_BATCH_MAX_SIZE; per-backend variants (e.g.
+    ``PERPLEXICA_MICRO_BATCH_WINDOW_MS``) take precedence.
+    """
+    prefix = backend.upper()
+    window_ms = float(
+        os.getenv(f"{prefix}_MICRO_BATCH_WINDOW_MS")
+        or os.getenv("SEARCH_MICRO_BATCH_WINDOW_MS", "20")
+    )
+    if window_ms <= 0:
+        return None
+    with _batchers_lock:
+        batcher = _batchers.get(backend)
+        if batcher is None:
+            max_batch = int(
+                os.getenv(f"{prefix}_MICRO_BATCH_MAX_SIZE")
+                or os.getenv("SEARCH_MICRO_BATCH_MAX_SIZE", "10")
+            )
+            batcher = _batchers[backend] = MicroBatcher(backend, window_ms / 1000, max_batch)
+        return batcher
+
+
+def micro_batcher_stats() -> Dict[str, Dict[str, Any]]:
+    """Return stats for every micro-batcher created in this process."""
+    with _batchers_lock:
+        batchers = dict(_batchers)
+    return {name: batcher.stats() for name, batcher in batchers.items()}
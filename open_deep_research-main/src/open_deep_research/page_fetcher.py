@@ -0,0 +1,438 @@
+"""Tiered page fetching: plain HTTP + lxml/markdownify (or a document extractor) first, headless browser second."""
+
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from open_deep_research.backend_health import LatencyTracker
+from open_deep_research.crawler_pool import build_run_config, get_crawler_pool
+from open_deep_research.document_extractor import (
+    UnsupportedContentError,
+    detect_document_type,
+    get_document_extractor,
+    looks_like_document_url,
+)
+from open_deep_research.http_pool import get_shared_http_client
+
+logger = logging.getLogger(__name__)
+
+FETCH_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+FETCH_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.5",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Tags that never carry article content (mirrors the Crawl4AI excluded_tags)
+_BOILERPLATE_XPATH = (
+    "//script|//style|//noscript|//template|//svg|//iframe|//form|//button"
+    "|//nav|//header|//footer|//aside"
+)
+# Markers of bot challenges and client-side rendered shells
+_BROWSER_REQUIRED_MARKERS = (
+    "enable javascript",
+    "javascript is required",
+    "javascript is disabled",
+    "just a moment...",
+    "cf-browser-verification",
+    "challenge-platform",
+    "__cf_chl",
+)
+_MARKDOWN_IMAGE = re.compile(r'!\[.*?\]\((https?://[^\)\s]+)')
+# Error statuses that may be a bot challenge a real browser can pass
+_CHALLENGE_STATUSES = {403, 429, 503}
+_DOCUMENT_KINDS = ("pdf", "docx")
+
+
+@dataclass
+class FetchedPage:
+    """Content extracted from one page."""
+
+    url: str
+    markdown: str
+    images: List[str] = field(default_factory=list)
+    headers: Dict[str, str] = field(default_factory=dict)
+    tier: str = "http"
+    browser_seconds: float = 0.0  # time spent in the browser tier, without the HTTP attempt
+
+
+@dataclass
+class Download:
+    """Body of a successful HTTP response, before extraction."""
+
+    url: str
+    kind: str  # "html", "text", "pdf" or "docx"
+    body: bytes
+    headers: Dict[str, str]
+    encoding: Optional[str]
+
+
+def extract_images(markdown: str, limit: int = 5) -> List[str]:
+    """Return up to ``limit`` absolute image URLs referenced in ``markdown``."""
+    return _MARKDOWN_IMAGE.findall(markdown)[:limit]
+
+
+def html_to_markdown(html: str, url: str) -> Tuple[str, int]:
+    """Convert the main content of an HTML page to markdown.
+
+    Boilerplate elements are dropped, the largest ``<article>``/``<main>``
+    (falling back to ``<body>``) is kept, links are reduced to their text and
+    image sources are made absolute.
+
+    Args:
+        html: Page HTML
+        url: Page URL, used to resolve relative image sources
+
+    Returns:
+        Tuple of (markdown, number of visible text characters in the content)
+    """
+    from lxml import html as lxml_html
+    from markdownify import markdownify
+
+    doc = lxml_html.fromstring(html)
+    try:
+        doc.make_links_absolute(url, resolve_base_href=True)
+    except ValueError:
+        pass
+    for element in doc.xpath(_BOILERPLATE_XPATH):
+        element.drop_tree()
+    candidates = (
+        doc.xpath("//article") or doc.xpath("//main") or doc.xpath('//*[@role="main"]')
+        or doc.xpath("//body") or [doc]
+    )
+    main = max(candidates, key=lambda element: len(element.text_content()))
+    text_chars = len(" ".join(main.text_content().split()))
+    markdown = markdownify(
+        lxml_html.tostring(main, encoding="unicode"),
+        heading_style="ATX",
+        strip=["a"],
+    )
+    return re.sub(r"\n{3,}", "\n\n", markdown).strip(), text_chars
+
+
+def needs_browser(html: str, text_chars: int, min_chars: int) -> bool:
+    """Return True if a page's HTTP response isn't good enough to use as-is.
+
+    That is the case when too little text was extracted, when the page is a
+    bot challenge / "enable JavaScript" shell, or when a large document holds
+    almost no text (client-side rendered app).
+    """
+    if text_chars < min_chars:
+        return True
+    head = html[:50000].lower()
+    if text_chars < 3 * min_chars and any(marker in head for marker in _BROWSER_REQUIRED_MARKERS):
+        return True
+    return len(html) > 100_000 and text_chars / len(html) < 0.01
+
+
+class TierStats:
+    """Attempts, outcomes and latency of one fetch tier."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.attempts = 0
+        self.successes = 0
+        self.escalations = 0
+        self.failures = 0
+        self.latency = LatencyTracker()
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str, seconds: float) -> None:
+        """Record one attempt ("success", "escalated" or "failure") and its latency."""
+        with self._lock:
+            self.attempts += 1
+            if outcome == "success":
+                self.successes += 1
+            elif outcome == "escalated":
+                self.escalations += 1
+            else:
+                self.failures += 1
+        self.latency.record(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return outcome counters and latency percentiles."""
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "escalations": self.escalations,
+            "failures": self.failures,
+            "hit_rate": round(self.successes / self.attempts, 3) if self.attempts else 0.0,
+            "latency": self.latency.stats(),
+        }
+
+
+class TieredFetcher:
+    """Fetch pages over plain HTTP first and only escalate hard ones to Crawl4AI.
+
+    Tier 1 is a pooled, streamed async GET. The content type is sniffed from
+    the first bytes: HTML goes through lxml/markdownify in a worker thread,
+    PDF/DOCX through the process-pool document extractor (tier "document"),
+    and other binary files fail right away instead of wasting a browser.
+    HTML pages that fail, time out, look JS-rendered or yield less than
+    ``min_chars`` characters of text go to tier 2, the pooled headless browser
+    with the usual Crawl4AI content filtering. 4xx responses fail right away
+    too, unless they look like a bot challenge. Documents never go to the
+    browser, which can't render them: their download has its own, longer
+    bound and a failed or timed-out download fails the page.
+
+    The time spent in the HTTP tier comes out of the browser timeout, down
+    to half of it, so an escalated page stays close to the browser budget.
+    """
+
+    def __init__(
+        self,
+        http_enabled: bool = True,
+        http_timeout: float = 8.0,
+        max_bytes: int = 3 * 1024 * 1024,
+        min_chars: int = 800,
+        document_max_bytes: int = 25 * 1024 * 1024,
+        document_timeout: float = 30.0,
+    ):
+        """Initialize the fetcher.
+
+        Args:
+            http_enabled: Try the plain HTTP tier before the browser
+            http_timeout: Total time allowed for the HTTP tier's download
+                and HTML extraction, in seconds
+            max_bytes: Largest response body the HTTP tier downloads
+            min_chars: Minimum extracted text for an HTTP result to be used
+            document_max_bytes: Largest PDF/DOCX the HTTP tier downloads
+            document_timeout: Total time allowed for downloading a PDF/DOCX,
+                in seconds (extraction has its own DOCUMENT_EXTRACT_TIMEOUT)
+        """
+        self.http_enabled = http_enabled
+        self.http_timeout = httpx.Timeout(connect=5.0, read=http_timeout, write=5.0, pool=10.0)
+        self.http_total_timeout = http_timeout
+        self.max_bytes = max_bytes
+        self.min_chars = min_chars
+        self.document_max_bytes = document_max_bytes
+        self.document_timeout = max(document_timeout, http_timeout)
+        self.tiers = {"http": TierStats(), "document": TierStats(), "browser": TierStats()}
+
+    async def read_response(
+        self, url: str, response: httpx.Response, on_sniffed: Optional[Callable[[str], None]] = None
+    ) -> Optional[Download]:
+        """Download the body of an open, streamed 2xx response.
+
+        The real type is sniffed from the first bytes before committing to
+        the download; ``on_sniffed`` is called with it, if given.
+
+        Returns:
+            The download, or None if an HTML page is larger than ``max_bytes``
+
+        Raises:
+            UnsupportedContentError: For binary files and oversized documents
+        """
+        content_type = response.headers.get("content-type", "").lower()
+        chunks = response.aiter_bytes()
+        body = bytearray()
+        async for chunk in chunks:
+            body += chunk
+            if len(body) >= 1024:
+                break
+        kind = detect_document_type(content_type, str(response.url), bytes(body[:1024]))
+        if kind is None:
+            raise UnsupportedContentError(f"unsupported content type {content_type or 'unknown'}")
+        if on_sniffed is not None:
+            on_sniffed(kind)
+        is_document = kind in _DOCUMENT_KINDS
+        limit = self.document_max_bytes if is_document else self.max_bytes
+        async for chunk in chunks:
+            body += chunk
+            if len(body) > limit:
+                if is_document:
+                    raise UnsupportedContentError(f"{kind} larger than {limit} bytes")
+                return None
+        return Download(url, kind, bytes(body), dict(response.headers), response.encoding)
+
+    async def extract(self, download: Download) -> Optional[FetchedPage]:
+        """Turn a download into a page.
+
+        Returns:
+            The page, or None if an HTML page needs a browser (too little
+            text, JS-rendered shell or bot challenge)
+
+        Raises:
+            UnsupportedContentError: If a document has no extractable text
+        """
+        if download.kind in _DOCUMENT_KINDS:
+            markdown, _ = await get_document_extractor().extract(download.kind, download.body)
+            if not markdown.strip():
+                # Scanned documents without a text layer; a browser can't do better
+                raise UnsupportedContentError(f"{download.kind} has no extractable text")
+            return FetchedPage(download.url, markdown, [], download.headers, tier="document")
+
+        text = download.body.decode(download.encoding or "utf-8", errors="replace")
+        if download.kind == "text":
+            markdown = text.strip()
+            text_chars = len(markdown)
+        else:
+            markdown, text_chars = await asyncio.to_thread(html_to_markdown, text, download.url)
+        if needs_browser(text, text_chars, self.min_chars):
+            return None
+        return FetchedPage(download.url, markdown, extract_images(markdown), download.headers, tier="http")
+
+    async def _download(self, url: str, on_sniffed: Callable[[str], None]) -> Optional[Download]:
+        client = get_shared_http_client("crawl", timeout=self.http_timeout, limits=FETCH_LIMITS)
+        async with client.stream(
+            "GET", url, headers=FETCH_HEADERS, timeout=self.http_timeout, follow_redirects=True
+        ) as response:
+            status = response.status_code
+            if status >= 400:
+                if status in _CHALLENGE_STATUSES:
+                    # A real browser may get past a bot challenge
+                    head = b""
+                    async for chunk in response.aiter_bytes():
+                        head += chunk
+                        if len(head) >= 50000:
+                            break
+                    text = head.decode("utf-8", errors="replace").lower()
+                    if any(marker in text for marker in _BROWSER_REQUIRED_MARKERS):
+                        return None
+                if status >= 500:
+                    # Server errors may be transient: let the browser try
+                    return None
+                # 404, 410, plain 403...: a browser would get the same answer
+                raise UnsupportedContentError(f"HTTP {status}")
+            return await self.read_response(url, response, on_sniffed)
+
+    async def _http_fetch(self, url: str, kinds: List[str]) -> Optional[FetchedPage]:
+        async def download_html() -> Optional[Any]:
+            download = await self._download(url, kinds.append)
+            if download is None or download.kind in _DOCUMENT_KINDS:
+                return download
+            return await self.extract(download)
+
+        # Total bound on the tier, so a server dripping bytes can't hold it between
+        # reads; a document gets the rest of its own, longer bound once recognized
+        task = asyncio.ensure_future(download_html())
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.http_total_timeout)
+            if not done and self._is_document(url, kinds):
+                done, _ = await asyncio.wait({task}, timeout=self.document_timeout - self.http_total_timeout)
+        finally:
+            if not task.done():
+                task.cancel()
+        if not done:
+            raise asyncio.TimeoutError()
+        result = task.result()
+        if isinstance(result, Download):
+            # Document extraction has its own bound (DOCUMENT_EXTRACT_TIMEOUT)
+            return await self.extract(result)
+        return result
+
+    @staticmethod
+    def _is_document(url: str, kinds: List[str]) -> bool:
+        return looks_like_document_url(url) or any(kind in _DOCUMENT_KINDS for kind in kinds)
+
+    async def _browser_fetch(self, url: str, timeout: float) -> Optional[FetchedPage]:
+        async with get_crawler_pool().lease() as crawler:
+            result = await asyncio.wait_for(
+                crawler.arun(url=url, config=build_run_config(timeout)),
+                timeout=timeout
+            )
+        if not (result and result.success and result.markdown):
+            error_msg = getattr(result, "error_message", None) or "empty content"
+            raise RuntimeError(str(error_msg))
+        markdown = str(result.markdown)
+        headers = getattr(result, "response_headers", None) or {}
+        return FetchedPage(url, markdown, extract_images(markdown), dict(headers), tier="browser")
+
+    async def fetch(self, url: str, browser_timeout: float) -> FetchedPage:
+        """Fetch ``url`` through the cheapest tier that yields usable content.
+
+        Args:
+            url: Page URL
+            browser_timeout: Page timeout of the browser tier in seconds
+
+        Returns:
+            The extracted page
+
+        Raises:
+            asyncio.TimeoutError: If the browser tier timed out
+            RuntimeError: If the browser tier returned no content
+            UnsupportedContentError: If the URL is a binary file, a document
+                that couldn't be downloaded or extracted or a 4xx error page
+                (the browser isn't tried)
+        """
+        # Documents are always fetched over HTTP: the browser can't render them
+        if self.http_enabled or looks_like_document_url(url):
+            start = time.monotonic()
+            kinds: List[str] = []
+            error = "server error or bot challenge"
+            try:
+                page = await self._http_fetch(url, kinds)
+            except UnsupportedContentError:
+                self.tiers["http"].record("failure", time.monotonic() - start)
+                raise
+            except asyncio.TimeoutError:
+                logger.debug(f"HTTP tier timed out for {url}")
+                page, error = None, "download timed out"
+            except (httpx.HTTPError, ValueError) as e:
+                logger.debug(f"HTTP tier failed for {url}: {e}")
+                page, error = None, f"download failed: {str(e) or type(e).__name__}"
+            except Exception as e:
+                # lxml parser errors and the like: let the browser try
+                logger.debug(f"HTTP tier extraction failed for {url}: {e}")
+                page, error = None, f"download failed: {str(e) or type(e).__name__}"
+            elapsed = time.monotonic() - start
+            if page is None and self._is_document(url, kinds):
+                self.tiers["document"].record("failure", elapsed)
+                raise UnsupportedContentError(f"document {error}")
+            tier = page.tier if page else "http"
+            self.tiers[tier].record("success" if page else "escalated", elapsed)
+            if page:
+                return page
+            browser_timeout = max(browser_timeout - elapsed, browser_timeout / 2)
+
+        start = time.monotonic()
+        try:
+            page = await self._browser_fetch(url, browser_timeout)
+        except BaseException:
+            self.tiers["browser"].record("failure", time.monotonic() - start)
+            raise
+        page.browser_seconds = time.monotonic() - start
+        self.tiers["browser"].record("success", page.browser_seconds)
+        return page
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tier hit counts and latency."""
+        return {name: tier.stats() for name, tier in self.tiers.items()}
+
+
+_fetcher: Optional[TieredFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_page_fetcher() -> TieredFetcher:
+    """Return the process-wide tiered fetcher.
+
+    Configured by CRAWL_HTTP_TIER_ENABLED (default true), CRAWL_HTTP_TIMEOUT
+    (total seconds per page, default 8), CRAWL_HTTP_MAX_BYTES (default 3 MB) and
+    CRAWL_HTTP_MIN_CHARS (minimum extracted text before escalating to the
+    browser, default 800), DOCUMENT_MAX_BYTES (largest PDF/DOCX
+    downloaded, default 25 MB) and DOCUMENT_DOWNLOAD_TIMEOUT (total seconds
+    per PDF/DOCX download, default 30).
+    """
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = TieredFetcher(
+                http_enabled=os.getenv("CRAWL_HTTP_TIER_ENABLED", "true").lower() == "true",
+                http_timeout=float(os.getenv("CRAWL_HTTP_TIMEOUT", "8")),
+                max_bytes=int(os.getenv("CRAWL_HTTP_MAX_BYTES", str(3 * 1024 * 1024))),
+                min_chars=int(os.getenv("CRAWL_HTTP_MIN_CHARS", "800")),
+                document_max_bytes=int(os.getenv("DOCUMENT_MAX_BYTES", str(25 * 1024 * 1024))),
+                document_timeout=float(os.getenv("DOCUMENT_DOWNLOAD_TIMEOUT", "30")),
+            )
+        return _fetcher
@@ -0,0 +1,131 @@
+"""Query-focused passage selection with BM25, run before page summarization."""
+
+import logging
+import re
+from typing import List, Tuple
+
+from open_deep_research.token_counter import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_CJK_CHARS = "぀-ヿ㐀-䶿一-鿿가-힯"
+# Words in any script, or runs of CJK characters (split into bigrams below)
+_TOKEN = re.compile(rf"[{_CJK_CHARS}]+|[^\W{_CJK_CHARS}]+", re.UNICODE)
+_CJK = re.compile(rf"[{_CJK_CHARS}]")
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？])\s+")
+_GAP = "\n\n[...]\n\n"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens for BM25; CJK runs become overlapping character bigrams."""
+    tokens = []
+    for match in _TOKEN.findall(text.lower()):
+        if len(match) > 1 and _CJK.match(match):
+            tokens.extend(match[i:i + 2] for i in range(len(match) - 1))
+        else:
+            tokens.append(match)
+    return tokens
+
+
+def _truncate(text: str, token_budget: int) -> str:
+    """Cut ``text`` to at most ``token_budget`` tokens, keeping its beginning."""
+    tokens = count_tokens(text)
+    while tokens > token_budget and text:
+        text = text[:max(0, len(text) * token_budget // tokens - 1)]
+        tokens = count_tokens(text)
+    return text
+
+
+def split_passages(text: str, target_chars: int = 1200) -> List[str]:
+    """Split ``text`` into passages of about ``target_chars`` characters.
+
+    Paragraphs (blank-line separated) are merged up to the target size;
+    longer paragraphs are split at sentence boundaries, and as a last
+    resort at the target size.
+    """
+    pieces: List[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= target_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            pieces.extend(sentence[i:i + target_chars] for i in range(0, len(sentence), target_chars))
+
+    passages: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 2 > target_chars:
+            passages.append(current)
+            current = piece
+        else:
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        passages.append(current)
+    return passages
+
+
+def select_passages(text: str, query: str, token_budget: int) -> Tuple[str, int, int]:
+    """Keep the passages of ``text`` most relevant to ``query``, within ``token_budget`` tokens.
+
+    Passages are scored against the query with BM25 (rank-bm25, vectorized
+    over all passages with numpy). The opening passage (title and lead) is
+    always kept when it fits; the best-scoring passages fill the rest of the
+    budget and are returned in document order, with ``[...]`` marking gaps.
+    If no passage fits the budget on its own, the best-scoring one is cut to
+    the budget. Pages already within the budget are returned unchanged;
+    without rank-bm25 installed, the head of the page is kept.
+
+    Args:
+        text: Page content (markdown)
+        query: Search query the page was found for
+        token_budget: Maximum tokens of selected content
+
+    Returns:
+        Tuple of (selected text, tokens before, tokens after)
+    """
+    total_tokens = count_tokens(text)
+    if total_tokens <= token_budget or not query.strip():
+        return text, total_tokens, total_tokens
+    try:
+        from rank_bm25 import BM25Okapi
+    except ImportError:
+        logger.warning("rank-bm25 not installed, sending the head of the page to the summarizer")
+        head = _truncate(text, token_budget)
+        return head, total_tokens, count_tokens(head)
+
+    passages = split_passages(text)
+    query_tokens = tokenize(query)
+    corpus = [tokenize(passage) for passage in passages]
+    if not query_tokens or not any(corpus):
+        return text, total_tokens, total_tokens
+    scores = BM25Okapi([tokens or [""] for tokens in corpus]).get_scores(query_tokens)
+
+    passage_tokens = [count_tokens(passage) for passage in passages]
+    ranked = sorted(range(1, len(passages)), key=lambda i: scores[i], reverse=True)
+    chosen = []
+    used = 0
+    for index in [0] + ranked:
+        if used + passage_tokens[index] <= token_budget:
+            chosen.append(index)
+            used += passage_tokens[index]
+        if used >= token_budget * 0.95:
+            break
+    if not chosen:
+        # Every passage is larger than the budget: keep the head of the best one
+        best = max(range(len(passages)), key=lambda i: scores[i])
+        best = _truncate(passages[best], token_budget)
+        return best, total_tokens, count_tokens(best)
+
+    selected = []
+    previous = -1
+    for index in sorted(chosen):
+        if selected and index != previous + 1:
+            selected.append(_GAP)
+        elif selected:
+            selected.append("\n\n")
+        selected.append(passages[index])
+        previous = index
+    return "".join(selected), total_tokens, used
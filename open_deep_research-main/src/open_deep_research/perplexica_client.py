@@ -5,10 +5,14 @@ This client provides a drop-in replacement for AsyncTavilyClient,
 allowing Open Deep Research to use Perplexica as the search backend
 while maintaining complete API compatibility.
 """
+import asyncio
 import os
 import httpx
 from typing import Any, Dict, List, Literal, Optional
 
+from open_deep_research import fast_json
+from open_deep_research.fast_json import decode_search_response
+
 
 class AsyncPerplexicaClient:
     """
@@ -18,10 +22,26 @@ class AsyncPerplexicaClient:
     and Perplexica API calls, with complete compatibility.
     """
     
+    # Default timeout/pool settings (5 minutes for content fetching)
+    TIMEOUT = httpx.Timeout(
+        connect=10.0,
+        read=300.0,     # 5 minutes for content fetching
+        write=10.0,
+        pool=10.0
+    )
+    LIMITS = httpx.Limits(
+        max_keepalive_connections=20,
+        max_connections=100
+    )
+    
+    # Base URLs whose server has no /batch endpoint (older Perplexica builds)
+    _batch_unsupported: Dict[str, bool] = {}
+    
     def __init__(
         self, 
         api_key: Optional[str] = None,
-        base_url: Optional[str] = None
+        base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initialize the Perplexica client.
@@ -29,6 +49,8 @@ class AsyncPerplexicaClient:
         Args:
             api_key: API key (optional, currently not used by Perplexica)
             base_url: Base URL for Perplexica API (defaults to env var or service URL)
+            http_client: Shared HTTP client to use instead of creating a private one
+                (e.g. from http_pool.get_shared_http_client); it is not closed by this client
         """
         self.api_key = api_key
         
@@ -41,21 +63,14 @@ class AsyncPerplexicaClient:
                 "http://perplexica-service/api/tavily"
             ).rstrip('/')
         
-        # Create HTTP client with generous timeout for content fetching
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(
-                connect=10.0,
-                read=300.0,      # 5 minutes for content fetching
-                write=10.0,
-                pool=10.0
-            ),
-            limits=httpx.Limits(
-                max_keepalive_connections=20,
-                max_connections=100
-            )
+        # Reuse the shared client when given, otherwise create a private one
+        self._owns_client = http_client is None
+        self.client = http_client or httpx.AsyncClient(
+            timeout=self.TIMEOUT,
+            limits=self.LIMITS
         )
     
-    async def search(
+    def _build_payload(
         self,
         query: str,
         max_results: int = 5,
@@ -89,75 +104,7 @@ class AsyncPerplexicaClient:
         api_key: Optional[str] = None,
         **kwargs
     ) -> Dict[str, Any]:
-        """
-        Execute a search query with full parameter support.
-        
-        This method supports ALL Perplexica API parameters (22 total),
-        providing complete control over search behavior.
-        
-        Args:
-            query: Search query string
-            max_results: Maximum number of results to return (default: 5)
-            include_raw_content: Whether to include full webpage content (default: True)
-            topic: Topic category - "general", "news", or "finance" (default: "general")
-            
-            # Time range parameters
-            time_range: Preset time range - "day", "week", "month", "year" (default: None)
-            date_from: Start date in YYYY-MM-DD format (default: None)
-            date_to: End date in YYYY-MM-DD format (default: None)
-            days: Search results from last N days (default: None)
-            
-            # Domain filtering
-            include_domains: List of domains to search only from (default: None)
-            exclude_domains: List of domains to exclude from search (default: None)
-            
-            # Search control
-            language: Search language code - "en", "zh", "ja", "ko", etc. (default: "en")
-            engines: List of search engines to use (default: None, uses all)
-            safesearch: Safe search level - "0", "1", "2" (default: None)
-            search_depth: Search depth - "basic" or "advanced" (default: "basic")
-            categories: Search categories override (default: None, uses topic mapping)
-            
-            # Content control
-            include_answer: Whether to generate LLM answer (default: False)
-            include_images: Whether to include images in results (default: False)
-            
-            # LLM control (for include_answer=True)
-            llm_provider: LLM provider - "openai", "anthropic", etc. (default: None)
-            llm_model: LLM model name (default: None)
-            answer_max_tokens: Max tokens for answer generation (default: None)
-            answer_temperature: Temperature for answer generation (default: None)
-            answer_context_size: Number of results to use for answer (default: None)
-            
-            # Performance control
-            timeout: Request timeout in seconds (default: None, uses client default)
-            api_key: API key for authentication (default: None)
-            
-            **kwargs: Additional parameters (for future compatibility)
-            
-        Returns:
-            Dict containing search results in Tavily-compatible format:
-            {
-                "query": str,
-                "results": [
-                    {
-                        "title": str,
-                        "url": str,
-                        "content": str,
-                        "raw_content": str (if include_raw_content=True),
-                        "score": float,
-                        "published_date": str (optional)
-                    },
-                    ...
-                ],
-                "response_time": float,
-                "metadata": {...}
-            }
-            
-        Raises:
-            httpx.HTTPStatusError: If the API returns an error status
-            httpx.TimeoutException: If the request times out
-        """
+        """Build the /api/tavily request payload (see ``search`` for parameter docs)."""
         # Build request payload with ALL parameters
         payload = {
             "query": query,
@@ -231,6 +178,138 @@ class AsyncPerplexicaClient:
         
         # Add any additional parameters passed through kwargs
         payload.update(kwargs)
+        return payload
+    
+    async def search(
+        self,
+        query: str,
+        max_results: int = 5,
+        include_raw_content: bool = False,  # Default: use search engine summaries
+        topic: Literal["general", "news", "finance"] = "general",
+        # === 时间范围参数 ===
+        time_range: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        days: Optional[int] = None,
+        # === 域名过滤参数 ===
+        include_domains: Optional[List[str]] = None,
+        exclude_domains: Optional[List[str]] = None,
+        # === 搜索控制参数 ===
+        language: str = "en",
+        engines: Optional[List[str]] = None,
+        safesearch: Optional[str] = None,
+        search_depth: str = "basic",
+        categories: Optional[List[str]] = None,
+        # === 内容控制参数 ===
+        include_answer: bool = False,
+        include_images: bool = False,
+        # === LLM 控制参数 ===
+        llm_provider: Optional[str] = None,
+        llm_model: Optional[str] = None,
+        answer_max_tokens: Optional[int] = None,
+        answer_temperature: Optional[float] = None,
+        answer_context_size: Optional[int] = None,
+        # === 性能控制参数 ===
+        timeout: Optional[int] = None,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Execute a search query with full parameter support.
+        
+        This method supports ALL Perplexica API parameters (22 total),
+        providing complete control over search behavior.
+        
+        Args:
+            query: Search query string
+            max_results: Maximum number of results to return (default: 5)
+            include_raw_content: Whether to include full webpage content (default: True)
+            topic: Topic category - "general", "news", or "finance" (default: "general")
+            
+            # Time range parameters
+            time_range: Preset time range - "day", "week", "month", "year" (default: None)
+            date_from: Start date in YYYY-MM-DD format (default: None)
+            date_to: End date in YYYY-MM-DD format (default: None)
+            days: Search results from last N days (default: None)
+            
+            # Domain filtering
+            include_domains: List of domains to search only from (default: None)
+            exclude_domains: List of domains to exclude from search (default: None)
+            
+            # Search control
+            language: Search language code - "en", "zh", "ja", "ko", etc. (default: "en")
+            engines: List of search engines to use (default: None, uses all)
+            safesearch: Safe search level - "0", "1", "2" (default: None)
+            search_depth: Search depth - "basic" or "advanced" (default: "basic")
+            categories: Search categories override (default: None, uses topic mapping)
+            
+            # Content control
+            include_answer: Whether to generate LLM answer (default: False)
+            include_images: Whether to include images in results (default: False)
+            
+            # LLM control (for include_answer=True)
+            llm_provider: LLM provider - "openai", "anthropic", etc. (default: None)
+            llm_model: LLM model name (default: None)
+            answer_max_tokens: Max tokens for answer generation (default: None)
+            answer_temperature: Temperature for answer generation (default: None)
+            answer_context_size: Number of results to use for answer (default: None)
+            
+            # Performance control
+            timeout: Request timeout in seconds (default: None, uses client default)
+            api_key: API key for authentication (default: None)
+            
+            **kwargs: Additional parameters (for future compatibility)
+            
+        Returns:
+            Dict containing search results in Tavily-compatible format:
+            {
+                "query": str,
+                "results": [
+                    {
+                        "title": str,
+                        "url": str,
+                        "content": str,
+                        "raw_content": str (if include_raw_content=True),
+                        "score": float,
+                        "published_date": str (optional)
+                    },
+                    ...
+                ],
+                "response_time": float,
+                "metadata": {...}
+            }
+            
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status
+            httpx.TimeoutException: If the request times out
+        """
+        payload = self._build_payload(
+            query,
+            max_results=max_results,
+            include_raw_content=include_raw_content,
+            topic=topic,
+            time_range=time_range,
+            date_from=date_from,
+            date_to=date_to,
+            days=days,
+            include_domains=include_domains,
+            exclude_domains=exclude_domains,
+            language=language,
+            engines=engines,
+            safesearch=safesearch,
+            search_depth=search_depth,
+            categories=categories,
+            include_answer=include_answer,
+            include_images=include_images,
+            llm_provider=llm_provider,
+            llm_model=llm_model,
+            answer_max_tokens=answer_max_tokens,
+            answer_temperature=answer_temperature,
+            answer_context_size=answer_context_size,
+            timeout=timeout,
+            api_key=api_key,
+            **kwargs
+        )
         
         try:
             # Send POST request to Perplexica
@@ -243,16 +322,9 @@ class AsyncPerplexicaClient:
             # Raise exception for error status codes
             response.raise_for_status()
             
-            # Parse and return JSON response
-            result = response.json()
-            
-            # Ensure the response has the expected structure
-            if "results" not in result:
-                result["results"] = []
-            if "query" not in result:
-                result["query"] = query
-                
-            return result
+            # Parse and return JSON response (fast decoder; raw_content makes these large)
+            # and ensure the response has the expected structure
+            return decode_search_response(response.content, query)
             
         except httpx.TimeoutException as e:
             # Handle timeout errors gracefully
@@ -268,6 +340,8 @@ class AsyncPerplexicaClient:
                 "query": query,
                 "results": [],
                 "error": f"HTTP error {e.response.status_code}: {e.response.text}",
+                "status_code": e.response.status_code,
+                "retry_after": e.response.headers.get("Retry-After"),
                 "response_time": 0.0
             }
         except Exception as e:
@@ -279,17 +353,88 @@ class AsyncPerplexicaClient:
                 "response_time": 0.0
             }
     
+    def supports_batch(self) -> bool:
+        """Return False once the server turned out to have no batch endpoint."""
+        return not self._batch_unsupported.get(self.base_url)
+    
+    async def search_batch(
+        self,
+        queries: List[str],
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several queries sharing the same parameters in one request.
+        
+        Posts to ``{base_url}/batch`` so the server can fan the queries out
+        without a round-trip per query. Servers without the batch endpoint
+        (404/405) are remembered and served with concurrent single searches.
+        
+        Args:
+            queries: Search query strings
+            **kwargs: Any parameter accepted by ``search`` (applied to every query)
+            
+        Returns:
+            One Tavily-compatible response dict per query, in input order;
+            failures are reported per query in the same shape as ``search``
+        """
+        if not queries:
+            return []
+        if len(queries) == 1 or self._batch_unsupported.get(self.base_url):
+            return list(await asyncio.gather(*(self.search(query, **kwargs) for query in queries)))
+        
+        payload = self._build_payload(queries[0], **kwargs)
+        payload.pop("query", None)
+        payload["queries"] = list(queries)
+        
+        try:
+            response = await self.client.post(
+                f"{self.base_url}/batch",
+                json=payload,
+                headers={"Content-Type": "application/json"}
+            )
+            if response.status_code in (404, 405):
+                # 批量接口不存在 - 记住并回退到单条查询
+                self._batch_unsupported[self.base_url] = True
+                return list(await asyncio.gather(*(self.search(query, **kwargs) for query in queries)))
+            response.raise_for_status()
+            responses = fast_json.loads(response.content).get("responses", [])
+        except httpx.TimeoutException as e:
+            error = {"error": f"Request timeout: {str(e)}", "response_time": 300.0}
+            return [{"query": query, "results": [], **error} for query in queries]
+        except httpx.HTTPStatusError as e:
+            error = {
+                "error": f"HTTP error {e.response.status_code}: {e.response.text}",
+                "status_code": e.response.status_code,
+                "retry_after": e.response.headers.get("Retry-After"),
+                "response_time": 0.0
+            }
+            return [{"query": query, "results": [], **error} for query in queries]
+        except Exception as e:
+            error = {"error": f"Unexpected error: {str(e)}", "response_time": 0.0}
+            return [{"query": query, "results": [], **error} for query in queries]
+        
+        results = []
+        for i, query in enumerate(queries):
+            result = responses[i] if i < len(responses) else {
+                "error": "Missing response in batch", "response_time": 0.0
+            }
+            result.setdefault("results", [])
+            result.setdefault("query", query)
+            results.append(result)
+        return results
+    
     async def __aenter__(self):
         """Context manager entry."""
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - close HTTP client."""
-        await self.client.aclose()
+        await self.close()
     
     async def close(self):
-        """Explicitly close the HTTP client."""
-        await self.client.aclose()
+        """Explicitly close the HTTP client (shared clients are left open)."""
+        if self._owns_client:
+            await self.client.aclose()
 
 
 # Convenience function for backward compatibility
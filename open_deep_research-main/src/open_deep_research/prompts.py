@@ -387,5 +387,52 @@ Example 2 (for a scientific article):
 
 Remember, your goal is to create a summary that can be easily understood and utilized by a downstream research agent while preserving the most critical information from the original webpage.
 
+Today's date is {date}.
+"""
+
+summarize_webpages_packed_prompt = """You are tasked with summarizing the raw content of several webpages retrieved from a web search. Each webpage is summarized on its own; your goal is to create, for every webpage, a summary that preserves the most important information from that page. These summaries will be used by a downstream research agent, so it's crucial to maintain the key details without losing essential information.
+
+Here are the webpages, each wrapped in a <webpage> tag with its id:
+
+{webpages}
+
+Please follow these guidelines for each summary:
+
+1. Identify and preserve the main topic or purpose of the webpage.
+2. Retain key facts, statistics, and data points that are central to the content's message.
+3. Keep important quotes from credible sources or experts.
+4. Maintain the chronological order of events if the content is time-sensitive or historical.
+5. Preserve any lists or step-by-step instructions if present.
+6. Include relevant dates, names, and locations that are crucial to understanding the content.
+7. Summarize lengthy explanations while keeping the core message intact.
+
+When handling different types of content:
+
+- For news articles: Focus on the who, what, when, where, why, and how.
+- For scientific content: Preserve methodology, results, and conclusions.
+- For opinion pieces: Maintain the main arguments and supporting points.
+- For product pages: Keep key features, specifications, and unique selling points.
+
+Each summary should be significantly shorter than its webpage but comprehensive enough to stand alone as a source of information. Aim for about 25-30 percent of the original length, unless the content is already concise.
+
+Never mix information from different webpages into one summary. Return exactly one entry per webpage, in the following format:
+
+```
+{{
+   "summaries": [
+      {{
+         "source_id": 1,
+         "summary": "Summary of webpage 1, structured with appropriate paragraphs or bullet points as needed",
+         "key_excerpts": "First important quote or excerpt from webpage 1, Second important quote or excerpt, ...Add more excerpts as needed, up to a maximum of 5"
+      }},
+      {{
+         "source_id": 2,
+         "summary": "Summary of webpage 2",
+         "key_excerpts": "Important quotes or excerpts from webpage 2"
+      }}
+   ]
+}}
+```
+
 Today's date is {date}.
 """
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""Process-wide token-bucket rate limiting for the search backends."""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+
+class TokenBucketRateLimiter:
+    """Token bucket with burst capacity and jittered spacing between requests.
+
+    The bucket is implemented as a generic cell rate algorithm: every call to
+    ``acquire`` reserves the next free slot and sleeps until it is due, so
+    waiters are served in arrival order without polling. The limiter only
+    holds a ``threading.Lock`` for the reservation itself, which makes a single
+    instance safe to share across researchers running on different event loops.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0):
+        """Initialize the rate limiter.
+
+        Args:
+            rate: Sustained requests per second (``<= 0`` disables limiting)
+            burst: Number of requests allowed back-to-back before spacing applies
+            jitter: Maximum random deviation (seconds) added to or subtracted from
+                the spacing of each request, to avoid a perfectly regular pattern
+        """
+        self.rate = rate
+        self.burst = max(1, int(burst))
+        self.jitter = max(0.0, jitter)
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._theoretical_arrival = 0.0
+        self._lock = threading.Lock()
+        self._acquired = 0
+        self._total_wait = 0.0
+
+    def _reserve(self) -> float:
+        """Reserve the next slot and return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._theoretical_arrival, now)
+            burst_tolerance = (self.burst - 1) * self._interval
+            wait = max(0.0, tat - burst_tolerance - now)
+
+            spacing = self._interval
+            if self.jitter:
+                spacing = max(0.0, spacing + random.uniform(-self.jitter, self.jitter))
+            self._theoretical_arrival = tat + spacing
+
+            self._acquired += 1
+            self._total_wait += wait
+            return wait
+
+    async def acquire(self) -> float:
+        """Wait until a request is allowed under the configured rate.
+
+        Returns:
+            Number of seconds the caller was delayed
+        """
+        if self._interval <= 0:
+            return 0.0
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, float]:
+        """Return counters describing how much the limiter has throttled."""
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "acquired": self._acquired,
+                "total_wait": round(self._total_wait, 3),
+            }
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def _limiter_from_env(backend: str) -> TokenBucketRateLimiter:
+    """Build a limiter for ``backend`` from environment variables.
+
+    Per-backend variables (e.g. ``PERPLEXICA_RATE_LIMIT_RPS``) take precedence
+    over the global ``SEARCH_RATE_LIMIT_*`` ones. When no explicit rate is set,
+    the rate is derived from ``SEARCH_REQUEST_DELAY`` (one request per delay).
+    The burst defaults to 2, matching the shipped ConfigMap; set
+    ``SEARCH_RATE_LIMIT_BURST=1`` for strict spacing between requests.
+    """
+    prefix = backend.upper()
+    rate = _env_float(f"{prefix}_RATE_LIMIT_RPS", _env_float("SEARCH_RATE_LIMIT_RPS", None))
+    if rate is None:
+        delay = _env_float("SEARCH_REQUEST_DELAY", 5.0)
+        rate = 1.0 / delay if delay > 0 else 0.0
+    burst = _env_float(f"{prefix}_RATE_LIMIT_BURST", _env_float("SEARCH_RATE_LIMIT_BURST", 2))
+    jitter = _env_float("SEARCH_REQUEST_DELAY_RANDOM", 0.0)
+    return TokenBucketRateLimiter(rate=rate, burst=int(burst), jitter=jitter)
+
+
+_rate_limiters: Dict[str, TokenBucketRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(backend: str) -> TokenBucketRateLimiter:
+    """Return the process-wide rate limiter for a search backend.
+
+    There is one bucket per backend for the whole process, so every
+    researcher's queries to that backend are serialized through it: with the
+    default 5 s ``SEARCH_REQUEST_DELAY`` the process as a whole issues about
+    one request every 5 s after the burst, however many researchers run.
+
+    Args:
+        backend: Backend name ("searcrawl", "perplexica" or "tavily")
+
+    Returns:
+        The shared TokenBucketRateLimiter for that backend
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(backend)
+        if limiter is None:
+            limiter = _limiter_from_env(backend)
+            _rate_limiters[backend] = limiter
+        return limiter
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, float]]:
+    """Return throttling stats for every backend limiter created in this process."""
+    with _rate_limiters_lock:
+        limiters = dict(_rate_limiters)
+    return {backend: limiter.stats() for backend, limiter in limiters.items()}
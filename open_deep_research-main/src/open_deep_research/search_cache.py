@@ -0,0 +1,132 @@
+"""Persistent cache for search backend responses."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Optional
+
+from open_deep_research.cache_store import SQLiteCacheStore, get_cache_path
+
+# Parameters that change what a backend returns for a query. Anything else
+# (timeouts, api keys, ...) is ignored when building the cache key.
+CACHE_KEY_PARAMS = (
+    "max_results",
+    "include_raw_content",
+    "topic",
+    "language",
+    "time_range",
+    "days",
+    "date_from",
+    "date_to",
+    "include_domains",
+    "exclude_domains",
+    "engines",
+    "categories",
+    "safesearch",
+    "search_depth",
+    "include_answer",
+    "include_images",
+)
+
+# Default TTLs in seconds: news and finance go stale quickly, general results don't
+DEFAULT_TOPIC_TTLS = {
+    "news": 15 * 60,
+    "finance": 15 * 60,
+    "general": 24 * 60 * 60,
+}
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry.
+
+    Applies Unicode NFKC folding, lowercasing, whitespace collapsing and strips
+    surrounding quotes/punctuation that search engines ignore anyway.
+    """
+    query = unicodedata.normalize("NFKC", query).casefold()
+    query = re.sub(r"\s+", " ", query)
+    return query.strip(" \t\"'`.,;:!?")
+
+
+def _normalize_param(value: Any) -> Any:
+    if isinstance(value, (list, tuple, set)):
+        return sorted(str(item).strip().lower() for item in value)
+    return value
+
+
+def make_search_cache_key(backend: str, query: str, params: Dict[str, Any]) -> str:
+    """Build a stable cache key from the backend, normalized query and effective params."""
+    effective = {
+        name: _normalize_param(params[name])
+        for name in CACHE_KEY_PARAMS
+        if params.get(name) not in (None, [], "")
+    }
+    payload = json.dumps(
+        {"backend": backend, "query": normalize_query(query), "params": effective},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """Search response cache with per-topic TTLs on top of SQLiteCacheStore."""
+
+    def __init__(self, store: SQLiteCacheStore, topic_ttls: Optional[Dict[str, float]] = None):
+        """Initialize the cache.
+
+        Args:
+            store: Backing key/value store
+            topic_ttls: TTL in seconds per search topic (unknown topics use "general")
+        """
+        self.store = store
+        self.topic_ttls = {**DEFAULT_TOPIC_TTLS, **(topic_ttls or {})}
+
+    async def get(self, backend: str, query: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return a cached response for this search, re-labelled with the caller's query."""
+        cached = await self.store.aget(make_search_cache_key(backend, query, params))
+        if cached is None:
+            return None
+        return {**cached, "query": query, "cached": True}
+
+    async def put(self, backend: str, query: str, params: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """Cache a backend response; failed or empty responses are not cached."""
+        if response.get("error") or not response.get("results"):
+            return
+        topic = params.get("topic") or "general"
+        ttl = self.topic_ttls.get(topic, self.topic_ttls["general"])
+        await self.store.aset(make_search_cache_key(backend, query, params), response, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters of the underlying store."""
+        return self.store.stats()
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Return the process-wide search cache, or None when disabled.
+
+    Controlled by SEARCH_CACHE_ENABLED (default true), SEARCH_CACHE_PATH,
+    SEARCH_CACHE_MAX_ENTRIES and SEARCH_CACHE_TTL_<TOPIC> (seconds).
+    """
+    global _search_cache
+    if os.getenv("SEARCH_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            topic_ttls = {
+                topic: float(os.getenv(f"SEARCH_CACHE_TTL_{topic.upper()}", default))
+                for topic, default in DEFAULT_TOPIC_TTLS.items()
+            }
+            store = SQLiteCacheStore(
+                path=os.getenv("SEARCH_CACHE_PATH") or get_cache_path("search_cache.sqlite"),
+                table="search_results",
+                max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "20000")),
+            )
+            _search_cache = SearchCache(store, topic_ttls)
+        return _search_cache
@@ -4,9 +4,31 @@ Custom SearCrawl Client - Tavily API Compatible
 This client provides a drop-in replacement for AsyncTavilyClient/AsyncPerplexicaClient,
 allowing Open Deep Research to use SearCrawl as the search+crawling backend.
 """
+import asyncio
+import json
 import os
 import httpx
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+
+from open_deep_research import fast_json
+from open_deep_research.fast_json import decode_search_response
+
+
+class SearCrawlStreamError(httpx.HTTPError):
+    """A streamed search failed with an error response from SearCrawl."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[str] = None):
+        """
+        Initialize the error.
+        
+        Args:
+            message: Error description
+            status_code: HTTP status of the failed response, if any
+            retry_after: Retry-After header of the failed response, if any
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
 
 
 class AsyncSearCrawlClient:
@@ -17,10 +39,26 @@ class AsyncSearCrawlClient:
     the need for separate Jina Reader or Crawl4AI integration.
     """
     
+    # Default timeout/pool settings (3 minutes for search + crawling)
+    TIMEOUT = httpx.Timeout(
+        connect=10.0,
+        read=180.0,     # 3 minutes for search + crawling
+        write=10.0,
+        pool=10.0
+    )
+    LIMITS = httpx.Limits(
+        max_keepalive_connections=20,
+        max_connections=100
+    )
+    
+    # Base URLs whose server has no /search/batch endpoint
+    _batch_unsupported: Dict[str, bool] = {}
+    
     def __init__(
         self, 
         api_key: Optional[str] = None,
-        base_url: Optional[str] = None
+        base_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         """
         Initialize the SearCrawl client.
@@ -28,6 +66,8 @@ class AsyncSearCrawlClient:
         Args:
             api_key: API key (optional, currently not used by SearCrawl)
             base_url: Base URL for SearCrawl API (defaults to env var or service URL)
+            http_client: Shared HTTP client to use instead of creating a private one
+                (e.g. from http_pool.get_shared_http_client); it is not closed by this client
         """
         self.api_key = api_key
         
@@ -40,18 +80,11 @@ class AsyncSearCrawlClient:
                 "http://searcrawl-service:3000"
             ).rstrip('/')
         
-        # Create HTTP client with generous timeout for content fetching + crawling
-        self.client = httpx.AsyncClient(
-            timeout=httpx.Timeout(
-                connect=10.0,
-                read=180.0,      # 3 minutes for search + crawling
-                write=10.0,
-                pool=10.0
-            ),
-            limits=httpx.Limits(
-                max_keepalive_connections=20,
-                max_connections=100
-            )
+        # Reuse the shared client when given, otherwise create a private one
+        self._owns_client = http_client is None
+        self.client = http_client or httpx.AsyncClient(
+            timeout=self.TIMEOUT,
+            limits=self.LIMITS
         )
     
     async def search(
@@ -145,14 +178,10 @@ class AsyncSearCrawlClient:
             # Raise exception for error status codes
             response.raise_for_status()
             
-            # Parse JSON response
-            result = response.json()
+            # Parse JSON response (fast decoder; raw_content makes these large)
+            result = decode_search_response(response.content, query)
             
             # Ensure Tavily-compatible structure
-            if "results" not in result:
-                result["results"] = []
-            if "query" not in result:
-                result["query"] = query
             if "answer" not in result:
                 result["answer"] = None
             if "images" not in result:
@@ -182,6 +211,8 @@ class AsyncSearCrawlClient:
                 "images": [],
                 "follow_up_questions": None,
                 "error": f"HTTP error {e.response.status_code}: {e.response.text}",
+                "status_code": e.response.status_code,
+                "retry_after": e.response.headers.get("Retry-After"),
                 "response_time": 0.0
             }
         except Exception as e:
@@ -196,17 +227,217 @@ class AsyncSearCrawlClient:
                 "response_time": 0.0
             }
     
+    def supports_batch(self) -> bool:
+        """Return False once the server turned out to have no batch endpoint."""
+        return not self._batch_unsupported.get(self.base_url)
+    
+    async def search_batch(
+        self,
+        queries: List[str],
+        max_results: int = 5,
+        include_raw_content: bool = False,
+        topic: Literal["general", "news", "finance"] = "general",
+        timeout: Optional[int] = None,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several queries sharing the same parameters in one request.
+        
+        Posts ``{"queries": [...]}`` to ``/search/batch``. Servers without the
+        batch endpoint (404/405) are remembered and served with concurrent
+        single searches instead.
+        
+        Args:
+            queries: Search query strings
+            max_results: Maximum number of results per query (default: 5)
+            include_raw_content: Whether to include full webpage content
+            topic: Topic category - "general", "news", or "finance"
+            timeout: Per-query crawl timeout passed to SearCrawl
+            **kwargs: Accepted for compatibility with ``search``
+            
+        Returns:
+            One Tavily-compatible response dict per query, in input order;
+            failures are reported per query in the same shape as ``search``
+        """
+        search_kwargs = dict(
+            max_results=max_results,
+            include_raw_content=include_raw_content,
+            topic=topic,
+            timeout=timeout,
+            **kwargs
+        )
+        if not queries:
+            return []
+        if len(queries) == 1 or self._batch_unsupported.get(self.base_url):
+            return list(await asyncio.gather(*(self.search(query, **search_kwargs) for query in queries)))
+        
+        payload = {
+            "queries": list(queries),
+            "limit": max_results,
+            "include_raw_content": include_raw_content,
+            "topic": topic,
+        }
+        if timeout:
+            payload["timeout"] = timeout
+        
+        empty = {"results": [], "answer": None, "images": [], "follow_up_questions": None}
+        try:
+            response = await self.client.post(
+                f"{self.base_url}/search/batch",
+                json=payload,
+                headers={"Content-Type": "application/json"}
+            )
+            if response.status_code in (404, 405):
+                # 批量接口不存在 - 记住并回退到单条查询
+                self._batch_unsupported[self.base_url] = True
+                return list(await asyncio.gather(*(self.search(query, **search_kwargs) for query in queries)))
+            response.raise_for_status()
+            responses = fast_json.loads(response.content).get("responses", [])
+        except httpx.TimeoutException as e:
+            error = {"error": f"Request timeout: {str(e)}", "response_time": 180.0}
+            return [{"query": query, **empty, **error} for query in queries]
+        except httpx.HTTPStatusError as e:
+            error = {
+                "error": f"HTTP error {e.response.status_code}: {e.response.text}",
+                "status_code": e.response.status_code,
+                "retry_after": e.response.headers.get("Retry-After"),
+                "response_time": 0.0
+            }
+            return [{"query": query, **empty, **error} for query in queries]
+        except Exception as e:
+            error = {"error": f"Unexpected error: {str(e)}", "response_time": 0.0}
+            return [{"query": query, **empty, **error} for query in queries]
+        
+        results = []
+        for i, query in enumerate(queries):
+            result = responses[i] if i < len(responses) else {
+                "error": "Missing response in batch", "response_time": 0.0
+            }
+            for key, default in empty.items():
+                result.setdefault(key, default)
+            result.setdefault("query", query)
+            results.append(result)
+        return results
+    
+    async def search_stream(
+        self,
+        query: str,
+        max_results: int = 5,
+        include_raw_content: bool = True,
+        topic: Literal["general", "news", "finance"] = "general",
+        timeout: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream search+crawl results one page at a time as SearCrawl finishes them.
+        
+        Sends the same request as ``search`` with ``"stream": true`` and accepts
+        either NDJSON (one result object per line) or Server-Sent Events
+        (one result object per ``data:`` line). Objects without a ``url`` (progress
+        or completion events) are skipped.
+        
+        If the server answers with a plain JSON document (no streaming support) or
+        rejects the streaming request with a 4xx, this falls back to the batch
+        response and yields its results in order.
+        
+        Args:
+            query: Search query string
+            max_results: Maximum number of results to return (default: 5)
+            include_raw_content: Whether to include full webpage content (default: True)
+            topic: Topic category - "general", "news", or "finance" (default: "general")
+            timeout: Optional server-side timeout in seconds
+            
+        Yields:
+            Result dicts in the same format as ``search()["results"]``
+            
+        Raises:
+            SearCrawlStreamError: The server answered 408, 429 or 5xx, or the
+                batch fallback failed; carries the status and any Retry-After
+            httpx.HTTPError: The connection failed or the stream broke off,
+                possibly after some results were already yielded
+        """
+        payload = {
+            "query": query,
+            "limit": max_results,
+            "include_raw_content": include_raw_content,
+            "topic": topic,
+            "stream": True,
+        }
+        if timeout:
+            payload["timeout"] = timeout
+        
+        async with self.client.stream(
+            "POST",
+            f"{self.base_url}/search",
+            json=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/x-ndjson, text/event-stream;q=0.9, application/json;q=0.5",
+            },
+        ) as response:
+            if response.status_code in (408, 429) or response.status_code >= 500:
+                # 服务过载或故障 - 交给调用方的熔断器处理 (含 Retry-After)，不立即重发
+                raise SearCrawlStreamError(
+                    f"HTTP error {response.status_code}",
+                    status_code=response.status_code,
+                    retry_after=response.headers.get("Retry-After"),
+                )
+            
+            content_type = response.headers.get("content-type", "")
+            streaming = "ndjson" in content_type or "event-stream" in content_type
+            
+            if response.status_code < 400 and streaming:
+                async for line in response.aiter_lines():
+                    line = line.strip()
+                    if line.startswith("data:"):
+                        line = line[len("data:"):].strip()
+                    if not line or line.startswith((":", "event:", "id:")):
+                        continue
+                    try:
+                        event = fast_json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    result = event.get("result", event) if isinstance(event, dict) else None
+                    if isinstance(result, dict) and result.get("url"):
+                        yield result
+                return
+            
+            if response.status_code < 400:
+                # Server ignored "stream": read the batch document it sent instead
+                body = fast_json.loads(await response.aread())
+                for result in body.get("results", []):
+                    yield result
+                return
+        
+        # Streaming request rejected (4xx): use the batch endpoint
+        batch = await self.search(
+            query,
+            max_results=max_results,
+            include_raw_content=include_raw_content,
+            topic=topic,
+            timeout=timeout,
+            **kwargs
+        )
+        if batch.get("error"):
+            # 批量回退也失败 - 抛出错误，让调用方的熔断器和故障转移看到
+            raise SearCrawlStreamError(
+                batch["error"], status_code=batch.get("status_code"), retry_after=batch.get("retry_after")
+            )
+        for result in batch.get("results", []):
+            yield result
+    
     async def __aenter__(self):
         """Context manager entry."""
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - close HTTP client."""
-        await self.client.aclose()
+        await self.close()
     
     async def close(self):
-        """Explicitly close the HTTP client."""
-        await self.client.aclose()
+        """Explicitly close the HTTP client (shared clients are left open)."""
+        if self._owns_client:
+            await self.client.aclose()
 
 
 # Convenience function for backward compatibility
@@ -0,0 +1,83 @@
+"""Single-flight coalescing of identical concurrent async calls."""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight call among every concurrent caller with the same key.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it runs await the same task instead of starting their own. Waiters
+    are shielded from each other, so cancelling one caller (e.g. a tool
+    timeout) never cancels the work the others are waiting on.
+    """
+
+    def __init__(self, name: str):
+        """Initialize an empty group.
+
+        Args:
+            name: Group name used in stats
+        """
+        self.name = name
+        # Tasks are bound to their event loop, so keys are scoped per loop
+        self._calls: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` once per key among concurrent callers and return its result.
+
+        Args:
+            key: Identity of the call; callers with equal keys share one execution
+            fn: Zero-argument coroutine factory performing the work
+
+        Returns:
+            The (shared) result of ``fn``; exceptions propagate to every waiter
+        """
+        loop = asyncio.get_running_loop()
+        scoped_key = (loop, key)
+        self.calls += 1
+        task = self._calls.get(scoped_key)
+        if task is None:
+            task = loop.create_task(fn())
+            self._calls[scoped_key] = task
+            task.add_done_callback(lambda _: self._calls.pop(scoped_key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Return the number of distinct calls currently running."""
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call and coalescing counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight(),
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Return the process-wide single-flight group called ``name``."""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+def single_flight_stats() -> Dict[str, Dict[str, Any]]:
+    """Return stats for every single-flight group created in this process."""
+    with _groups_lock:
+        groups = dict(_groups)
+    return {name: group.stats() for name, group in groups.items()}
@@ -27,6 +27,16 @@ class Summary(BaseModel):
     summary: str
     key_excerpts: str
 
+class SourceSummary(Summary):
+    """Summary of one webpage in a packed summarization call."""
+    
+    source_id: int = Field(description="The id of the webpage this summary is for, from its <webpage id=...> tag")
+
+class PackedSummaries(BaseModel):
+    """Summaries of several webpages, one per source id."""
+    
+    summaries: list[SourceSummary]
+
 class ClarifyWithUser(BaseModel):
     """Model for user clarification requests."""
     
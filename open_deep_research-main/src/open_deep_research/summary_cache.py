@@ -0,0 +1,202 @@
+"""Persistent cache of webpage summaries keyed by content, model and prompt version."""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from open_deep_research.cache_store import SQLiteCacheStore, get_cache_path
+from open_deep_research.prompts import (
+    summarize_webpage_prompt,
+    summarize_webpages_packed_prompt,
+)
+from open_deep_research.singleflight import get_single_flight
+from open_deep_research.token_counter import count_tokens
+
+# Changes whenever the summarization prompt template is edited, invalidating old summaries
+SUMMARY_PROMPT_VERSION = hashlib.sha256(summarize_webpage_prompt.encode("utf-8")).hexdigest()[:12]
+# Same for summaries made several pages at a time with the packed prompt
+PACKED_SUMMARY_PROMPT_VERSION = hashlib.sha256(summarize_webpages_packed_prompt.encode("utf-8")).hexdigest()[:12]
+
+
+@lru_cache(maxsize=1)
+def _prompt_tokens() -> int:
+    return count_tokens(summarize_webpage_prompt)
+
+
+def make_summary_cache_key(content: str, model: str, prompt_version: str = SUMMARY_PROMPT_VERSION) -> str:
+    """Build the cache key of a summary from the page content, model name and prompt version."""
+    content_hash = hashlib.sha256(content.encode("utf-8", errors="replace")).hexdigest()
+    return f"{content_hash}:{model}:{prompt_version}"
+
+
+class _Savings:
+    """LLM calls, tokens and latency saved by cache hits."""
+
+    def __init__(self):
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.tokens_saved = 0
+        self.seconds_saved = 0.0
+
+    def add(self, entry: Dict[str, Any], coalesced: bool = False) -> None:
+        if coalesced:
+            self.coalesced += 1
+        else:
+            self.hits += 1
+        self.tokens_saved += entry.get("input_tokens", 0) + entry.get("output_tokens", 0)
+        self.seconds_saved += entry.get("seconds", 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "seconds_saved": round(self.seconds_saved, 1),
+        }
+
+
+class SummaryCache:
+    """Summaries of page content shared across runs.
+
+    Entries are keyed by (content hash, summarization model, prompt version),
+    so a changed page, model or prompt never serves a stale summary.
+    Concurrent requests for the same key share one LLM call. Each entry keeps
+    the tokens and latency of the call that produced it, which hits report
+    as savings, overall and per research run.
+    """
+
+    def __init__(self, store: SQLiteCacheStore, ttl: float = 30 * 24 * 3600, max_runs: int = 64):
+        """Initialize the cache.
+
+        Args:
+            store: Backing key/value store
+            ttl: Seconds a summary is kept
+            max_runs: Research runs whose savings are tracked individually
+        """
+        self.store = store
+        self.ttl = ttl
+        self.max_runs = max_runs
+        self.total = _Savings()
+        self._runs: OrderedDict[str, _Savings] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _run_savings(self, run_key: Optional[str]) -> Optional[_Savings]:
+        if run_key is None:
+            return None
+        with self._lock:
+            savings = self._runs.get(run_key)
+            if savings is None:
+                savings = self._runs[run_key] = _Savings()
+                while len(self._runs) > self.max_runs:
+                    self._runs.popitem(last=False)
+            else:
+                self._runs.move_to_end(run_key)
+            return savings
+
+    async def get_or_create(
+        self,
+        content: str,
+        model: str,
+        create: Callable[[], Awaitable[Dict[str, str]]],
+        run_key: Optional[str] = None,
+        prompt_version: str = SUMMARY_PROMPT_VERSION,
+    ) -> Dict[str, str]:
+        """Return the cached summary of ``content`` or create (and cache) it.
+
+        Args:
+            content: Page content to summarize
+            model: Summarization model name
+            create: Coroutine factory making the LLM call; returns a dict with
+                ``summary`` and ``key_excerpts`` and raises on failure
+            run_key: Research run to attribute savings to
+            prompt_version: Version of the prompt ``create`` uses
+                (``PACKED_SUMMARY_PROMPT_VERSION`` for packed calls)
+
+        Returns:
+            Dict with ``summary`` and ``key_excerpts``
+        """
+        key = make_summary_cache_key(content, model, prompt_version)
+        run = self._run_savings(run_key)
+        cached = await self.store.aget(key)
+        if cached is not None:
+            for savings in (self.total, run):
+                if savings:
+                    savings.add(cached)
+            return {"summary": cached["summary"], "key_excerpts": cached["key_excerpts"]}
+
+        created = False
+
+        async def summarize_and_store() -> Dict[str, Any]:
+            nonlocal created
+            created = True
+            start = time.monotonic()
+            summary = await create()
+            entry = {
+                "summary": summary["summary"],
+                "key_excerpts": summary["key_excerpts"],
+                "model": model,
+                "input_tokens": _prompt_tokens() + count_tokens(content),
+                "output_tokens": count_tokens(summary["summary"]) + count_tokens(summary["key_excerpts"]),
+                "seconds": round(time.monotonic() - start, 2),
+            }
+            await self.store.aset(key, entry, self.ttl)
+            return entry
+
+        entry = await get_single_flight("summary").do(key, summarize_and_store)
+        for savings in (self.total, run):
+            if savings:
+                if created:
+                    savings.misses += 1
+                else:
+                    savings.add(entry, coalesced=True)
+        return {"summary": entry["summary"], "key_excerpts": entry["key_excerpts"]}
+
+    def run_stats(self, run_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the savings of one research run, if tracked."""
+        with self._lock:
+            savings = self._runs.get(run_key) if run_key else None
+        return savings.stats() if savings else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return overall savings, per-run savings and store counters."""
+        with self._lock:
+            runs = {run_key: savings.stats() for run_key, savings in self._runs.items()}
+        return {
+            "prompt_version": SUMMARY_PROMPT_VERSION,
+            "packed_prompt_version": PACKED_SUMMARY_PROMPT_VERSION,
+            **self.total.stats(),
+            "runs": runs,
+            "store": self.store.stats(),
+        }
+
+
+_summary_cache: Optional[SummaryCache] = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    """Return the process-wide summary cache, or None when disabled.
+
+    Controlled by SUMMARY_CACHE_ENABLED (default true), SUMMARY_CACHE_PATH,
+    SUMMARY_CACHE_TTL (seconds, default 30 days) and SUMMARY_CACHE_MAX_ENTRIES.
+    """
+    global _summary_cache
+    if os.getenv("SUMMARY_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            store = SQLiteCacheStore(
+                path=os.getenv("SUMMARY_CACHE_PATH") or get_cache_path("summary_cache.sqlite"),
+                table="summaries",
+                max_entries=int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "50000")),
+            )
+            _summary_cache = SummaryCache(store, ttl=float(os.getenv("SUMMARY_CACHE_TTL", str(30 * 24 * 3600))))
+        return _summary_cache
@@ -0,0 +1,187 @@
+"""Packing of several small webpages into one structured summarization call."""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import HumanMessage
+
+from open_deep_research.prompts import summarize_webpages_packed_prompt
+from open_deep_research.token_counter import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_totals = {"batches": 0, "packed_pages": 0, "single_pages": 0, "fallbacks": 0, "failed_batches": 0}
+_totals_lock = threading.Lock()
+
+
+def _count(**increments: int) -> None:
+    with _totals_lock:
+        for name, value in increments.items():
+            _totals[name] += value
+
+
+class SummaryPacker:
+    """Summarize small pages together, one structured LLM call per bin of pages.
+
+    Pages submitted within ``window`` seconds are binned until the bin reaches
+    ``token_budget`` tokens or ``max_pages`` pages, then summarized in one
+    call returning a ``PackedSummaries`` list keyed by source id. Each call
+    shares the instructions of the prompt across its pages and pays one
+    request latency and one rate-limit slot. A page whose summary is missing
+    or whose batch fails falls back to the single-page call; so does a bin
+    that ends up holding a single page.
+    """
+
+    def __init__(
+        self,
+        model: BaseChatModel,
+        date: str,
+        token_budget: int,
+        window: float = 0.3,
+        max_pages: int = 8,
+        timeout: float = 90.0,
+        slots: Optional[asyncio.Semaphore] = None,
+    ):
+        """Initialize the packer.
+
+        Args:
+            model: Chat model with ``PackedSummaries`` structured output
+            date: Today's date, for the prompt
+            token_budget: Maximum page tokens per call
+            window: Seconds a bin waits for more pages after its first one
+            max_pages: Maximum pages per call
+            timeout: Seconds allowed per packed call
+            slots: Semaphore bounding concurrent summarization calls; a packed
+                call, or a fallback call, holds one slot
+        """
+        self.model = model
+        self.date = date
+        self.token_budget = token_budget
+        self.window = window
+        self.max_pages = max(1, max_pages)
+        self.timeout = timeout
+        self.slots = slots
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._pending_tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def summarize(
+        self, content: str, fallback: Callable[[], Awaitable[Dict[str, str]]]
+    ) -> Dict[str, str]:
+        """Summarize ``content`` in the next packed call.
+
+        Args:
+            content: Page content
+            fallback: Single-page summarization, used when packing fails
+
+        Returns:
+            Dict with ``summary`` and ``key_excerpts``
+        """
+        loop = asyncio.get_running_loop()
+        tokens = count_tokens(content)
+        if self._pending and self._pending_tokens + tokens > self.token_budget:
+            self._flush()
+        future = loop.create_future()
+        self._pending.append((content, future))
+        self._pending_tokens += tokens
+        if self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        if len(self._pending) >= self.max_pages or self._pending_tokens >= self.token_budget:
+            self._flush()
+        try:
+            summary = await future
+        except Exception as e:
+            _count(fallbacks=1)
+            logger.warning(f"Packed summarization failed for a page ({str(e)}), summarizing it on its own")
+            summary = None
+        if summary is not None:
+            return summary
+        if self.slots is None:
+            return await fallback()
+        async with self.slots:
+            return await fallback()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        if len(batch) == 1:
+            # Nothing to share the prompt with: use the single-page call
+            _count(single_pages=1)
+            if not batch[0][1].done():
+                batch[0][1].set_result(None)
+        elif batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        webpages = "\n\n".join(
+            f'<webpage id="{source_id}">\n{content}\n</webpage>'
+            for source_id, (content, _) in enumerate(batch, 1)
+        )
+        prompt = summarize_webpages_packed_prompt.format(webpages=webpages, date=self.date)
+        _count(batches=1, packed_pages=len(batch))
+        logger.info(f"📦 Summarizing {len(batch)} pages in one call")
+        try:
+            if self.slots is None:
+                result = await asyncio.wait_for(self.model.ainvoke([HumanMessage(content=prompt)]), self.timeout)
+            else:
+                async with self.slots:
+                    result = await asyncio.wait_for(
+                        self.model.ainvoke([HumanMessage(content=prompt)]), self.timeout
+                    )
+        except BaseException as e:
+            _count(failed_batches=1)
+            error = e if isinstance(e, Exception) else RuntimeError("packed summarization cancelled")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return
+        by_id = {summary.source_id: summary for summary in result.summaries}
+        for source_id, (_, future) in enumerate(batch, 1):
+            if future.done():
+                continue
+            summary = by_id.get(source_id)
+            if summary is None or not summary.summary.strip():
+                future.set_exception(ValueError(f"no summary for source id {source_id}"))
+            else:
+                future.set_result({"summary": summary.summary, "key_excerpts": summary.key_excerpts})
+
+
+def make_summary_packer(
+    model: BaseChatModel, date: str, token_budget: int, slots: Optional[asyncio.Semaphore] = None
+) -> SummaryPacker:
+    """Create a packer configured from the environment.
+
+    SUMMARY_PACK_WINDOW_MS (default 300) is how long a bin waits for more
+    pages, SUMMARY_PACK_MAX_PAGES (default 8) caps the pages per call and
+    SUMMARY_PACK_TIMEOUT (seconds, default 90) bounds each packed call.
+    """
+    return SummaryPacker(
+        model,
+        date,
+        token_budget,
+        window=float(os.getenv("SUMMARY_PACK_WINDOW_MS", "300")) / 1000,
+        max_pages=int(os.getenv("SUMMARY_PACK_MAX_PAGES", "8")),
+        timeout=float(os.getenv("SUMMARY_PACK_TIMEOUT", "90")),
+        slots=slots,
+    )
+
+
+def summary_packing_stats() -> Dict[str, Any]:
+    """Return packed summarization counters for this process."""
+    with _totals_lock:
+        totals = dict(_totals)
+    totals["avg_pages_per_batch"] = (
+        round(totals["packed_pages"] / totals["batches"], 2) if totals["batches"] else 0.0
+    )
+    return totals
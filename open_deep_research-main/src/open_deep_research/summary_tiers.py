@@ -0,0 +1,102 @@
+"""Size-aware routing of pages to verbatim pass-through, a fast summarizer or the main summarizer."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+VERBATIM = "verbatim"
+FAST = "fast"
+FULL = "full"
+TIERS = (VERBATIM, FAST, FULL)
+
+
+def choose_summary_tier(tokens: int, bypass_tokens: int, fast_tokens: int, has_fast_model: bool) -> str:
+    """Pick how a page of ``tokens`` tokens is summarized.
+
+    Args:
+        tokens: Tokens of the content that would be summarized
+        bypass_tokens: Pages up to this size are passed through verbatim,
+            since their summary would be about as long (0 disables)
+        fast_tokens: Pages up to this size go to the fast model
+        has_fast_model: Whether a fast summarization model is configured
+
+    Returns:
+        "verbatim", "fast" or "full"
+    """
+    if tokens <= bypass_tokens:
+        return VERBATIM
+    if has_fast_model and tokens <= fast_tokens:
+        return FAST
+    return FULL
+
+
+class _TierCounts:
+    def __init__(self):
+        self.counts = {tier: 0 for tier in TIERS}
+        self.tokens = {tier: 0 for tier in TIERS}
+
+    def add(self, tier: str, tokens: int) -> None:
+        self.counts[tier] += 1
+        self.tokens[tier] += tokens
+
+    def stats(self) -> Dict[str, Any]:
+        pages = sum(self.counts.values())
+        return {
+            "pages": pages,
+            **{tier: self.counts[tier] for tier in TIERS},
+            "bypass_rate": round(self.counts[VERBATIM] / pages, 3) if pages else 0.0,
+            "fast_rate": round(self.counts[FAST] / pages, 3) if pages else 0.0,
+            "tokens": dict(self.tokens),
+        }
+
+
+class SummaryTierStats:
+    """Pages routed to each summarization tier, overall and per research run."""
+
+    def __init__(self, max_runs: int = 64):
+        """Initialize the counters.
+
+        Args:
+            max_runs: Research runs whose routing is tracked individually
+        """
+        self.max_runs = max_runs
+        self.total = _TierCounts()
+        self._runs: OrderedDict[str, _TierCounts] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, tier: str, tokens: int, run_key: Optional[str] = None) -> None:
+        """Count one page of ``tokens`` tokens routed to ``tier``."""
+        with self._lock:
+            self.total.add(tier, tokens)
+            if run_key is None:
+                return
+            counts = self._runs.get(run_key)
+            if counts is None:
+                counts = self._runs[run_key] = _TierCounts()
+                while len(self._runs) > self.max_runs:
+                    self._runs.popitem(last=False)
+            else:
+                self._runs.move_to_end(run_key)
+            counts.add(tier, tokens)
+
+    def run_stats(self, run_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the tier counts of one research run, if tracked."""
+        with self._lock:
+            counts = self._runs.get(run_key) if run_key else None
+            return counts.stats() if counts else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return overall and per-run tier counts."""
+        with self._lock:
+            return {
+                **self.total.stats(),
+                "runs": {run_key: counts.stats() for run_key, counts in self._runs.items()},
+            }
+
+
+_tier_stats = SummaryTierStats()
+
+
+def get_summary_tier_stats() -> SummaryTierStats:
+    """Return the process-wide summarization tier counters."""
+    return _tier_stats
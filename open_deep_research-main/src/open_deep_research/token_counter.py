@@ -0,0 +1,42 @@
+"""Token counting for prompt budgeting, with tiktoken when available."""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Average characters per token of English prose, used without tiktoken
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Optional[Any]:
+    try:
+        import tiktoken
+    except ImportError:
+        logger.info("tiktoken not installed, estimating tokens from character counts")
+        return None
+    try:
+        return tiktoken.get_encoding(os.getenv("TOKEN_COUNT_ENCODING", "o200k_base"))
+    except Exception as e:
+        # Encodings are downloaded on first use; offline pods fall back to estimates
+        logger.warning(f"⚠️  tiktoken encoding unavailable ({e}), estimating tokens from character counts")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Return the number of tokens in ``text``.
+
+    Uses tiktoken's TOKEN_COUNT_ENCODING (default ``o200k_base``, the GPT-4o /
+    GPT-4.1 family); other model families tokenize slightly differently, so
+    treat the result as a close estimate for them. Without tiktoken, falls
+    back to ``len(text) / 4``.
+    """
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
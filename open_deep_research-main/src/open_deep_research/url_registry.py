@@ -0,0 +1,160 @@
+"""Run-scoped registry of crawled and summarized URLs, shared by every researcher in a run."""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from langchain_core.runnables import RunnableConfig
+
+T = TypeVar("T")
+
+
+class _Memo:
+    """Memoized async results per key: finished results are kept, in-flight ones are joined."""
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.joined = 0
+        self.misses = 0
+
+    async def get_or_run(self, key: Hashable, fn: Callable[[], Awaitable[Optional[T]]]) -> Optional[T]:
+        """Return the result for ``key``, running ``fn`` only if nobody has yet.
+
+        Failures (exceptions or a None result) are not remembered, so a later
+        caller retries the work.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            self.misses += 1
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._forget_failure(key, done))
+        elif task.done():
+            self.hits += 1
+        else:
+            self.joined += 1
+        return await asyncio.shield(task)
+
+    def _forget_failure(self, key: Hashable, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._tasks),
+            "hits": self.hits,
+            "joined": self.joined,
+            "misses": self.misses,
+        }
+
+
+class URLRegistry:
+    """Crawl results and summaries per URL for one research run.
+
+    Parallel researchers (and later iterations of the same researcher) often
+    find the same pages. The registry hands back the finished result, or
+    joins the in-flight crawl/summary, instead of repeating the work.
+    Summaries are keyed by URL and content digest, so a page summarized from
+    its search snippet is summarized again once its full content is crawled.
+    """
+
+    def __init__(self, run_key: str):
+        """Initialize an empty registry.
+
+        Args:
+            run_key: Identifier of the research run
+        """
+        self.run_key = run_key
+        self.crawls = _Memo()
+        self.summaries = _Memo()
+        self.last_used = time.monotonic()
+
+    async def crawl(self, url: str, fn: Callable[[], Awaitable[Optional[T]]]) -> Optional[T]:
+        """Return the crawl result for ``url``, running ``fn`` if it wasn't crawled in this run."""
+        self.last_used = time.monotonic()
+        return await self.crawls.get_or_run(url, fn)
+
+    async def summarize(self, url: str, content: str, fn: Callable[[], Awaitable[Optional[T]]]) -> Optional[T]:
+        """Return the summary of ``content`` from ``url``, running ``fn`` if it wasn't summarized in this run."""
+        self.last_used = time.monotonic()
+        digest = hashlib.sha1(content.encode("utf-8", errors="replace")).hexdigest()
+        return await self.summaries.get_or_run((url, digest), fn)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return crawl and summary reuse counters."""
+        return {
+            "run": self.run_key,
+            "crawls": self.crawls.stats(),
+            "summaries": self.summaries.stats(),
+        }
+
+
+def get_run_key(config: Optional[RunnableConfig]) -> Optional[str]:
+    """Return an identifier of the research run ``config`` belongs to, if any.
+
+    Uses the LangGraph server's run id, falling back to the thread id.
+    """
+    if not config:
+        return None
+    configurable = config.get("configurable") or {}
+    metadata = config.get("metadata") or {}
+    run_key = configurable.get("run_id") or metadata.get("run_id") or configurable.get("thread_id")
+    return str(run_key) if run_key else None
+
+
+# Registries hold asyncio tasks, so they are scoped per event loop as well as per run
+_registries: "OrderedDict[Tuple[asyncio.AbstractEventLoop, str], URLRegistry]" = OrderedDict()
+_registries_lock = threading.Lock()
+
+
+def get_url_registry(config: Optional[RunnableConfig]) -> Optional[URLRegistry]:
+    """Return the URL registry of the run ``config`` belongs to.
+
+    Returns None when URL_REGISTRY_ENABLED=false or the run can't be
+    identified. Registries idle for URL_REGISTRY_IDLE_TTL seconds (default
+    1800) are dropped, and at most URL_REGISTRY_MAX_RUNS (default 32) are kept.
+    """
+    if os.getenv("URL_REGISTRY_ENABLED", "true").lower() != "true":
+        return None
+    run_key = get_run_key(config)
+    if run_key is None:
+        return None
+    loop = asyncio.get_running_loop()
+    idle_ttl = float(os.getenv("URL_REGISTRY_IDLE_TTL", "1800"))
+    max_runs = int(os.getenv("URL_REGISTRY_MAX_RUNS", "32"))
+    now = time.monotonic()
+    with _registries_lock:
+        for key, registry in list(_registries.items()):
+            if key[0].is_closed() or now - registry.last_used > idle_ttl:
+                del _registries[key]
+        registry = _registries.get((loop, run_key))
+        if registry is None:
+            registry = _registries[(loop, run_key)] = URLRegistry(run_key)
+            while len(_registries) > max_runs:
+                _registries.popitem(last=False)
+        else:
+            _registries.move_to_end((loop, run_key))
+        registry.last_used = now
+        return registry
+
+
+def url_registry_stats() -> List[Dict[str, Any]]:
+    """Return stats for every live run registry in this process."""
+    with _registries_lock:
+        registries = list(_registries.values())
+    return [registry.stats() for registry in registries]
@@ -3,14 +3,14 @@
 import asyncio
 import logging
 import os
+import re
+import time
 import warnings
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Any, Dict, List, Literal, Optional
+from typing import Annotated, Any, Callable, Dict, List, Literal, Optional, Tuple
 
 import aiohttp
-
-# Initialize logger for this module
-logger = logging.getLogger(__name__)
+import httpx
 from langchain.chat_models import init_chat_model
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import (
@@ -32,10 +32,40 @@ from langgraph.config import get_store
 from mcp import McpError
 from tavily import AsyncTavilyClient
 
+from open_deep_research import fast_json
+from open_deep_research.backend_health import (
+    get_circuit_breaker,
+    get_hedge_delay,
+    get_latency_tracker,
+    hedged_call,
+    is_backend_failure,
+)
 from open_deep_research.configuration import Configuration, SearchAPI
+from open_deep_research.crawl_cache import get_crawl_cache
+from open_deep_research.crawl_scheduler import get_crawl_scheduler
+from open_deep_research.crawl_workers import CrawlWorkerError, fetch_page
+from open_deep_research.crawler_pool import measure_crawl_batch
+from open_deep_research.document_extractor import UnsupportedContentError
+from open_deep_research.domain_stats import get_domain_stats
+from open_deep_research.embedding_rerank import get_embedding_reranker
+from open_deep_research.http_pool import get_shared_http_client
+from open_deep_research.micro_batcher import get_micro_batcher
+from open_deep_research.passage_selection import select_passages
 from open_deep_research.perplexica_client import AsyncPerplexicaClient
 from open_deep_research.prompts import summarize_webpage_prompt
-from open_deep_research.state import ResearchComplete, Summary
+from open_deep_research.rate_limit import get_rate_limiter
+from open_deep_research.search_cache import get_search_cache, make_search_cache_key
+from open_deep_research.singleflight import get_single_flight
+from open_deep_research.state import PackedSummaries, ResearchComplete, Summary
+from open_deep_research.summary_cache import (
+    PACKED_SUMMARY_PROMPT_VERSION,
+    SUMMARY_PROMPT_VERSION,
+    get_summary_cache,
+)
+from open_deep_research.summary_packing import SummaryPacker, make_summary_packer
+from open_deep_research.summary_tiers import choose_summary_tier, get_summary_tier_stats
+from open_deep_research.token_counter import count_tokens
+from open_deep_research.url_registry import get_run_key, get_url_registry
 
 # Import SearCrawl client (for search + crawling in one call)
 try:
@@ -43,13 +73,15 @@ try:
 except ImportError:
     # If searcrawl_client is not in the package, try local import
     import sys
-    import os
     sys.path.insert(0, os.path.dirname(__file__))
     try:
         from searcrawl_client import AsyncSearCrawlClient
     except ImportError:
         AsyncSearCrawlClient = None  # Will fall back to Perplexica
 
+# Initialize logger for this module
+logger = logging.getLogger(__name__)
+
 ##########################
 # Tavily Search Tool Utils
 ##########################
@@ -75,17 +107,161 @@ async def tavily_search(
     Returns:
         Formatted string containing summarized search results
     """
+    # Step 0: Set up the summarization model with configuration
+    # (done up front so pages can be summarized as soon as their content arrives)
+    # Optional tool-level deadline: when it passes, return whatever is summarized by then
+    tool_deadline = float(os.getenv("SEARCH_TOOL_DEADLINE", "0"))
+    deadline = time.monotonic() + tool_deadline if tool_deadline > 0 else None
+    
+    def time_left() -> Optional[float]:
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+    
+    configurable = Configuration.from_runnable_config(config)
+    
+    # Character limit to stay within model token limits (configurable)
+    max_char_to_include = configurable.max_content_length
+    
+    # split_and_rerank 模式用本地 embedding 模型挑选片段，不调用 LLM 总结
+    summarize_pages = configurable.process_search_results == "summarize"
+    
+    # Initialize summarization models with retry logic (only needed when summarizing)
+    summarization_chat_model = summarization_model = None
+    fast_chat_model = fast_summarization_model = None
+    if summarize_pages:
+        model_api_key = get_api_key_for_model(configurable.summarization_model, config)
+        summarization_chat_model = init_chat_model(
+            model=configurable.summarization_model,
+            max_tokens=configurable.summarization_model_max_tokens,
+            api_key=model_api_key,
+            tags=["langsmith:nostream"]
+        )
+        summarization_model = summarization_chat_model.with_structured_output(Summary).with_retry(
+            stop_after_attempt=configurable.max_structured_output_retries
+        )
+    # Optional cheaper model for mid-size pages
+    if summarize_pages and configurable.fast_summarization_model:
+        fast_chat_model = init_chat_model(
+            model=configurable.fast_summarization_model,
+            max_tokens=configurable.summarization_model_max_tokens,
+            api_key=get_api_key_for_model(configurable.fast_summarization_model, config),
+            tags=["langsmith:nostream"]
+        )
+        fast_summarization_model = fast_chat_model.with_structured_output(Summary).with_retry(
+            stop_after_attempt=configurable.max_structured_output_retries
+        )
+    
     # Step 1: Execute search queries asynchronously
     # Note: include_raw_content=False to use search engine summaries directly
     # This avoids AI summarization, reduces cost, and prevents LangGraph bugs
     
-    search_results = await tavily_search_async(
-        queries,
-        max_results=max_results,
-        topic=topic,
-        include_raw_content=False,  # Use search engine summaries (faster, cheaper)
-        config=config
-    )
+    # 同一次研究中所有研究员共享：每个 URL 只爬取、总结一次
+    url_registry = get_url_registry(config)
+    run_key = get_run_key(config)
+    
+    async def summarize_once(
+        url: str,
+        content: str,
+        model: BaseChatModel,
+        model_name: str,
+        packer: Optional[SummaryPacker] = None,
+    ):
+        if url_registry is None:
+            return await summarize_webpage(model, content, model_name, run_key, packer)
+        
+        async def summarize_or_none():
+            # summarize_webpage 失败时返回原文：不记入注册表，下次重试
+            summary = await summarize_webpage(model, content, model_name, run_key, packer)
+            return None if summary == content else summary
+        
+        return await url_registry.summarize(url, content, summarize_or_none) or content
+    
+    # 流水线的第二阶段：限制同时进行的总结数量，其余页面排队等待
+    summary_slots = asyncio.Semaphore(int(os.getenv("SUMMARIZE_MAX_CONCURRENCY", "8")))
+    
+    # 总结前按查询用 BM25 挑选最相关的段落，代替截取页面开头
+    passage_stats = {"pages": 0, "reduced": 0, "tokens_in": 0, "tokens_out": 0}
+    
+    async def select_content(content: str, query: str) -> Tuple[str, int]:
+        if configurable.passage_token_budget <= 0:
+            content = content[:max_char_to_include]
+            return content, await asyncio.to_thread(count_tokens, content)
+        selected, tokens_in, tokens_out = await asyncio.to_thread(
+            select_passages, content, query, configurable.passage_token_budget
+        )
+        passage_stats["pages"] += 1
+        passage_stats["reduced"] += 1 if tokens_out < tokens_in else 0
+        passage_stats["tokens_in"] += tokens_in
+        passage_stats["tokens_out"] += tokens_out
+        if len(selected) > max_char_to_include:
+            selected = selected[:max_char_to_include]
+            tokens_out = await asyncio.to_thread(count_tokens, selected)
+        return selected, tokens_out
+    
+    # 按页面大小分级：短页面原文直接返回，中等页面交给快速模型，长页面交给总结模型
+    tier_stats = get_summary_tier_stats()
+    
+    # 打包总结：不超过预算一半的页面合并到同一次 LLM 调用中（每个模型一个打包器）
+    pack_budget = configurable.summary_pack_token_budget
+    packers: Dict[str, SummaryPacker] = {}
+    if pack_budget > 0:
+        for tier, chat_model in (("full", summarization_chat_model), ("fast", fast_chat_model)):
+            if chat_model is not None:
+                packers[tier] = make_summary_packer(
+                    chat_model.with_structured_output(PackedSummaries),
+                    get_today_str(),
+                    pack_budget,
+                    slots=summary_slots,
+                )
+    
+    async def summarize_bounded(url: str, content: str, query: str):
+        content, tokens = await select_content(content, query)
+        tier = choose_summary_tier(
+            tokens,
+            configurable.summarization_bypass_tokens,
+            configurable.fast_summarization_max_tokens,
+            fast_summarization_model is not None,
+        )
+        tier_stats.record(tier, tokens, run_key)
+        if tier == "verbatim":
+            return content
+        if tier == "fast":
+            model, model_name = fast_summarization_model, configurable.fast_summarization_model
+        else:
+            model, model_name = summarization_model, configurable.summarization_model
+        if tier in packers and tokens <= pack_budget // 2:
+            # 打包调用自行占用总结槽位
+            return await summarize_once(url, content, model, model_name, packers[tier])
+        async with summary_slots:
+            return await summarize_once(url, content, model, model_name)
+    
+    # Summaries started before Step 4 (streamed SearCrawl results, finished crawls), keyed by URL
+    early_summaries: Dict[str, asyncio.Task] = {}
+    
+    if is_searcrawl_streaming_enabled():
+        def summarize_as_it_arrives(query: str, result: dict):
+            url = result.get("url")
+            if summarize_pages and url and url not in early_summaries and result.get("raw_content"):
+                early_summaries[url] = asyncio.create_task(summarize_bounded(
+                    url,
+                    result["raw_content"],
+                    query
+                ))
+        
+        search_results = await searcrawl_search_streaming(
+            queries,
+            on_result=summarize_as_it_arrives,
+            max_results=max_results,
+            topic=topic,
+            config=config
+        )
+    else:
+        search_results = await tavily_search_async(
+            queries,
+            max_results=max_results,
+            topic=topic,
+            include_raw_content=False,  # Use search engine summaries (faster, cheaper)
+            config=config
+        )
     
     # Step 2: Deduplicate results by URL to avoid processing the same content multiple times
     unique_results = {}
@@ -108,7 +284,6 @@ async def tavily_search(
                 # 从 raw_content 中提取额外的图片（如果有）
                 raw_content = result.get('raw_content', '')
                 if raw_content:
-                    import re
                     # 提取 <img> 标签中的 src
                     img_matches = re.findall(r'<img[^>]+src=["\']([^"\']+)["\']', raw_content)
                     for img_url in img_matches[:3]:  # 每个网页最多提取3张图片
@@ -142,192 +317,235 @@ async def tavily_search(
         if len(urls_to_crawl) > 10:
             logger.info(f"   ... and {len(urls_to_crawl) - 10} more")
         
-        # Import Crawl4AI modules
-        from crawl4ai import (
-            AsyncWebCrawler,
-            BrowserConfig,
-            CrawlerRunConfig,
-            CacheMode,
-        )
-        from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
-        from crawl4ai.content_filter_strategy import PruningContentFilter
-        
-        # 配置浏览器（增加并发）
-        browser_config = BrowserConfig(
-            headless=True,
-            verbose=False,
-            # 🆕 增加并发数（使用我们自己的服务，可以更激进）
-            browser_type="chromium",
-        )
-        
-        # 配置 Markdown 生成器（保留图片）
-        md_generator = DefaultMarkdownGenerator(
-            content_filter=PruningContentFilter(
-                threshold=float(os.getenv("CRAWL4AI_CONTENT_THRESHOLD", "0.3")),
-                threshold_type="fixed"
-            ),
-            options={
-                "ignore_links": True,
-                "ignore_images": False,  # 保留图片！
-                "escape_html": False,
-            },
-        )
-        
         # 🆕 减少超时时间，加快速度
         timeout_seconds = int(os.getenv("CRAWL4AI_TIMEOUT", "15"))  # 从30秒减少到15秒
+        crawl_scheduler = get_crawl_scheduler()
         
-        # 配置爬取参数
-        run_config = CrawlerRunConfig(
-            word_count_threshold=10,
-            exclude_external_links=True,
-            remove_overlay_elements=True,
-            excluded_tags=["header", "footer", "iframe", "nav"],
-            process_iframes=False,  # 禁用 iframe 处理以提高速度
-            markdown_generator=md_generator,
-            cache_mode=CacheMode.BYPASS,
-            page_timeout=timeout_seconds * 1000,  # 转换为毫秒
-            wait_until="domcontentloaded",  # 不等待所有资源，加快速度
-        )
-        
-        logger.info(f"⚙️  Crawl4AI config: timeout={timeout_seconds}s, threshold={os.getenv('CRAWL4AI_CONTENT_THRESHOLD', '0.3')}, concurrent=auto")
+        logger.info(f"⚙️  Crawl4AI config: timeout={timeout_seconds}s, threshold={os.getenv('CRAWL4AI_CONTENT_THRESHOLD', '0.3')}, concurrent={crawl_scheduler.max_concurrency}, per_domain={crawl_scheduler.per_domain}")
         
         try:
-            import time
-            import asyncio
+            # 分层抓取：先用 HTTP + lxml 提取，必要时才升级到常驻爬虫池中的 Crawl4AI 浏览器
+            # (CRAWL_WORKER_MODE=process 时在独立的爬虫工作进程中执行)
+            crawl_cache = get_crawl_cache()
+            domain_stats = get_domain_stats()
             start_time = time.time()
             
             # 🆕 并行爬取，每个URL独立超时保护
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                logger.info(f"🚀 Starting parallel crawl with timeout protection ({timeout_seconds}s per URL)...")
-                logger.info(f"   共 {len(urls_to_crawl)} 个URL")
+            logger.info(f"🚀 Starting parallel crawl with timeout protection ({timeout_seconds}s per URL)...")
+            logger.info(f"   共 {len(urls_to_crawl)} 个URL")
+            
+            # 为每个URL创建一个带超时的任务，返回 (markdown, 图片列表) 或 None
+            async def crawl_with_timeout(url: str, index: int):
+                if url_registry is None:
+                    return await crawl_page(url, index)
+                # ♻️ 其他研究员已爬取（或正在爬取）的 URL 直接复用结果
+                return await url_registry.crawl(url, lambda: crawl_page(url, index))
+            
+            async def crawl_page(url: str, index: int):
+                url_short = url.split('/')[2] if len(url.split('/')) > 2 else url[:50]
                 
-                # 为每个URL创建一个带超时的任务
-                async def crawl_with_timeout(url: str, index: int):
-                    url_short = url.split('/')[2] if len(url.split('/')) > 2 else url[:50]
+                page_timeout = timeout_seconds
+                fetch_started = None
+                try:
+                    # 💾 爬取缓存：未过期直接使用，过期则先条件请求验证
+                    cached, fresh = await crawl_cache.get(url) if crawl_cache else (None, False)
+                    if cached and fresh:
+                        logger.info(f"[{index+1}] 💾 {url_short} - 缓存命中")
+                        return cached["markdown"], cached["images"]
+                    
+                    # 📊 按域名历史：总是失败的域名直接用搜索摘要（定期重新探测），其余用自适应超时
+                    skip, page_timeout = await domain_stats.plan(url) if domain_stats else (False, timeout_seconds)
+                    if skip:
+                        if cached:
+                            # 过期缓存也比搜索摘要好
+                            logger.info(f"[{index+1}] ⏭️  {url_short} - 该域名近期持续失败，使用过期缓存")
+                            return cached["markdown"], cached["images"]
+                        logger.info(f"[{index+1}] ⏭️  {url_short} - 该域名近期持续失败，使用搜索摘要")
+                        return None
+                    
                     logger.info(f"[{index+1}/{len(urls_to_crawl)}] 🌐 爬取: {url_short}")
+                    # 全局并发上限 + 同域名并发/间隔限制，按搜索得分优先
+                    async with crawl_scheduler.slot(url, priority=unique_results[url].get('score') or 0.0):
+                        revalidated_page = None
+                        if cached:
+                            unchanged, revalidated_page = await crawl_cache.revalidate(url, cached)
+                            if unchanged:
+                                logger.info(f"[{index+1}] 💾 {url_short} - 未修改 (304)，使用缓存")
+                                return cached["markdown"], cached["images"]
+                        fetch_started = time.monotonic()
+                        # 条件请求返回了新内容且无需浏览器时直接使用，避免重复下载
+                        page = revalidated_page or await fetch_page(url, browser_timeout=page_timeout)
                     
-                    try:
-                        result = await asyncio.wait_for(
-                            crawler.arun(url=url, config=run_config),
-                            timeout=timeout_seconds
+                    logger.info(f"[{index+1}] ✅ {url_short} - {len(page.markdown):,} chars ({page.tier})")
+                    if domain_stats:
+                        # 只记录浏览器层耗时，HTTP 层尝试不计入自适应超时
+                        await domain_stats.record(
+                            url, True, page.browser_seconds, len(page.markdown), tier=page.tier
                         )
-                        
-                        if result and result.success and result.markdown:
-                            content_len = len(result.markdown)
-                            logger.info(f"[{index+1}] ✅ {url_short} - {content_len:,} chars")
-                        else:
-                            logger.warning(f"[{index+1}] ❌ {url_short} - 内容为空")
-                        
-                        return result
-                        
-                    except asyncio.TimeoutError:
-                        logger.warning(f"[{index+1}] ❌ {url_short} - 超时 ({timeout_seconds}s)")
-                        return None
-                    except Exception as e:
-                        logger.error(f"[{index+1}] ❌ {url_short} - 错误: {str(e)}")
-                        return None
-                
-                # 并行爬取所有URL
+                    if crawl_cache:
+                        await crawl_cache.put(url, page.markdown, page.images, page.headers)
+                    return page.markdown, page.images
+                    
+                except asyncio.TimeoutError:
+                    logger.warning(f"[{index+1}] ❌ {url_short} - 超时 ({page_timeout}s)")
+                    if domain_stats and fetch_started is not None:
+                        await domain_stats.record(url, False, time.monotonic() - fetch_started, timed_out=True)
+                    return None
+                except UnsupportedContentError as e:
+                    # 二进制文件等：与域名本身无关，不计入域名统计（若是探测则让下次重新探测）
+                    logger.warning(f"[{index+1}] ❌ {url_short} - {str(e)}")
+                    if domain_stats and fetch_started is not None:
+                        await domain_stats.release_probe(url)
+                    return None
+                except CrawlWorkerError as e:
+                    # 爬虫工作进程崩溃/重启：基础设施问题，不计入域名统计（若是探测则让下次重新探测）
+                    logger.error(f"[{index+1}] ❌ {url_short} - 爬虫进程错误: {str(e)}")
+                    if domain_stats and fetch_started is not None:
+                        await domain_stats.release_probe(url)
+                    return None
+                except Exception as e:
+                    logger.error(f"[{index+1}] ❌ {url_short} - 错误: {str(e)}")
+                    if domain_stats and fetch_started is not None:
+                        await domain_stats.record(url, False, time.monotonic() - fetch_started)
+                    return None
+            
+            # 🔀 流水线：每个页面爬完立即开始总结，不等待其他（可能超时的）页面
+            crawled_images: Dict[str, List[str]] = {}
+            
+            async def crawl_then_summarize(url: str, index: int):
+                result = await crawl_with_timeout(url, index)
+                if result:
+                    markdown, images = result
+                    unique_results[url]['raw_content'] = markdown
+                    crawled_images[url] = images
+                    if summarize_pages:
+                        early_summaries[url] = asyncio.create_task(
+                            summarize_bounded(url, markdown, unique_results[url]['query'])
+                        )
+                return result
+            
+            # 并行爬取所有URL
+            # 📈 记录本批次的爬取速度和进程树内存峰值
+            async with measure_crawl_batch(len(urls_to_crawl)) as crawl_batch:
                 crawl_tasks = [
-                    crawl_with_timeout(url, i) 
+                    asyncio.create_task(crawl_then_summarize(url, i))
                     for i, url in enumerate(urls_to_crawl)
                 ]
-                results = await asyncio.gather(*crawl_tasks, return_exceptions=True)
-                
-                # 过滤掉None和异常
-                results = [r for r in results if r and not isinstance(r, Exception)]
-                
-                elapsed = time.time() - start_time
-                success_count = sum(1 for r in results if r and r.success)
-                failed_count = len(urls_to_crawl) - success_count
-                
-                logger.info(f"⏱️  Crawl completed in {elapsed:.1f}s")
-                logger.info(f"📊 Crawl4AI: {success_count} ✅ / {failed_count} ❌ / {len(urls_to_crawl)} total")
-                logger.info(f"⚡ Speed: {len(urls_to_crawl)/elapsed:.1f} pages/sec")
-                
-                # 更新 unique_results 的 raw_content
-                updated_count = 0
-                failed_count = 0
-                
-                for result in results:
-                    url_short = result.url.split('/')[2] if len(result.url.split('/')) > 2 else result.url[:50]
-                    
-                    if result.success and result.markdown and result.url in unique_results:
-                        content_len = len(result.markdown)
-                        unique_results[result.url]['raw_content'] = result.markdown
-                        updated_count += 1
-                        logger.info(f"   ✅ {url_short} - {content_len:,} 字符")
-                        
-                        # 从 Markdown 内容中提取图片链接
-                        import re
-                        img_matches = re.findall(r'!\[.*?\]\((https?://[^\)]+)\)', result.markdown)
-                        for img_url in img_matches[:5]:  # 每页最多5张图片
-                            extracted_images.append({
-                                'url': img_url,
-                                'source': result.url,
-                                'title': unique_results[result.url].get('title', '')
-                            })
-                    else:
-                        failed_count += 1
-                        error_msg = result.error_message if hasattr(result, 'error_message') else "Unknown error"
-                        logger.warning(f"   ❌ {url_short} - {error_msg[:50]}")
-                
-                logger.info(f"✅ Crawl4AI: {updated_count} ✅ / {failed_count} ❌ / {len(urls_to_crawl)} total")
-                logger.info(f"🖼️  Total images extracted: {len(extracted_images)}")
-                if elapsed > 0:
-                    logger.info(f"⚡ Speed: {len(urls_to_crawl) / elapsed:.1f} pages/sec")
+                _, unfinished_crawls = await asyncio.wait(crawl_tasks, timeout=time_left())
+            if unfinished_crawls:
+                logger.warning(f"⏰ Tool deadline reached: {len(unfinished_crawls)} crawls unfinished, using search snippets")
+                for task in unfinished_crawls:
+                    task.cancel()
+            
+            elapsed = time.time() - start_time
+            
+            # 按搜索结果顺序收集图片
+            for url in urls_to_crawl:
+                for img_url in crawled_images.get(url, []):
+                    extracted_images.append({
+                        'url': img_url,
+                        'source': url,
+                        'title': unique_results[url].get('title', '')
+                    })
+            
+            updated_count = len(crawled_images)
+            failed_count = len(urls_to_crawl) - updated_count
+            logger.info(f"⏱️  Crawl completed in {elapsed:.1f}s")
+            logger.info(f"✅ Crawl4AI: {updated_count} ✅ / {failed_count} ❌ / {len(urls_to_crawl)} total")
+            logger.info(f"🖼️  Total images extracted: {len(extracted_images)}")
+            if elapsed > 0:
+                peak_rss = crawl_batch["peak_rss_mb"]
+                logger.info(
+                    f"⚡ Speed: {crawl_batch['pages_per_sec']:.1f} pages/sec"
+                    + (f", peak RSS {peak_rss:.0f} MB" if peak_rss is not None else "")
+                )
         except Exception as e:
             logger.error(f"❌ Crawl4AI failed: {str(e)}")
             import traceback
             logger.error(f"   Traceback: {traceback.format_exc()}")
             # 即使爬取失败，也继续使用 Perplexica 的原始摘要
     
-    # Step 3: Set up the summarization model with configuration
-    configurable = Configuration.from_runnable_config(config)
-    
-    # Character limit to stay within model token limits (configurable)
-    max_char_to_include = configurable.max_content_length
-    
-    # Initialize summarization model with retry logic
-    model_api_key = get_api_key_for_model(configurable.summarization_model, config)
-    summarization_model = init_chat_model(
-        model=configurable.summarization_model,
-        max_tokens=configurable.summarization_model_max_tokens,
-        api_key=model_api_key,
-        tags=["langsmith:nostream"]
-    ).with_structured_output(Summary).with_retry(
-        stop_after_attempt=configurable.max_structured_output_retries
-    )
+    if not summarize_pages:
+        # Steps 4-6 (split_and_rerank): keep the page chunks most similar to each query, no LLM calls
+        try:
+            reranker = get_embedding_reranker(configurable.rerank_embedding_model)
+            summarized_results = await asyncio.to_thread(
+                reranker.rerank, unique_results, run_key, configurable.rerank_max_chunks
+            )
+            logger.info(f"🧠 Embedding rerank: kept chunks from {len(summarized_results)}/{len(unique_results)} pages")
+        except Exception as e:
+            logger.error(f"❌ Embedding rerank failed, using search snippets: {str(e)}")
+            summarized_results = {
+                url: {'title': result['title'], 'content': result['content']}
+                for url, result in unique_results.items()
+            }
+    else:
+        # Step 4: Create summarization tasks (skip empty content)
+        async def noop():
+            """No-op function for results without raw content."""
+            return None
     
-    # Step 4: Create summarization tasks (skip empty content)
-    async def noop():
-        """No-op function for results without raw content."""
-        return None
+        summarization_tasks = [
+            early_summaries[url] if url in early_summaries
+            else asyncio.create_task(noop()) if not result.get("raw_content") 
+            else asyncio.create_task(summarize_bounded(
+                url,
+                result['raw_content'],
+                result['query']
+            ))
+            for url, result in unique_results.items()
+        ]
     
-    summarization_tasks = [
-        noop() if not result.get("raw_content") 
-        else summarize_webpage(
-            summarization_model, 
-            result['raw_content'][:max_char_to_include]
-        )
-        for result in unique_results.values()
-    ]
+        # Step 5: Wait for the remaining summaries (up to the tool deadline, if set)
+        if summarization_tasks:
+            _, unfinished_summaries = await asyncio.wait(summarization_tasks, timeout=time_left())
+            if unfinished_summaries:
+                logger.warning(f"⏰ Tool deadline reached: {len(unfinished_summaries)} summaries unfinished, using search snippets")
+                for task in unfinished_summaries:
+                    task.cancel()
+        summaries = [
+            task.result() if task.done() and not task.cancelled() and task.exception() is None else None
+            for task in summarization_tasks
+        ]
     
-    # Step 5: Execute all summarization tasks in parallel
-    summaries = await asyncio.gather(*summarization_tasks)
+        if passage_stats["reduced"]:
+            logger.info(
+                f"✂️  Passage selection: {passage_stats['reduced']}/{passage_stats['pages']} pages reduced, "
+                f"{passage_stats['tokens_in']:,} → {passage_stats['tokens_out']:,} tokens"
+            )
+        if url_registry is not None:
+            registry_stats = url_registry.stats()
+            logger.info(
+                f"♻️  URL registry: crawls {registry_stats['crawls']}, summaries {registry_stats['summaries']}"
+            )
+        run_tiers = tier_stats.run_stats(run_key)
+        if run_tiers:
+            logger.info(
+                f"🎚️  Summary tiers (this run): {run_tiers['verbatim']} verbatim / {run_tiers['fast']} fast / "
+                f"{run_tiers['full']} full of {run_tiers['pages']} pages "
+                f"(bypass {run_tiers['bypass_rate']:.0%}, fast {run_tiers['fast_rate']:.0%})"
+            )
+        summary_cache = get_summary_cache()
+        run_savings = summary_cache.run_stats(run_key) if summary_cache else None
+        if run_savings:
+            logger.info(
+                f"💾 Summary cache (this run): {run_savings['hits']} hits + {run_savings['coalesced']} shared / "
+                f"{run_savings['misses']} LLM calls, ~{run_savings['tokens_saved']:,} tokens "
+                f"and {run_savings['seconds_saved']:.0f}s saved"
+            )
     
-    # Step 6: Combine results with their summaries
-    summarized_results = {
-        url: {
-            'title': result['title'], 
-            'content': result['content'] if summary is None else summary
+        # Step 6: Combine results with their summaries
+        summarized_results = {
+            url: {
+                'title': result['title'], 
+                'content': result['content'] if summary is None else summary
+            }
+            for url, result, summary in zip(
+                unique_results.keys(), 
+                unique_results.values(), 
+                summaries
+            )
         }
-        for url, result, summary in zip(
-            unique_results.keys(), 
-            unique_results.values(), 
-            summaries
-        )
-    }
     
     # Step 7: Format the final output
     if not summarized_results:
@@ -355,7 +573,6 @@ async def tavily_search(
     
     # Step 8: Append raw search results as JSON for client-side extraction
     # This allows clients to parse and save search logs separately
-    import json
     from datetime import datetime
     
     search_log = {
@@ -372,7 +589,7 @@ async def tavily_search(
     
     # Append as a special comment block that can be extracted
     formatted_output += "\n\n<!-- SEARCH_LOG_JSON\n"
-    formatted_output += json.dumps(search_log, ensure_ascii=False, indent=2)
+    formatted_output += fast_json.dumps(search_log, indent=True)
     formatted_output += "\n-->\n"
     
     return formatted_output
@@ -382,7 +599,8 @@ async def tavily_search_async(
     max_results: int = 5, 
     topic: Literal["general", "news", "finance"] = "general", 
     include_raw_content: bool = False,  # Default: use search engine summaries (faster)
-    config: RunnableConfig = None
+    config: RunnableConfig = None,
+    on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
 ):
     """Execute multiple search queries asynchronously with selected backend.
     
@@ -397,6 +615,9 @@ async def tavily_search_async(
         topic: Topic category for filtering results ("general", "news", "finance")
         include_raw_content: Whether to include full webpage content
         config: Runtime configuration for API key access
+        on_result: Optional callback invoked with (query, result) once per result
+            URL; backends that can stream (SearCrawl) report each page as soon
+            as it has been crawled
         
     Returns:
         List of search result dictionaries in Tavily-compatible format
@@ -404,148 +625,417 @@ async def tavily_search_async(
     Note:
         When using SearCrawl, results will already contain full webpage content (raw_content),
         eliminating the need for separate Jina Reader or Crawl4AI calls!
+
+        Queries are dispatched concurrently. Request pacing is enforced by a
+        process-wide token bucket per backend (SEARCH_RATE_LIMIT_RPS / _BURST,
+        or one request per SEARCH_REQUEST_DELAY, jittered by SEARCH_REQUEST_DELAY_RANDOM),
+        shared by every researcher in the process; a micro-batch request takes one token.
+
+        With SEARCH_HEDGE_BACKEND set (e.g. "tavily"), a query that hasn't been
+        answered within the primary backend's observed p95 latency is also sent
+        to that backend; the first usable result wins and the other is cancelled.
+
+        Perplexica/SearCrawl queries from concurrent researchers that arrive
+        within SEARCH_MICRO_BATCH_WINDOW_MS of each other (default 20ms, 0 disables)
+        are sent as a single batch request of up to SEARCH_MICRO_BATCH_MAX_SIZE queries.
+
+        Each backend has a circuit breaker. While it is open, requests fail over
+        immediately to the next backend in SEARCH_FALLBACK_BACKENDS (e.g. "perplexica,tavily").
     """
     # Determine which search backend to use (priority: SearCrawl > Perplexica > Tavily)
-    use_searcrawl = os.getenv("USE_SEARCRAWL", "false").lower() == "true"
-    use_perplexica = os.getenv("USE_PERPLEXICA", "true").lower() == "true"
+    backend = get_primary_search_backend()
+    base_kwargs = {
+        "max_results": max_results,
+        "include_raw_content": include_raw_content,
+        "topic": topic,
+    }
     
-    if use_searcrawl and AsyncSearCrawlClient:
+    # Fallback backends used when the primary fails or its circuit breaker is
+    # open, plus an optional hedge backend raced against slow primary calls
+    backends = {backend: create_search_backend(backend, config)}
+    fallback_names = [
+        name.strip().lower()
+        for name in os.getenv("SEARCH_FALLBACK_BACKENDS", "").split(",")
+        if name.strip()
+    ]
+    hedge_backend = os.getenv("SEARCH_HEDGE_BACKEND", "").strip().lower()
+    for name in fallback_names + [hedge_backend]:
+        if name and name not in backends:
+            try:
+                backends[name] = create_search_backend(name, config)
+            except Exception as e:
+                logger.warning(f"⚠️  Search backend '{name}' unavailable: {e}")
+    failover_chain = [backend] + [
+        name for name in fallback_names if name in backends and name != backend
+    ]
+    if hedge_backend not in backends or hedge_backend == backend:
+        hedge_backend = ""
+    
+    search_kwargs = {**base_kwargs, **backends[backend][1]}
+    search_cache = get_search_cache()
+    search_flight = get_single_flight("search")
+    
+    async def stream_search(search_client, query: str, kwargs: Dict[str, Any], emit: Callable[[Dict[str, Any]], None]):
+        # Pages are handed to emit as they arrive. A throttled or broken-off
+        # stream becomes an error response, so the breaker honours Retry-After,
+        # the query fails over and the partial result list is never cached.
+        start_time = time.monotonic()
+        results = []
+        response = {"query": query, "results": results, "answer": None, "images": [], "follow_up_questions": None}
+        try:
+            async for result in search_client.search_stream(query, **kwargs):
+                results.append(result)
+                emit(result)
+                logger.info(f"📡 Streamed [{len(results)}] {result.get('url', '')[:80]} after {time.monotonic() - start_time:.1f}s")
+        except httpx.HTTPError as e:
+            # SearCrawlStreamError carries the status and Retry-After of an error response
+            status_code = getattr(e, "status_code", None)
+            response["error"] = f"Stream failed after {len(results)} results: {str(e) or type(e).__name__}"
+            if status_code is not None:
+                response["status_code"] = status_code
+                response["retry_after"] = getattr(e, "retry_after", None)
+        except ValueError as e:
+            response["error"] = f"Stream interrupted after {len(results)} results: {str(e) or type(e).__name__}"
+        response["response_time"] = round(time.monotonic() - start_time, 2)
+        return response
+    
+    def paced_batch(name: str):
+        # One rate-limit token and one breaker outcome per batch request: a
+        # failed batch repeats its error for every query but is a single failure
+        search_client = backends[name][0]
+        breaker = get_circuit_breaker(name)
+        
+        async def submit_batch(queries: List[str], **params) -> List[Dict[str, Any]]:
+            waited = await get_rate_limiter(name).acquire()
+            if waited:
+                logger.debug(f"⏳ {name} rate limit: waited {waited:.1f}s before a batch of {len(queries)}")
+            try:
+                responses = await search_client.search_batch(queries, **params)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                breaker.record_failure()
+                raise
+            failed = [response for response in responses if is_backend_failure(response)]
+            breaker.record_result(failed[0] if failed else {})
+            return responses
+        
+        return submit_batch
+    
+    async def backend_search(name: str, query: str, emit: Optional[Callable[[Dict[str, Any]], None]] = None):
+        # Fail fast while the backend's circuit breaker is open
+        breaker = get_circuit_breaker(name)
+        if not breaker.allow_request():
+            return {
+                "query": query,
+                "results": [],
+                "error": f"Circuit breaker open for {name} (retry in {breaker.retry_in():.0f}s)",
+                "response_time": 0.0
+            }
+        
+        search_client, backend_kwargs = backends[name]
+        streaming = emit is not None and hasattr(search_client, "search_stream")
+        batcher = None
+        if not streaming and hasattr(search_client, "search_batch") and search_client.supports_batch():
+            batcher = get_micro_batcher(name)
+        if batcher is None:
+            # All researchers in this process share one token bucket per backend, so
+            # queries run concurrently while the backend still sees a bounded rate.
+            # Batched queries take their token per batch request instead.
+            waited = await get_rate_limiter(name).acquire()
+            if waited:
+                logger.debug(f"⏳ {name} rate limit: waited {waited:.1f}s before '{query[:50]}'")
+        
+        start_time = time.monotonic()
+        try:
+            if streaming:
+                result = await stream_search(search_client, query, {**base_kwargs, **backend_kwargs}, emit)
+            elif batcher:
+                # Queries from concurrent researchers arriving within the batch
+                # window share one /batch request to the backend
+                result = await batcher.submit(
+                    query, {**base_kwargs, **backend_kwargs}, paced_batch(name)
+                )
+            else:
+                result = await search_client.search(query, **base_kwargs, **backend_kwargs)
+        except asyncio.CancelledError:
+            breaker.record_cancelled()
+            # A call cancelled by a winning hedge took at least this long
+            get_latency_tracker(name).record(time.monotonic() - start_time, censored=True)
+            raise
+        except Exception:
+            if batcher is None:
+                breaker.record_failure()
+            raise
+        if batcher is None:
+            breaker.record_result(result)
+        if is_usable_search_result(result):
+            get_latency_tracker(name).record(time.monotonic() - start_time)
+        return result
+    
+    async def failover_search(query: str, emit=None):
+        # Walk the failover chain until a backend answers without a backend
+        # failure; returns (answering backend, result)
+        result = None
+        for i, name in enumerate(failover_chain):
+            is_last = i == len(failover_chain) - 1
+            try:
+                result = await backend_search(name, query, emit)
+            except Exception as e:
+                if is_last:
+                    raise
+                logger.warning(f"⚠️  {name} search failed ({e}), failing over to {failover_chain[i + 1]}")
+                continue
+            if is_last or not is_backend_failure(result):
+                return name, result
+            logger.warning(f"⚠️  {name} unavailable ({result['error'][:80]}), failing over to {failover_chain[i + 1]}")
+        return failover_chain[-1], result
+    
+    async def hedge_search(query: str):
+        return hedge_backend, await backend_search(hedge_backend, query)
+    
+    async def cached_search(query: str, emit=None):
+        # Cache hits skip the backend entirely and don't consume rate limit tokens
+        if search_cache:
+            cached = await search_cache.get(backend, query, search_kwargs)
+            if cached is not None:
+                logger.info(f"💾 Search cache hit ({backend}): '{query[:50]}'")
+                return cached
+        
+        if hedge_backend:
+            answered_by, result = await hedged_call(
+                lambda: failover_search(query, emit),
+                lambda: hedge_search(query),
+                delay=get_hedge_delay(backend),
+                is_usable=lambda answer: is_usable_search_result(answer[1]),
+                label=f"'{query[:50]}' ({backend} → {hedge_backend})"
+            )
+        else:
+            answered_by, result = await failover_search(query, emit)
+        
+        # Cache under the backend that actually answered, so a failover or
+        # hedge result is never served later as the primary backend's answer
+        if search_cache:
+            await search_cache.put(answered_by, query, search_kwargs, result)
+        return result
+    
+    async def coalesced_search(query: str):
+        # Parallel researchers issuing the same (normalized) query at the same
+        # time share a single backend call and its result.
+        key = make_search_cache_key(backend, query, search_kwargs)
+        if on_result is None:
+            result = await search_flight.do(key, lambda: cached_search(query))
+            return {**result, "query": query}
+        
+        # Only the caller that runs the backend call sees streamed pages early;
+        # cache hits, coalesced waiters and failover results are reported here
+        emitted = set()
+        def emit(result: Dict[str, Any]):
+            if result.get("url") not in emitted:
+                emitted.add(result.get("url"))
+                on_result(query, result)
+        result = await search_flight.do(key, lambda: cached_search(query, emit))
+        for item in result.get("results", []):
+            emit(item)
+        return {**result, "query": query}
+    
+    # Perplexica/SearCrawl clients wrap the process-wide pooled HTTP client
+    # (closed by the app lifespan hook), so there is nothing to clean up here.
+    return await asyncio.gather(*[
+        coalesced_search(query) for query in search_queries
+    ])
+
+def get_primary_search_backend() -> str:
+    """Return the configured primary search backend name.
+    
+    Priority: SearCrawl (USE_SEARCRAWL=true) > Perplexica (USE_PERPLEXICA=true, default) > Tavily.
+    """
+    if os.getenv("USE_SEARCRAWL", "false").lower() == "true" and AsyncSearCrawlClient:
+        return "searcrawl"
+    if os.getenv("USE_PERPLEXICA", "true").lower() == "true":
+        return "perplexica"
+    return "tavily"
+
+def create_search_backend(backend: str, config: RunnableConfig = None):
+    """Create the search client and backend-specific search kwargs for a backend.
+    
+    Args:
+        backend: Backend name ("searcrawl", "perplexica" or "tavily")
+        config: Runtime configuration for API key access
+        
+    Returns:
+        Tuple of (client with a Tavily-compatible ``search`` method, extra search kwargs)
+    """
+    if backend == "searcrawl" and AsyncSearCrawlClient:
         # ✨ Use SearCrawl as search+crawl backend (NO separate crawling needed!)
         searcrawl_url = os.getenv("SEARCRAWL_API_URL", "http://searcrawl-service:3000")
         search_client = AsyncSearCrawlClient(
             api_key=None,  # SearCrawl doesn't require API key for internal AKS access
-            base_url=searcrawl_url
+            base_url=searcrawl_url,
+            http_client=get_shared_http_client(
+                backend,
+                timeout=AsyncSearCrawlClient.TIMEOUT,
+                limits=AsyncSearCrawlClient.LIMITS
+            )
         )
         
         logger.info(f"🔍 Using SearCrawl backend: {searcrawl_url}")
         logger.info("   ✅ SearCrawl will search AND crawl in one call (no separate crawling needed!)")
-        
-        # Create search tasks (SearCrawl handles crawling automatically)
-        search_tasks = [
-            search_client.search(
-                query,
-                max_results=max_results,
-                include_raw_content=include_raw_content,
-                topic=topic
-            )
-            for query in search_queries
-        ]
-    elif use_perplexica:
+        return search_client, {}
+    elif backend == "perplexica":
         # Use Perplexica as search backend
         perplexica_url = os.getenv("PERPLEXICA_API_URL", "http://perplexica-service/api/tavily")
         search_client = AsyncPerplexicaClient(
             api_key=None,  # Perplexica doesn't require API key for internal AKS access
-            base_url=perplexica_url
+            base_url=perplexica_url,
+            http_client=get_shared_http_client(
+                backend,
+                timeout=AsyncPerplexicaClient.TIMEOUT,
+                limits=AsyncPerplexicaClient.LIMITS
+            )
         )
         
-        # === Read advanced parameters from environment variables ===
-        # These provide global defaults that can be overridden per-request
-        
-        # Time range control
-        perplexica_time_range = os.getenv("PERPLEXICA_TIME_RANGE")  # "day", "week", "month", "year"
-        perplexica_days = os.getenv("PERPLEXICA_DAYS")  # Last N days
-        
-        # Domain filtering
-        perplexica_include_domains = os.getenv("PERPLEXICA_INCLUDE_DOMAINS")  # Comma-separated
-        perplexica_exclude_domains = os.getenv("PERPLEXICA_EXCLUDE_DOMAINS", "pinterest.com,instagram.com")  # Default excludes
-        
-        # Search control
-        perplexica_language = os.getenv("PERPLEXICA_LANGUAGE", "en")
-        perplexica_engines = os.getenv("PERPLEXICA_ENGINES")  # Comma-separated
-        perplexica_safesearch = os.getenv("PERPLEXICA_SAFESEARCH", "2")  # Default: strict
-        perplexica_search_depth = os.getenv("PERPLEXICA_SEARCH_DEPTH", "basic")
-        
-        # Content control
-        perplexica_include_answer = os.getenv("PERPLEXICA_INCLUDE_ANSWER", "false").lower() == "true"
-        perplexica_include_images = os.getenv("PERPLEXICA_INCLUDE_IMAGES", "false").lower() == "true"
-        
-        # Performance control
-        perplexica_timeout = os.getenv("PERPLEXICA_TIMEOUT", "300")  # Default: 5 minutes
-        
-        # Parse comma-separated lists
-        def parse_list(value: str) -> list:
-            return [item.strip() for item in value.split(",")] if value else None
-        
-        # Prepare advanced parameters
-        advanced_params = {
-            "language": perplexica_language,
-            "search_depth": perplexica_search_depth,
-            "safesearch": perplexica_safesearch,
-            "timeout": int(perplexica_timeout) if perplexica_timeout else None,
-            "include_answer": perplexica_include_answer,
-            "include_images": perplexica_include_images,
-        }
-        
-        # Add time range
-        if perplexica_time_range:
-            advanced_params["time_range"] = perplexica_time_range
-        if perplexica_days:
-            advanced_params["days"] = int(perplexica_days)
-        
-        # Add domain filtering
-        if perplexica_include_domains:
-            advanced_params["include_domains"] = parse_list(perplexica_include_domains)
-        if perplexica_exclude_domains:
-            advanced_params["exclude_domains"] = parse_list(perplexica_exclude_domains)
-        
-        # Add search engines
-        if perplexica_engines:
-            advanced_params["engines"] = parse_list(perplexica_engines)
-        
-        # Create search tasks with all parameters
-        search_tasks = [
-            search_client.search(
-                query,
-                max_results=max_results,
-                include_raw_content=include_raw_content,
-                topic=topic,
-                **advanced_params  # Pass all advanced parameters
-            )
-            for query in search_queries
-        ]
-    else:
+        # Pass all advanced parameters (global defaults from environment variables)
+        return search_client, get_perplexica_advanced_params()
+    elif backend == "tavily":
         # Use official Tavily API (only supports basic parameters)
-        search_client = AsyncTavilyClient(api_key=get_tavily_api_key(config))
-        
-        search_tasks = [
-            search_client.search(
-                query,
-                max_results=max_results,
-                include_raw_content=include_raw_content,
-                topic=topic
-            )
-            for query in search_queries
-        ]
-    
-    try:
+        return AsyncTavilyClient(api_key=get_tavily_api_key(config)), {}
+    raise ValueError(f"Unknown or unavailable search backend: {backend}")
 
-        search_results = []
-        request_delay = float(os.getenv("SEARCH_REQUEST_DELAY", "5.0"))  # 默认5秒延迟
-        
-        for i, task in enumerate(search_tasks):
-            if i > 0: 
-                await asyncio.sleep(request_delay)
-            
-            result = await task
-            search_results.append(result)
+def is_usable_search_result(result: Dict[str, Any]) -> bool:
+    """Return True if a backend response carries results rather than an error."""
+    return bool(result) and not result.get("error") and bool(result.get("results"))
+
+def is_searcrawl_streaming_enabled() -> bool:
+    """Return True when search results should be streamed from SearCrawl."""
+    return (
+        AsyncSearCrawlClient is not None
+        and os.getenv("USE_SEARCRAWL", "false").lower() == "true"
+        and os.getenv("SEARCRAWL_STREAMING", "false").lower() == "true"
+    )
+
+async def searcrawl_search_streaming(
+    search_queries: List[str],
+    on_result: Callable[[str, Dict[str, Any]], None],
+    max_results: int = 5,
+    topic: Literal["general", "news", "finance"] = "general",
+    config: RunnableConfig = None,
+) -> List[Dict[str, Any]]:
+    """Run SearCrawl queries in streaming mode, reporting each page as it arrives.
+    
+    Each crawled page is passed to ``on_result`` as soon as SearCrawl emits it, so
+    callers can start downstream work (e.g. summarization) before the slowest
+    page of the slowest query has been crawled. Full content is always requested
+    since the point of streaming is to process crawled pages early. Queries go
+    through ``tavily_search_async``, so they share its rate limiter, search
+    cache, single-flight, circuit breaker and failover backends; a stream that
+    is throttled or breaks off counts as a backend failure and is not cached.
+    
+    Args:
+        search_queries: List of search query strings to execute
+        on_result: Callback invoked with (query, result) for every result URL
+        max_results: Maximum number of results per query
+        topic: Topic category for filtering results
+        config: Runtime configuration for API key access of fallback backends
         
-        return search_results
-    finally:
-        # Clean up client resources if using Perplexica or SearCrawl
-        if (use_searcrawl or use_perplexica) and hasattr(search_client, 'close'):
-            await search_client.close()
+    Returns:
+        List of Tavily-compatible response dicts, one per query, once all streams end
+    """
+    return await tavily_search_async(
+        search_queries,
+        max_results=max_results,
+        topic=topic,
+        include_raw_content=True,
+        config=config,
+        on_result=on_result
+    )
+
+def get_perplexica_advanced_params() -> Dict[str, Any]:
+    """Read Perplexica advanced search parameters from environment variables.
+    
+    These provide global defaults that can be overridden per-request.
+    
+    Returns:
+        Dictionary of keyword arguments for AsyncPerplexicaClient.search
+    """
+    # Time range control
+    perplexica_time_range = os.getenv("PERPLEXICA_TIME_RANGE")  # "day", "week", "month", "year"
+    perplexica_days = os.getenv("PERPLEXICA_DAYS")  # Last N days
+    
+    # Domain filtering
+    perplexica_include_domains = os.getenv("PERPLEXICA_INCLUDE_DOMAINS")  # Comma-separated
+    perplexica_exclude_domains = os.getenv("PERPLEXICA_EXCLUDE_DOMAINS", "pinterest.com,instagram.com")  # Default excludes
+    
+    # Search control
+    perplexica_language = os.getenv("PERPLEXICA_LANGUAGE", "en")
+    perplexica_engines = os.getenv("PERPLEXICA_ENGINES")  # Comma-separated
+    perplexica_safesearch = os.getenv("PERPLEXICA_SAFESEARCH", "2")  # Default: strict
+    perplexica_search_depth = os.getenv("PERPLEXICA_SEARCH_DEPTH", "basic")
+    
+    # Content control
+    perplexica_include_answer = os.getenv("PERPLEXICA_INCLUDE_ANSWER", "false").lower() == "true"
+    perplexica_include_images = os.getenv("PERPLEXICA_INCLUDE_IMAGES", "false").lower() == "true"
+    
+    # Performance control
+    perplexica_timeout = os.getenv("PERPLEXICA_TIMEOUT", "300")  # Default: 5 minutes
+    
+    # Parse comma-separated lists
+    def parse_list(value: str) -> list:
+        return [item.strip() for item in value.split(",")] if value else None
+    
+    # Prepare advanced parameters
+    advanced_params = {
+        "language": perplexica_language,
+        "search_depth": perplexica_search_depth,
+        "safesearch": perplexica_safesearch,
+        "timeout": int(perplexica_timeout) if perplexica_timeout else None,
+        "include_answer": perplexica_include_answer,
+        "include_images": perplexica_include_images,
+    }
+    
+    # Add time range
+    if perplexica_time_range:
+        advanced_params["time_range"] = perplexica_time_range
+    if perplexica_days:
+        advanced_params["days"] = int(perplexica_days)
+    
+    # Add domain filtering
+    if perplexica_include_domains:
+        advanced_params["include_domains"] = parse_list(perplexica_include_domains)
+    if perplexica_exclude_domains:
+        advanced_params["exclude_domains"] = parse_list(perplexica_exclude_domains)
+    
+    # Add search engines
+    if perplexica_engines:
+        advanced_params["engines"] = parse_list(perplexica_engines)
+    
+    return advanced_params
 
-async def summarize_webpage(model: BaseChatModel, webpage_content: str) -> str:
+async def summarize_webpage(
+    model: BaseChatModel,
+    webpage_content: str,
+    model_name: Optional[str] = None,
+    run_key: Optional[str] = None,
+    packer: Optional[SummaryPacker] = None,
+) -> str:
     """Summarize webpage content using AI model with timeout protection.
     
+    When ``model_name`` is given and the summary cache is enabled, identical
+    content already summarized by the same model and prompt version is served
+    from the cache without an LLM call.
+    
     Args:
         model: The chat model configured for summarization
         webpage_content: Raw webpage content to be summarized
+        model_name: Name of the summarization model, part of the cache key
+        run_key: Research run that cache savings are attributed to
+        packer: Summarize together with other small pages in one call,
+            falling back to a single-page call if the packed call fails
         
     Returns:
         Formatted summary with key excerpts, or original content if summarization fails
     """
-    try:
+    async def invoke_single() -> Dict[str, str]:
         # Create prompt with current date context
         prompt_content = summarize_webpage_prompt.format(
             webpage_content=webpage_content, 
@@ -557,11 +1047,28 @@ async def summarize_webpage(model: BaseChatModel, webpage_content: str) -> str:
             model.ainvoke([HumanMessage(content=prompt_content)]),
             timeout=60.0  # 60 second timeout for summarization
         )
+        return {"summary": summary.summary, "key_excerpts": summary.key_excerpts}
+    
+    async def invoke_model() -> Dict[str, str]:
+        if packer is None:
+            return await invoke_single()
+        return await packer.summarize(webpage_content, invoke_single)
+    
+    try:
+        summary_cache = get_summary_cache() if model_name else None
+        if summary_cache is None:
+            summary = await invoke_model()
+        else:
+            # Packed summaries come from a different prompt, so they are cached apart
+            prompt_version = SUMMARY_PROMPT_VERSION if packer is None else PACKED_SUMMARY_PROMPT_VERSION
+            summary = await summary_cache.get_or_create(
+                webpage_content, model_name, invoke_model, run_key, prompt_version
+            )
         
         # Format the summary with structured sections
         formatted_summary = (
-            f"<summary>\n{summary.summary}\n</summary>\n\n"
-            f"<key_excerpts>\n{summary.key_excerpts}\n</key_excerpts>"
+            f"<summary>\n{summary['summary']}\n</summary>\n\n"
+            f"<key_excerpts>\n{summary['key_excerpts']}\n</key_excerpts>"
         )
         
         return formatted_summary
@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+
+from open_deep_research.backend_health import (
+    CircuitBreaker,
+    LatencyTracker,
+    hedged_call,
+    is_backend_failure,
+    parse_retry_after,
+)
+
+
+def test_only_backend_failures_count():
+    assert is_backend_failure({"error": "timeout"})
+    assert is_backend_failure({"error": "busy", "status_code": 429})
+    assert is_backend_failure({"error": "down", "status_code": 503})
+    assert not is_backend_failure({"error": "bad query", "status_code": 400})
+    assert not is_backend_failure({"results": []})
+
+
+def test_breaker_opens_after_threshold_and_probes_once():
+    breaker = CircuitBreaker("test", failure_threshold=2, base_cooldown=0.01)
+
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one half-open probe at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_retry_after_opens_breaker_for_at_least_that_long():
+    breaker = CircuitBreaker("test", failure_threshold=5, base_cooldown=0.01)
+
+    breaker.record_result({"error": "slow down", "status_code": 429, "retry_after": "120"})
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert 115 < breaker.retry_in() <= 120
+    assert not breaker.allow_request()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("30") == 30.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_censored_latencies_are_counted_separately():
+    tracker = LatencyTracker()
+    tracker.record(0.5)
+    tracker.record(2.0, censored=True)
+
+    assert tracker.stats()["censored"] == 1
+
+
+async def _result(value, delay):
+    await asyncio.sleep(delay)
+    return value
+
+
+def test_fast_primary_is_not_hedged():
+    hedge_started = []
+
+    async def hedge():
+        hedge_started.append(True)
+        return {"results": ["hedge"]}
+
+    result = asyncio.run(hedged_call(
+        lambda: _result({"results": ["primary"]}, 0.0),
+        hedge,
+        delay=0.5,
+        is_usable=lambda r: bool(r["results"]),
+    ))
+
+    assert result == {"results": ["primary"]}
+    assert not hedge_started
+
+
+def test_slow_primary_loses_to_hedge_and_is_cancelled():
+    cancelled = []
+
+    async def slow_primary():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def main():
+        result = await hedged_call(
+            slow_primary,
+            lambda: _result({"results": ["hedge"]}, 0.0),
+            delay=0.01,
+            is_usable=lambda r: bool(r["results"]),
+        )
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(main()) == {"results": ["hedge"]}
+    assert cancelled
+
+
+def test_primary_error_is_raised_when_hedge_is_unusable():
+    async def failing_primary():
+        raise RuntimeError("primary down")
+
+    with pytest.raises(RuntimeError, match="primary down"):
+        asyncio.run(hedged_call(
+            failing_primary,
+            lambda: _result({"results": []}, 0.0),
+            delay=0.01,
+            is_usable=lambda r: bool(r["results"]),
+        ))
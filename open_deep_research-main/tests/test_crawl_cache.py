@@ -0,0 +1,26 @@
+from open_deep_research.crawl_cache import canonicalize_url
+
+
+def test_scheme_host_and_default_port_are_normalized():
+    assert canonicalize_url("HTTPS://Example.COM:443/Path") == "https://example.com/Path"
+    assert canonicalize_url("http://example.com:8080/") == "http://example.com:8080/"
+
+
+def test_tracking_parameters_are_dropped_and_query_sorted():
+    url = "https://example.com/a?utm_source=x&b=2&gclid=abc&a=1"
+
+    assert canonicalize_url(url) == "https://example.com/a?a=1&b=2"
+
+
+def test_repeated_parameters_keep_their_order():
+    assert canonicalize_url("https://example.com/?b=1&a=2&a=1") == "https://example.com/?a=2&a=1&b=1"
+
+
+def test_in_page_fragments_are_dropped_but_hash_routes_kept():
+    assert canonicalize_url("https://example.com/doc#section-2") == "https://example.com/doc"
+    assert canonicalize_url("https://example.com/#!/item/1") == "https://example.com/#!/item/1"
+    assert canonicalize_url("https://example.com/#/item/1") == "https://example.com/#/item/1"
+
+
+def test_trailing_slash_and_www_are_kept():
+    assert canonicalize_url("https://www.example.com/docs/") != canonicalize_url("https://example.com/docs")
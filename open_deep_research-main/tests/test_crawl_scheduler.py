@@ -0,0 +1,77 @@
+import asyncio
+
+from open_deep_research.crawl_scheduler import CrawlScheduler, get_domain
+
+
+def test_get_domain_strips_www_and_port():
+    assert get_domain("https://WWW.Example.com:8443/page") == "example.com"
+
+
+def test_global_and_per_domain_limits_are_respected():
+    scheduler = CrawlScheduler(max_concurrency=3, per_domain=1, domain_interval=0.0)
+    active = {"total": 0, "peak": 0}
+    per_domain = {}
+    peak_per_domain = {}
+
+    async def crawl(url):
+        domain = get_domain(url)
+        async with scheduler.slot(url):
+            active["total"] += 1
+            per_domain[domain] = per_domain.get(domain, 0) + 1
+            active["peak"] = max(active["peak"], active["total"])
+            peak_per_domain[domain] = max(peak_per_domain.get(domain, 0), per_domain[domain])
+            await asyncio.sleep(0.01)
+            active["total"] -= 1
+            per_domain[domain] -= 1
+
+    urls = [f"https://{host}/{i}" for host in ("a.com", "b.com", "c.com", "d.com") for i in range(3)]
+
+    async def main():
+        await asyncio.gather(*(crawl(url) for url in urls))
+
+    asyncio.run(main())
+
+    assert active["peak"] == 3
+    assert max(peak_per_domain.values()) == 1
+
+
+def test_higher_priority_waiters_are_served_first():
+    scheduler = CrawlScheduler(max_concurrency=1, per_domain=5, domain_interval=0.0)
+    order = []
+
+    async def crawl(url, priority):
+        async with scheduler.slot(url, priority=priority):
+            order.append(url)
+            await asyncio.sleep(0.001)
+
+    async def main():
+        async with scheduler.slot("https://busy.com/"):
+            tasks = [
+                asyncio.ensure_future(crawl(f"https://x.com/{priority}", priority)) for priority in (0.1, 0.9, 0.5)
+            ]
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+
+    assert order == ["https://x.com/0.9", "https://x.com/0.5", "https://x.com/0.1"]
+
+
+def test_slow_domain_does_not_block_other_domains():
+    scheduler = CrawlScheduler(max_concurrency=4, per_domain=1, domain_interval=0.2)
+    started = []
+
+    async def crawl(url):
+        async with scheduler.slot(url):
+            started.append(url)
+
+    async def main():
+        await asyncio.wait_for(
+            asyncio.gather(crawl("https://slow.com/1"), crawl("https://slow.com/2"), crawl("https://fast.com/1")),
+            2.0,
+        )
+
+    asyncio.run(main())
+
+    # The second slow.com crawl waits out the domain interval; fast.com doesn't wait for it
+    assert started.index("https://fast.com/1") < started.index("https://slow.com/2")
@@ -0,0 +1,27 @@
+from open_deep_research.document_extractor import (
+    detect_document_type,
+    looks_like_document_url,
+)
+
+
+def test_pdf_is_detected_from_magic_bytes_despite_content_type():
+    assert detect_document_type("application/octet-stream", "https://example.com/file", b"%PDF-1.7\n") == "pdf"
+
+
+def test_zip_is_docx_only_with_header_or_extension():
+    docx_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+    assert detect_document_type(docx_type, "https://example.com/download", b"PK\x03\x04rest") == "docx"
+    assert detect_document_type("application/zip", "https://example.com/report.docx?v=2", b"PK\x03\x04") == "docx"
+    assert detect_document_type("application/zip", "https://example.com/archive.zip", b"PK\x03\x04") is None
+
+
+def test_html_served_as_text_is_html():
+    assert detect_document_type("text/plain", "https://example.com/", b"  <!DOCTYPE html><html>") == "html"
+    assert detect_document_type("text/plain", "https://example.com/", b"plain words") == "text"
+    assert detect_document_type("image/png", "https://example.com/logo", b"\x89PNG") is None
+
+
+def test_document_urls():
+    assert looks_like_document_url("https://example.com/paper.PDF?download=1")
+    assert not looks_like_document_url("https://example.com/pdf/viewer")
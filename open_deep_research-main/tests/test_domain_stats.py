@@ -0,0 +1,87 @@
+import asyncio
+
+from open_deep_research.cache_store import SQLiteCacheStore
+from open_deep_research.domain_stats import DomainStats
+
+
+def _stats(**kwargs):
+    defaults = {"min_attempts": 3, "skip_after_failures": 3, "min_samples": 3}
+    return DomainStats(SQLiteCacheStore(":memory:", table="domains"), **{**defaults, **kwargs})
+
+
+def test_timeout_adapts_to_observed_latency():
+    stats = _stats(base_timeout=15.0, min_timeout=5.0, max_timeout=30.0)
+
+    async def main():
+        for _ in range(3):
+            await stats.record("https://fast.example/page", success=True, seconds=2.0, chars=5000)
+        return await stats.plan("https://fast.example/other")
+
+    skip, timeout = asyncio.run(main())
+
+    assert not skip
+    assert timeout == 5.0  # 1.5 * 2.0 + 2.0
+
+
+def test_http_tier_latencies_do_not_adapt_browser_timeout():
+    stats = _stats(base_timeout=15.0)
+
+    async def main():
+        for _ in range(3):
+            await stats.record("https://a.example/", success=True, seconds=0.3, tier="http")
+        return await stats.plan("https://a.example/")
+
+    assert asyncio.run(main()) == (False, 15.0)
+
+
+def test_failing_domain_is_skipped_then_probed_once():
+    stats = _stats(reprobe_interval=3600)
+    url = "https://broken.example/page"
+
+    async def main():
+        for _ in range(3):
+            await stats.record(url, success=False, seconds=15.0, timed_out=True)
+        skipped = await stats.plan(url)
+        # Pretend the skip period is over
+        stats._records["broken.example"]["skip_until"] = 1.0
+        probe = await stats.plan(url)
+        during_probe = await stats.plan(url)
+        return skipped, probe, during_probe
+
+    skipped, probe, during_probe = asyncio.run(main())
+
+    assert skipped[0]
+    assert not probe[0]
+    assert during_probe[0]
+    assert "broken.example" in stats.stats()["skip_list"]
+
+
+def test_inconclusive_probe_lets_the_next_crawl_probe_again():
+    stats = _stats(reprobe_interval=3600)
+    url = "https://broken.example/file.bin"
+
+    async def main():
+        for _ in range(3):
+            await stats.record(url, success=False, seconds=15.0)
+        stats._records["broken.example"]["skip_until"] = 1.0
+        await stats.plan(url)
+        await stats.release_probe(url)
+        return await stats.plan(url)
+
+    skip, _ = asyncio.run(main())
+
+    assert not skip
+    assert stats.stats()["inconclusive_probes"] == 1
+
+
+def test_success_clears_the_skip():
+    stats = _stats()
+    url = "https://flaky.example/"
+
+    async def main():
+        for _ in range(3):
+            await stats.record(url, success=False, seconds=1.0)
+        await stats.record(url, success=True, seconds=1.0, chars=100)
+        return await stats.plan(url)
+
+    assert not asyncio.run(main())[0]
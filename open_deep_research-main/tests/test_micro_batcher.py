@@ -0,0 +1,73 @@
+import asyncio
+
+from open_deep_research.micro_batcher import MicroBatcher
+
+
+class FakeBackend:
+    def __init__(self):
+        self.batches = []
+
+    async def search_batch(self, queries, **params):
+        self.batches.append((list(queries), params))
+        return [{"query": query, "results": [params]} for query in queries]
+
+
+def test_queries_within_window_share_one_batch():
+    batcher = MicroBatcher("test", window=0.05)
+    backend = FakeBackend()
+
+    async def main():
+        return await asyncio.gather(
+            *(batcher.submit(f"q{i}", {"max_results": 5}, backend.search_batch) for i in range(3))
+        )
+
+    responses = asyncio.run(main())
+
+    assert backend.batches == [(["q0", "q1", "q2"], {"max_results": 5})]
+    assert [response["query"] for response in responses] == ["q0", "q1", "q2"]
+
+
+def test_different_params_are_batched_separately():
+    batcher = MicroBatcher("test", window=0.05)
+    backend = FakeBackend()
+
+    async def main():
+        await asyncio.gather(
+            batcher.submit("a", {"topic": "news"}, backend.search_batch),
+            batcher.submit("b", {"topic": "general"}, backend.search_batch),
+        )
+
+    asyncio.run(main())
+
+    assert sorted(queries for queries, _ in backend.batches) == [["a"], ["b"]]
+
+
+def test_full_batch_flushes_before_the_window():
+    batcher = MicroBatcher("test", window=10.0, max_batch=2)
+    backend = FakeBackend()
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(q, {}, backend.search_batch) for q in ("a", "b"))), 1.0
+        )
+
+    asyncio.run(main())
+
+    assert backend.batches == [(["a", "b"], {})]
+    assert batcher.stats()["largest_batch"] == 2
+
+
+def test_batch_error_reaches_every_caller():
+    batcher = MicroBatcher("test", window=0.01)
+
+    async def failing_batch(queries, **params):
+        raise RuntimeError("batch endpoint down")
+
+    async def main():
+        return await asyncio.gather(
+            batcher.submit("a", {}, failing_batch), batcher.submit("b", {}, failing_batch), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+
+    assert [str(result) for result in results] == ["batch endpoint down", "batch endpoint down"]
@@ -0,0 +1,23 @@
+from open_deep_research.page_fetcher import needs_browser
+
+
+def test_page_with_enough_text_is_served_over_http():
+    html = "<html><body>" + "<p>Plenty of article text.</p>" * 50 + "</body></html>"
+
+    assert not needs_browser(html, text_chars=1200, min_chars=500)
+
+
+def test_thin_page_needs_browser():
+    assert needs_browser("<html><body><div id='root'></div></body></html>", text_chars=20, min_chars=500)
+
+
+def test_bot_challenge_needs_browser():
+    html = "<html><title>Just a moment...</title><body>Checking your browser</body></html>"
+
+    assert needs_browser(html, text_chars=600, min_chars=500)
+
+
+def test_large_client_rendered_shell_needs_browser():
+    html = "<html><script>" + "x" * 200_000 + "</script><body>Loading</body></html>"
+
+    assert needs_browser(html, text_chars=1500, min_chars=500)
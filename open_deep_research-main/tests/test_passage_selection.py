@@ -0,0 +1,59 @@
+import sys
+
+import pytest
+
+from open_deep_research.passage_selection import select_passages, tokenize
+from open_deep_research.token_counter import count_tokens
+
+
+def test_passage_larger_than_budget_is_truncated():
+    pytest.importorskip("rank_bm25")
+    # One sentence-free paragraph: every passage it splits into exceeds the budget
+    filler = " ".join(f"word{i}" for i in range(1000))
+    text = f"{filler} solar panel efficiency depends on temperature {filler}"
+
+    selected, tokens_in, tokens_out = select_passages(text, "solar panel efficiency", token_budget=50)
+
+    assert selected
+    assert tokens_in > 50
+    assert tokens_out == count_tokens(selected) <= 50
+
+
+def test_relevant_passage_is_selected():
+    pytest.importorskip("rank_bm25")
+    # Paragraphs of ~1000 chars, so each one becomes its own passage
+    intro = "Energy report for the year. " * 8
+    noise = ["Gardening tips about roses and tulips. " * 26 for _ in range(10)]
+    relevant = "Solar panel efficiency drops as the temperature rises. " + "Measured in the lab. " * 45
+    text = "\n\n".join([intro, *noise[:5], relevant, *noise[5:]])
+    budget = count_tokens(intro) + count_tokens(relevant) + 10
+
+    selected, _, tokens_out = select_passages(text, "solar panel efficiency", token_budget=budget)
+
+    assert selected == f"{intro.strip()}\n\n[...]\n\n{relevant.strip()}"
+    assert tokens_out <= budget
+
+
+def test_without_rank_bm25_the_head_is_kept_within_budget(monkeypatch):
+    monkeypatch.setitem(sys.modules, "rank_bm25", None)
+    text = " ".join(f"word{i}" for i in range(2000))
+
+    selected, tokens_in, tokens_out = select_passages(text, "word5", token_budget=50)
+
+    assert text.startswith(selected)
+    assert tokens_in > 50
+    assert tokens_out == count_tokens(selected) <= 50
+
+
+def test_page_within_budget_is_unchanged():
+    text = "Solar panels convert sunlight into electricity."
+
+    assert select_passages(text, "solar", token_budget=100) == (text, count_tokens(text), count_tokens(text))
+
+
+def test_tokenize_keeps_non_ascii_words():
+    assert tokenize("Café Zürich, Привет мир") == ["café", "zürich", "привет", "мир"]
+
+
+def test_tokenize_splits_cjk_runs_into_bigrams():
+    assert tokenize("太阳能 solar東京") == ["太阳", "阳能", "solar", "東京"]
@@ -0,0 +1,48 @@
+import asyncio
+
+from open_deep_research.rate_limit import TokenBucketRateLimiter, _limiter_from_env
+
+
+def test_burst_is_free_then_requests_are_spaced():
+    limiter = TokenBucketRateLimiter(rate=10.0, burst=3)
+
+    waits = [limiter._reserve() for _ in range(5)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert 0.05 < waits[3] <= 0.1
+    assert 0.15 < waits[4] <= 0.2
+
+
+def test_acquire_serves_waiters_in_arrival_order():
+    limiter = TokenBucketRateLimiter(rate=50.0, burst=1)
+    order = []
+
+    async def request(i):
+        await limiter.acquire()
+        order.append(i)
+
+    async def main():
+        await asyncio.gather(*(request(i) for i in range(5)))
+
+    asyncio.run(main())
+
+    assert order == [0, 1, 2, 3, 4]
+    assert limiter.stats()["acquired"] == 5
+    assert limiter.stats()["total_wait"] > 0
+
+
+def test_zero_rate_disables_limiting():
+    limiter = TokenBucketRateLimiter(rate=0.0)
+
+    assert asyncio.run(limiter.acquire()) == 0.0
+
+
+def test_env_defaults_follow_request_delay(monkeypatch):
+    for name in ("SEARCH_RATE_LIMIT_RPS", "SEARCH_RATE_LIMIT_BURST", "PERPLEXICA_RATE_LIMIT_RPS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("SEARCH_REQUEST_DELAY", "4")
+
+    limiter = _limiter_from_env("perplexica")
+
+    assert limiter.rate == 0.25
+    assert limiter.burst == 2
@@ -0,0 +1,69 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from open_deep_research.summary_packing import SummaryPacker  # noqa: E402
+
+
+class FakeModel:
+    def __init__(self, missing=()):
+        self.calls = 0
+        self.missing = set(missing)
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        pages = messages[0].content.count("<webpage id=")
+        return SimpleNamespace(summaries=[
+            SimpleNamespace(source_id=i, summary=f"summary {i}", key_excerpts=f"excerpt {i}")
+            for i in range(1, pages + 1)
+            if i not in self.missing
+        ])
+
+
+async def _fallback():
+    return {"summary": "single", "key_excerpts": ""}
+
+
+def test_small_pages_share_one_call():
+    model = FakeModel()
+    packer = SummaryPacker(model, "today", token_budget=1000, window=0.01)
+
+    async def main():
+        return await asyncio.gather(*(packer.summarize(f"page {i}", _fallback) for i in range(3)))
+
+    results = asyncio.run(main())
+
+    assert model.calls == 1
+    assert [result["summary"] for result in results] == ["summary 1", "summary 2", "summary 3"]
+
+
+def test_bin_is_flushed_at_max_pages():
+    model = FakeModel()
+    packer = SummaryPacker(model, "today", token_budget=1000, window=10.0, max_pages=2)
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(*(packer.summarize(f"page {i}", _fallback) for i in range(2))), 1.0
+        )
+
+    assert len(asyncio.run(main())) == 2
+    assert model.calls == 1
+
+
+def test_lone_page_and_missing_summary_fall_back_to_single_call():
+    model = FakeModel(missing={2})
+    packer = SummaryPacker(model, "today", token_budget=1000, window=0.01)
+
+    async def main():
+        lone = await packer.summarize("alone", _fallback)
+        packed = await asyncio.gather(packer.summarize("first", _fallback), packer.summarize("second", _fallback))
+        return lone, packed
+
+    lone, packed = asyncio.run(main())
+
+    assert lone["summary"] == "single"
+    assert packed[0]["summary"] == "summary 1"
+    assert packed[1]["summary"] == "single"